@@ -0,0 +1,195 @@
+import argparse
+import json
+import platform
+import random
+import time
+import tracemalloc
+from engine import NullSink
+from fib import PrefixTrie
+from network import Network
+
+def create_random_network(n: int, degree: int = 4, seed: int = 1) -> Network:
+    """Связная случайная сеть: случайное остовное дерево плюс дополнительные связи, метрики 1..10"""
+    rnd = random.Random(seed)
+    network = Network(NullSink())
+    routers = [network.add_router(f"R{i}") for i in range(n)]
+    for i, router in enumerate(routers):
+        router.add_interface("eth0", f"10.{i // 256}.{i % 256}.1")
+    ports = [1] * n
+
+    def link(a: int, b: int) -> None:
+        if routers[b].name in routers[a].connections:
+            return
+        metric = rnd.randint(1, 10)
+        routers[a].connect(routers[b], f"eth{ports[a]}", f"eth{ports[b]}", metric, metric)
+        ports[a] += 1
+        ports[b] += 1
+
+    for i in range(1, n):
+        link(rnd.randrange(i), i)
+    for _ in range(n * degree // 2 - (n - 1)):
+        a, b = rnd.randrange(n), rnd.randrange(n)
+        if a != b:
+            link(a, b)
+    return network
+
+def memory_peak(n: int, degree: int, seed: int) -> int:
+    """Пиковый объём выделенной памяти (байт) при создании сети и сходимости Link-State"""
+    tracemalloc.start()
+    try:
+        create_random_network(n, degree, seed).update_all_link_states()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def bench_size(n: int, degree: int, flaps: int, packets: int, seed: int) -> dict:
+    """Одна строка набора: сходимость, SPF, шторм переключений связей и отправка пакетов"""
+    rnd = random.Random(seed)
+    network = create_random_network(n, degree, seed)
+    routers = list(network.routers.values())
+
+    start = time.perf_counter()
+    network.update_all_link_states()
+    converge = time.perf_counter() - start
+    spf_stats = network.spf_stats()
+    lsdb_stats = network.lsdb_stats()
+
+    # Чистый SPF: пересчёт таблиц на уже сошедшейся базе состояния каналов
+    start = time.perf_counter()
+    for router in routers:
+        router.calculate_routing_table()
+    spf = time.perf_counter() - start
+
+    # Шторм: обрыв и восстановление случайной связи, каждый раз с полной рассылкой LSA
+    links = sorted({tuple(sorted((r.name, other))) for r in routers for other in r.connections})
+    start = time.perf_counter()
+    for _ in range(flaps):
+        a, b = rnd.choice(links)
+        _, int_a, metric_a = network.routers[a].connections[b]
+        _, int_b, metric_b = network.routers[b].connections[a]
+        network.simulate_link_failure(a, b)
+        network.simulate_link_recovery(a, b, int_a, int_b, metric_a, metric_b)
+    flap = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(packets):
+        rnd.choice(routers).send_packet(rnd.choice(routers).name, "bench")
+    send = time.perf_counter() - start
+
+    return {
+        "routers": n,
+        "links": len(links),
+        "converge_seconds": converge,
+        "spf_seconds": spf,
+        "spf_ms_per_router": spf * 1000 / n,
+        "spf_runs": spf_stats["runs"],
+        "spf_saved": spf_stats["saved"],
+        "lsa_installed": lsdb_stats["installed"],
+        "lsa_duplicates": lsdb_stats["duplicates"],
+        "flaps": flaps,
+        "flap_ms": flap * 1000 / flaps if flaps else 0.0,
+        "packets_per_sec": packets / send if send else 0.0,
+        "memory_peak_bytes": memory_peak(n, degree, seed),
+    }
+
+def bench_fib(prefixes: int, lookups: int, seed: int) -> dict:
+    """FIB отдельно: вставка случайных префиксов /16../28, поиск случайных адресов и память"""
+    rnd = random.Random(seed)
+    entries = [(rnd.getrandbits(32), rnd.choice((16, 20, 22, 24, 24, 24, 28))) for _ in range(prefixes)]
+    addresses = [rnd.getrandbits(32) for _ in range(lookups)]
+    fib = PrefixTrie()
+    start = time.perf_counter()
+    for i, (network, length) in enumerate(entries):
+        fib.insert(network, length, i)
+    insert = time.perf_counter() - start
+    tracemalloc.start()
+    traced = PrefixTrie()
+    for i, (network, length) in enumerate(entries):
+        traced.insert(network, length, i)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del traced
+    start = time.perf_counter()
+    for address in addresses:
+        fib.lookup(address)
+    lookup = time.perf_counter() - start
+    return {
+        "prefixes": len(fib),
+        "inserts_per_sec": prefixes / insert if insert else 0.0,
+        "lookups_per_sec": lookups / lookup if lookup else 0.0,
+        "memory_bytes": memory,
+    }
+
+def bench_flood(n: int, degree: int, seed: int) -> dict:
+    """Начальная рассылка LSA в большой сети: время, число пакетов и память.
+
+    Время меряется без tracemalloc, память — отдельным прогоном на такой же сети.
+    lsa_buffers — число разных буферов LSA во всех базах: благодаря общим
+    неизменяемым буферам оно равно числу маршрутизаторов, а не n².
+    """
+    network = create_random_network(n, degree, seed)
+    start = time.perf_counter()
+    network.update_all_link_states()
+    flood = time.perf_counter() - start
+    buffers = {id(record.lsa): len(record.lsa)
+               for router in network.routers.values()
+               for record in router.link_state_db.records.values()}
+    references = sum(len(router.link_state_db) for router in network.routers.values())
+    processed = network.engine.processed
+    del network
+    return {
+        "routers": n,
+        "flood_seconds": flood,
+        "packets": processed,
+        "packets_per_sec": processed / flood if flood else 0.0,
+        "lsa_buffers": len(buffers),
+        "lsa_references": references,
+        "lsa_bytes": sum(buffers.values()),
+        "memory_peak_bytes": memory_peak(n, degree, seed),
+    }
+
+def bench_suite(sizes: list, degree: int, flaps: int, packets: int, seed: int) -> list:
+    return [bench_size(n, degree, flaps, packets, seed) for n in sizes]
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарки RoutingProgram")
+    parser.add_argument("--sizes", default="10,25,50,100", help="число маршрутизаторов через запятую")
+    parser.add_argument("--degree", type=int, default=4)
+    parser.add_argument("--flaps", type=int, default=5)
+    parser.add_argument("--packets", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--fib", type=int, default=0, help="число префиксов для отдельного замера FIB (0 — пропустить)")
+    parser.add_argument("--flood", type=int, default=0,
+                        help="число маршрутизаторов для замера рассылки LSA, например 2000 (0 — пропустить)")
+    parser.add_argument("--json", action="store_true", help="вывод в JSON вместо таблицы")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    rows = bench_suite(sizes, args.degree, args.flaps, args.packets, args.seed)
+    fib = bench_fib(args.fib, 200000, args.seed) if args.fib else None
+    flood = bench_flood(args.flood, args.degree, args.seed) if args.flood else None
+    if args.json:
+        result = {"simulator": "RoutingProgram", "python": platform.python_version(),
+                  "degree": args.degree, "seed": args.seed, "suite": rows}
+        if fib:
+            result["fib"] = fib
+        if flood:
+            result["flood"] = flood
+        print(json.dumps(result, indent=2))
+        return
+    print(f"RoutingProgram, средняя степень {args.degree}, seed {args.seed}")
+    print(f"{'ROUTERS':<8} {'CONV s':<8} {'SPF s':<8} {'FLAP ms':<9} {'PKT/s':<9} PEAK MiB")
+    for row in rows:
+        print(f"{row['routers']:<8} {row['converge_seconds']:<8.2f} {row['spf_seconds']:<8.3f} "
+              f"{row['flap_ms']:<9.1f} {row['packets_per_sec']:<9.0f} {row['memory_peak_bytes'] / 2**20:.1f}")
+    if fib:
+        print(f"FIB: {fib['prefixes']} префиксов, вставка {fib['inserts_per_sec']:.0f}/с, "
+              f"поиск {fib['lookups_per_sec']:.0f}/с, память {fib['memory_bytes'] / 2**20:.1f} MiB")
+    if flood:
+        print(f"Рассылка LSA: {flood['routers']} маршрутизаторов, {flood['flood_seconds']:.1f} с, "
+              f"{flood['packets']} пакетов ({flood['packets_per_sec']:.0f}/с), "
+              f"{flood['lsa_buffers']} буферов LSA на {flood['lsa_references']} записей "
+              f"({flood['lsa_bytes'] / 1024:.0f} KiB), пик {flood['memory_peak_bytes'] / 2**20:.1f} MiB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import heapq
+from abc import ABC, abstractmethod
+from collections import deque
+from logging import DEBUG, INFO, WARNING
+from typing import Any, Callable, Deque, List, Optional, Tuple
+
+SILENT = 100
+
+class EventSink(ABC):
+    """Получатель событий маршрутизаторов. События ниже level отбрасываются.
+
+    Наследник обязан определить emit(), иначе его нельзя создать.
+    """
+
+    def __init__(self, level: int = INFO):
+        self.level = level
+
+    def enabled(self, level: int) -> bool:
+        return level >= self.level
+
+    @abstractmethod
+    def emit(self, level: int, source: Optional[str], message: str):
+        ...
+
+class PrintSink(EventSink):
+    """Печатает события в консоль (как раньше print в Router)"""
+
+    def emit(self, level: int, source: Optional[str], message: str):
+        print(f"{source}: {message}" if source else message)
+
+class ListSink(EventSink):
+    """Сохраняет события в список events: (level, source, message)"""
+
+    def __init__(self, level: int = DEBUG):
+        super().__init__(level)
+        self.events: List[Tuple[int, Optional[str], str]] = []
+
+    def emit(self, level: int, source: Optional[str], message: str):
+        self.events.append((level, source, message))
+
+class NullSink(EventSink):
+    """Тихий режим: все события отбрасываются"""
+
+    def __init__(self):
+        super().__init__(SILENT)
+
+    def emit(self, level: int, source: Optional[str], message: str):
+        pass
+
+class ForwardingEngine:
+    """Очередь пакетов в пути. Рассылка LSA идет через нее итеративно, без рекурсии.
+
+    Пакеты доставляются мгновенно; таймеры (call_later) идут по модельным часам now,
+    которые сдвигаются к ближайшему таймеру, когда очередь пакетов пуста.
+    """
+
+    def __init__(self):
+        self.queue: Deque[Tuple[Any, Any, Optional[str]]] = deque()
+        self.timers: List[Tuple[float, int, Callable, tuple]] = []
+        self.now = 0.0
+        self.running = False
+        self.processed = 0
+        self._timer_seq = 0
+
+    def submit(self, router, packet, interface: Optional[str] = None):
+        """Ставит пакет в очередь на обработку маршрутизатором router"""
+        self.queue.append((router, packet, interface))
+
+    def call_later(self, delay: float, fn: Callable, *args):
+        """Вызывает fn(*args) через delay секунд модельного времени"""
+        heapq.heappush(self.timers, (self.now + delay, self._timer_seq, fn, args))
+        self._timer_seq += 1
+
+    def run(self):
+        """Обрабатывает очередь и таймеры до опустошения. Вложенный вызов ничего не делает"""
+        if self.running:
+            return
+        self.running = True
+        try:
+            while self.queue or self.timers:
+                while self.queue:
+                    router, packet, interface = self.queue.popleft()
+                    self.processed += 1
+                    _, next_router, next_interface = router.process_packet(packet, interface)
+                    if next_router is not None:
+                        self.queue.append((next_router, packet, next_interface))
+                if self.timers:
+                    when, _, fn, args = heapq.heappop(self.timers)
+                    self.now = max(self.now, when)
+                    fn(*args)
+        finally:
+            self.running = False
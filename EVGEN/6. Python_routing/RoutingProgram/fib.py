@@ -0,0 +1,174 @@
+import socket
+from typing import Any, Iterator, Optional, Tuple
+
+def parse_ip(text: str) -> Optional[int]:
+    """IPv4-адрес в виде числа; None, если строка не адрес (например, имя маршрутизатора)"""
+    if not text or not text[0].isdigit():
+        return None
+    try:
+        return int.from_bytes(socket.inet_aton(text), "big")
+    except OSError:
+        return None
+
+def format_ip(address: int) -> str:
+    return socket.inet_ntoa(address.to_bytes(4, "big"))
+
+def mask_length(mask: str) -> int:
+    """Длина префикса по маске вида 255.255.255.0"""
+    return bin(parse_ip(mask)).count("1")
+
+def _mask(length: int) -> int:
+    return (0xFFFFFFFF << (32 - length)) & 0xFFFFFFFF
+
+def parse_prefix(text: str) -> Tuple[int, int]:
+    """'10.0.0.0/8' -> (адрес сети, длина префикса)"""
+    address, _, length = text.partition("/")
+    length = int(length) if length else 32
+    return parse_ip(address) & _mask(length), length
+
+def format_prefix(network: int, length: int) -> str:
+    return f"{format_ip(network)}/{length}"
+
+class _Node:
+    __slots__ = ("key", "length", "value", "left", "right")
+
+    def __init__(self, key: int, length: int, value: Any = None):
+        self.key = key
+        self.length = length
+        self.value = value
+        self.left: Optional["_Node"] = None   # следующий бит 0
+        self.right: Optional["_Node"] = None  # следующий бит 1
+
+    def child(self, bit: int) -> Optional["_Node"]:
+        return self.right if bit else self.left
+
+    def set_child(self, bit: int, node: Optional["_Node"]):
+        if bit:
+            self.right = node
+        else:
+            self.left = node
+
+def _bit(key: int, position: int) -> int:
+    return (key >> (31 - position)) & 1
+
+def _common_length(a: int, b: int, limit: int) -> int:
+    diff = a ^ b
+    if diff == 0:
+        return limit
+    return min(limit, 32 - diff.bit_length())
+
+class PrefixTrie:
+    """Сжатое двоичное дерево префиксов (Patricia) для поиска по самому длинному префиксу.
+
+    Узлы без значения с одним потомком не хранятся, поэтому узлов не больше 2N
+    для N префиксов, а поиск проходит не более 32 уровней.
+    """
+
+    def __init__(self):
+        self.root = _Node(0, 0)
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def insert(self, network: int, length: int, value: Any):
+        """Добавляет или заменяет значение для префикса network/length"""
+        node = self._node(network & _mask(length), length)
+        if node.value is None:
+            self.size += 1
+        node.value = value
+
+    def setdefault(self, network: int, length: int, default: Any) -> Any:
+        """Значение префикса; если его нет, сохраняет default. Один проход по дереву"""
+        node = self._node(network & _mask(length), length)
+        if node.value is None:
+            self.size += 1
+            node.value = default
+        return node.value
+
+    def _node(self, network: int, length: int) -> _Node:
+        """Узел префикса; недостающий создается (пока без значения)"""
+        node = self.root
+        while True:
+            if node.length == length:
+                return node
+            bit = _bit(network, node.length)
+            child = node.child(bit)
+            if child is None:
+                child = _Node(network, length)
+                node.set_child(bit, child)
+                return child
+            common = _common_length(network, child.key, min(length, child.length))
+            if common == child.length:
+                node = child
+                continue
+            # Префикс расходится с child внутри сжатого участка: вставляем узел разветвления
+            fork = _Node(network & _mask(common), common)
+            fork.set_child(_bit(child.key, common), child)
+            node.set_child(bit, fork)
+            if common == length:
+                return fork
+            leaf = _Node(network, length)
+            fork.set_child(_bit(network, common), leaf)
+            return leaf
+
+    def _find(self, network: int, length: int, path: Optional[list] = None) -> Optional[_Node]:
+        node = self.root
+        while node.length < length:
+            bit = _bit(network, node.length)
+            child = node.child(bit)
+            if child is None or child.length > length or (network ^ child.key) & _mask(child.length):
+                return None
+            if path is not None:
+                path.append((node, bit))
+            node = child
+        return node
+
+    def get(self, network: int, length: int) -> Any:
+        """Значение точно для префикса network/length или None"""
+        node = self._find(network & _mask(length), length)
+        return node.value if node is not None else None
+
+    def remove(self, network: int, length: int) -> bool:
+        """Удаляет префикс; лишние узлы разветвления схлопываются"""
+        path = []
+        node = self._find(network & _mask(length), length, path)
+        if node is None or node.value is None:
+            return False
+        node.value = None
+        self.size -= 1
+        # Узел без значения нужен, только если у него два потомка
+        while path and node.value is None:
+            if node.left is not None and node.right is not None:
+                break
+            parent, bit = path.pop()
+            parent.set_child(bit, node.left or node.right)
+            node = parent
+        return True
+
+    def lookup(self, address: int) -> Any:
+        """Значение самого длинного префикса, содержащего address, или None"""
+        best = None
+        node = self.root
+        while node is not None:
+            length = node.length
+            if length and (address ^ node.key) >> (32 - length):
+                break
+            if node.value is not None:
+                best = node.value
+            if length == 32:
+                break
+            node = node.right if (address >> (31 - length)) & 1 else node.left
+        return best
+
+    def items(self) -> Iterator[Tuple[int, int, Any]]:
+        """Все (сеть, длина, значение) в порядке обхода"""
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node.value is not None:
+                yield node.key, node.length, node.value
+            if node.right is not None:
+                stack.append(node.right)
+            if node.left is not None:
+                stack.append(node.left)
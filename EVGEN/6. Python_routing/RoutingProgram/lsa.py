@@ -0,0 +1,104 @@
+import struct
+import zlib
+from typing import Dict, Iterable, Optional, Tuple
+
+LSA_VERSION = 1
+
+# Формат LSA (сетевой порядок байт):
+#   заголовок:  версия B, возраст f, контрольная сумма I
+#   тело:       seq I, длина имени H, число соседей H, число сетей H, имя источника,
+#               соседи: длина имени B, имя, метрика I
+#               сети:   адрес I, длина префикса B
+# Контрольная сумма (Adler-32) считается по телу, поэтому возраст можно менять без пересчета.
+_HEADER = struct.Struct("!BfI")
+_BODY = struct.Struct("!IHHH")
+_METRIC = struct.Struct("!I")
+_NETWORK = struct.Struct("!IB")
+_METRIC_MAX = 0xFFFFFFFF
+
+def _encode_name(name: str, field: str, limit: int) -> bytes:
+    data = name.encode()
+    if len(data) > limit:
+        raise ValueError(f"LSA {field} {name!r} is {len(data)} bytes encoded, at most {limit} allowed")
+    return data
+
+class Lsa:
+    """Неизменяемое LSA в компактном двоичном виде.
+
+    Заголовок разбирается один раз при создании, поэтому проверка дубликата — это
+    сравнение полей. Соседи и сети декодируются при первом обращении. При повторной
+    рассылке соседям передается тот же объект, копии буфера не создаются.
+    """
+
+    __slots__ = ("raw", "origin", "seq", "checksum", "age", "_neighbors", "_networks")
+
+    def __init__(self, raw: bytes):
+        version, self.age, self.checksum = _HEADER.unpack_from(raw, 0)
+        if version != LSA_VERSION:
+            raise ValueError(f"Unsupported LSA version {version}")
+        self.seq, name_length, _, _ = _BODY.unpack_from(raw, _HEADER.size)
+        start = _HEADER.size + _BODY.size
+        self.origin = raw[start:start + name_length].decode()
+        self.raw = bytes(raw)
+        self._neighbors: Optional[Dict[str, int]] = None
+        self._networks: Optional[Tuple[Tuple[int, int], ...]] = None
+
+    @classmethod
+    def encode(cls, router_id: str, seq_num: int, neighbors: Dict[str, int],
+               networks: Iterable[Tuple[int, int]] = (), age: float = 0.0) -> "Lsa":
+        name = _encode_name(router_id, "router_id", 0xFFFF)
+        networks = list(networks)
+        parts = [_BODY.pack(seq_num, len(name), len(neighbors), len(networks)), name]
+        for neighbor, metric in neighbors.items():
+            neighbor_name = _encode_name(neighbor, "neighbor name", 0xFF)
+            if not isinstance(metric, int) or not 0 <= metric <= _METRIC_MAX:
+                raise ValueError(f"LSA metric for neighbor {neighbor!r} must be an integer "
+                                 f"in 0..{_METRIC_MAX}, got {metric!r}")
+            parts.append(bytes((len(neighbor_name),)))
+            parts.append(neighbor_name)
+            parts.append(_METRIC.pack(metric))
+        for network, length in networks:
+            parts.append(_NETWORK.pack(network, length))
+        body = b"".join(parts)
+        return cls(_HEADER.pack(LSA_VERSION, age, zlib.adler32(body)) + body)
+
+    def verify(self) -> bool:
+        """Совпадает ли контрольная сумма с содержимым"""
+        return zlib.adler32(memoryview(self.raw)[_HEADER.size:]) == self.checksum
+
+    @property
+    def neighbors(self) -> Dict[str, int]:
+        """{сосед: метрика}; словарь общий для всех получателей, изменять его нельзя"""
+        if self._neighbors is None:
+            self._decode()
+        return self._neighbors
+
+    @property
+    def networks(self) -> Tuple[Tuple[int, int], ...]:
+        if self._networks is None:
+            self._decode()
+        return self._networks
+
+    def _decode(self):
+        raw = self.raw
+        _, name_length, n_neighbors, n_networks = _BODY.unpack_from(raw, _HEADER.size)
+        offset = _HEADER.size + _BODY.size + name_length
+        neighbors = {}
+        for _ in range(n_neighbors):
+            length = raw[offset]
+            name = raw[offset + 1:offset + 1 + length].decode()
+            offset += 1 + length
+            neighbors[name] = _METRIC.unpack_from(raw, offset)[0]
+            offset += _METRIC.size
+        networks = []
+        for _ in range(n_networks):
+            networks.append(_NETWORK.unpack_from(raw, offset))
+            offset += _NETWORK.size
+        self._neighbors = neighbors
+        self._networks = tuple(networks)
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    def __repr__(self) -> str:
+        return f"Lsa({self.origin}, seq={self.seq}, {len(self.raw)} bytes)"
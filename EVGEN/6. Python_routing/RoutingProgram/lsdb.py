@@ -0,0 +1,107 @@
+import heapq
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+from lsa import Lsa
+
+MAX_AGE = 3600.0           # LSA старше этого удаляется из базы (секунды модельного времени)
+REFRESH_INTERVAL = 1800.0  # через столько маршрутизатор заново рассылает свое LSA
+
+@dataclass
+class LsaRecord:
+    lsa: Lsa          # общий для всех маршрутизаторов неизменяемый буфер
+    age: float        # возраст LSA в момент установки
+    installed: float  # модельное время установки
+
+    @property
+    def origin(self) -> str:
+        return self.lsa.origin
+
+    @property
+    def seq(self) -> int:
+        return self.lsa.seq
+
+    @property
+    def checksum(self) -> int:
+        return self.lsa.checksum
+
+    @property
+    def neighbors(self) -> Dict[str, int]:
+        return self.lsa.neighbors
+
+    @property
+    def networks(self) -> Tuple[Tuple[int, int], ...]:
+        return self.lsa.networks
+
+    def current_age(self, now: float) -> float:
+        return self.age + (now - self.installed)
+
+class LinkStateDatabase(Mapping):
+    """База состояния каналов: по одной записи LsaRecord на маршрутизатор-источник.
+
+    Как словарь отдает {источник: {сосед: метрика}}. Дубликаты отсекаются
+    сравнением (seq, checksum) с текущей записью за O(1), до проверки контрольной
+    суммы и разбора содержимого.
+    Сроки истечения хранятся в min-куче; записи, замененные более новыми,
+    удаляются из кучи лениво, а при ее разрастании куча перестраивается.
+    """
+
+    def __init__(self, max_age: float = MAX_AGE):
+        self.max_age = max_age
+        self.records: Dict[str, LsaRecord] = {}
+        self._expiry: List[Tuple[float, str, int]] = []
+        self.installed = 0
+        self.duplicates = 0
+        self.older = 0
+        self.corrupt = 0
+        self.expired = 0
+
+    def __getitem__(self, origin: str) -> Dict[str, int]:
+        return self.records[origin].neighbors
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.records)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def record(self, origin: str) -> Optional[LsaRecord]:
+        return self.records.get(origin)
+
+    def install(self, lsa: Lsa, now: float) -> bool:
+        """Устанавливает LSA, если оно новее текущей записи. Возвращает True при установке"""
+        known = self.records.get(lsa.origin)
+        if known is not None:
+            if known.lsa is lsa or (lsa.seq, lsa.checksum) == (known.seq, known.checksum):
+                self.duplicates += 1
+                return False
+            if (lsa.seq, lsa.checksum) < (known.seq, known.checksum):
+                self.older += 1
+                return False
+        if not lsa.verify():
+            self.corrupt += 1
+            return False
+        if lsa.age >= self.max_age:
+            return False
+        self.records[lsa.origin] = LsaRecord(lsa, lsa.age, now)
+        self.installed += 1
+        heapq.heappush(self._expiry, (now + self.max_age - lsa.age, lsa.origin, lsa.seq))
+        if len(self._expiry) > 2 * len(self.records) + 16:
+            self._compact()
+        return True
+
+    def expire(self, now: float) -> List[LsaRecord]:
+        """Удаляет записи, достигшие max_age; возвращает удаленные записи"""
+        removed = []
+        heap = self._expiry
+        while heap and heap[0][0] <= now:
+            _, origin, seq = heapq.heappop(heap)
+            record = self.records.get(origin)
+            if record is not None and record.seq == seq and record.current_age(now) >= self.max_age:
+                removed.append(self.records.pop(origin))
+        self.expired += len(removed)
+        return removed
+
+    def _compact(self):
+        self._expiry = [(r.installed + self.max_age - r.age, r.origin, r.seq) for r in self.records.values()]
+        heapq.heapify(self._expiry)
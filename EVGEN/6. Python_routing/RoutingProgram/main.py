@@ -1,5 +1,6 @@
-import time
+import asyncio
 from network import create_test_network
+from runtime import AsyncRuntime
 
 def print_all_routing_tables(network):
     """Выводит таблицы маршрутизации всех маршрутизаторов"""
@@ -14,7 +15,6 @@ def demonstrate_network_operations():
     
     print("\n=== Инициализация Link-State протокола ===")
     network.update_all_link_states()
-    time.sleep(1)
     
     print("\n=== Таблицы маршрутизации после инициализации ===")
     print_all_routing_tables(network)
@@ -24,7 +24,6 @@ def demonstrate_network_operations():
     
     print("\n=== Тест 2: Имитация обрыва связи R3-R4 ===")
     network.simulate_link_failure("R3", "R4")
-    time.sleep(1)
     
     print("\n=== Таблицы маршрутизации после обрыва ===")
     print_all_routing_tables(network)
@@ -37,19 +36,37 @@ def demonstrate_network_operations():
     
     print("\n=== Тест 5: Восстановление связи R3-R4 ===")
     network.simulate_link_recovery("R3", "R4", "eth2", "eth1")
-    time.sleep(1)
     
     print("\n=== Таблицы маршрутизации после восстановления ===")
     print_all_routing_tables(network)
     
     print("\n=== Тест 6: Отправка пакета R1 -> R4 (восстановленный маршрут) ===")
     network.get_router("R1").send_packet("R4", "Hello after link recovery!")
+    
+    print("\n=== Тест 7: Отправка пакета R2 -> 192.168.6.1 (по IP-адресу) ===")
+    network.get_router("R2").send_packet("192.168.6.1", "Hello by IP!")
+
+async def demonstrate_async_runtime(latency: float = 0.002):
+    """Та же сеть в асинхронном режиме: задержка в линиях и измеренное время сходимости"""
+    print("\n=== Асинхронный режим: задержка в линиях %.0f мс ===" % (latency * 1000))
+    network = create_test_network()
+    async with AsyncRuntime(network, latency=latency) as runtime:
+        seconds = await runtime.converge(network.update_all_link_states)
+        print(f"Сходимость после инициализации: {seconds * 1000:.1f} мс")
+        await runtime.send("R2", "R6", "Hello from R2 to R6!")
+        
+        seconds = await runtime.converge(lambda: network.simulate_link_failure("R3", "R4"))
+        print(f"Сходимость после обрыва R3-R4: {seconds * 1000:.1f} мс")
+        await runtime.send("R1", "R4", "Hello after link failure!")
+        
+        seconds = await runtime.converge(lambda: network.simulate_link_recovery("R3", "R4", "eth2", "eth1"))
+        print(f"Сходимость после восстановления R3-R4: {seconds * 1000:.1f} мс")
+        print(f"Статистика: {runtime.stats()}")
 
 def interactive_mode():
     """Интерактивный режим для тестирования сети"""
     network = create_test_network()
     network.update_all_link_states()
-    time.sleep(1)
     
     while True:
         print("\n" + "="*50)
@@ -81,7 +98,6 @@ def interactive_mode():
             
             if r1 in network.routers and r2 in network.routers:
                 network.simulate_link_failure(r1, r2)
-                time.sleep(1)
             else:
                 print("Ошибка: неверные имена маршрутизаторов")
         
@@ -93,7 +109,6 @@ def interactive_mode():
             
             if r1 in network.routers and r2 in network.routers:
                 network.simulate_link_recovery(r1, r2, int1, int2)
-                time.sleep(1)
             else:
                 print("Ошибка: неверные имена маршрутизаторов")
         
@@ -105,4 +120,5 @@ def interactive_mode():
 
 if __name__ == "__main__":
     # Автоматическая демонстрация
-    demonstrate_network_operations()
\ No newline at end of file
+    demonstrate_network_operations()
+    asyncio.run(demonstrate_async_runtime())
\ No newline at end of file
@@ -1,22 +1,69 @@
-from typing import Dict
+from typing import Dict, Optional
 from router import Router
+from engine import INFO, EventSink, ForwardingEngine, PrintSink
+from spf import SpfTimers
 
 class Network:
-    def __init__(self):
+    def __init__(self, sink: Optional[EventSink] = None, spf_timers: Optional[SpfTimers] = None):
         self.routers: Dict[str, Router] = {}
+        self.sink = sink or PrintSink()
+        self.engine = ForwardingEngine()
+        self.spf_timers = spf_timers or SpfTimers()
     
     def add_router(self, name: str) -> Router:
-        router = Router(name)
+        router = Router(name, sink=self.sink, engine=self.engine, spf_timers=self.spf_timers)
         self.routers[name] = router
         return router
     
+    def set_sink(self, sink: EventSink):
+        """Подключает другой получатель событий ко всем маршрутизаторам"""
+        self.sink = sink
+        for router in self.routers.values():
+            router.sink = sink
+    
     def get_router(self, name: str) -> Router:
         return self.routers.get(name)
     
     def update_all_link_states(self):
         """Обновляет состояние каналов на всех маршрутизаторах"""
         for router in self.routers.values():
-            router.update_link_state()
+            router.originate_lsa()
+        self.engine.run()
+    
+    def advance(self, seconds: float):
+        """Сдвигает модельное время: маршрутизаторы обновляют свои LSA и удаляют устаревшие"""
+        if not isinstance(self.engine, ForwardingEngine):
+            raise RuntimeError("Network.advance() needs the synchronous ForwardingEngine; "
+                               "under AsyncRuntime use 'await runtime.advance(seconds)'")
+        self.engine.run()
+        self.engine.now += seconds
+        for router in self.routers.values():
+            router.refresh_lsa()
+        self.engine.run()
+        for router in self.routers.values():
+            router.age_lsdb()
+        self.engine.run()
+    
+    def lsdb_stats(self) -> Dict[str, int]:
+        """Суммарные счетчики LSDB всех маршрутизаторов"""
+        databases = [router.link_state_db for router in self.routers.values()]
+        return {
+            "records": sum(len(db) for db in databases),
+            "installed": sum(db.installed for db in databases),
+            "duplicates": sum(db.duplicates for db in databases),
+            "older": sum(db.older for db in databases),
+            "corrupt": sum(db.corrupt for db in databases),
+            "expired": sum(db.expired for db in databases),
+        }
+    
+    def spf_stats(self) -> Dict[str, int]:
+        """Суммарные счетчики SPF: запросы, запуски и сэкономленные запуски"""
+        schedulers = [router.spf for router in self.routers.values()]
+        return {
+            "requests": sum(s.requests for s in schedulers),
+            "runs": sum(s.runs for s in schedulers),
+            "saved": sum(s.saved for s in schedulers),
+        }
     
     def simulate_link_failure(self, router1: str, router2: str):
         """Имитирует обрыв связи между двумя маршрутизаторами"""
@@ -29,7 +76,8 @@ class Network:
             if router1 in r2.connections:
                 del r2.connections[router1]
             
-            print(f"Link between {router1} and {router2} failed!")
+            if self.sink.enabled(INFO):
+                self.sink.emit(INFO, None, f"Link between {router1} and {router2} failed!")
             self.update_all_link_states()
     
     def simulate_link_recovery(self, router1: str, router2: str, interface1: str, interface2: str, metric1: int = 1, metric2: int = 1):
@@ -41,12 +89,13 @@ class Network:
             r1.connections[r2.name] = (r2, interface1, metric1)
             r2.connections[r1.name] = (r1, interface2, metric2)
             
-            print(f"Link between {router1} and {router2} recovered!")
+            if self.sink.enabled(INFO):
+                self.sink.emit(INFO, None, f"Link between {router1} and {router2} recovered!")
             self.update_all_link_states()
 
-def create_test_network():
+def create_test_network(sink: Optional[EventSink] = None):
     """Создает тестовую сеть с 6 маршрутизаторами"""
-    network = Network()
+    network = Network(sink)
     
     routers = []
     for i in range(1, 7):
@@ -6,7 +6,8 @@ class PacketType(Enum):
     DATA = "DATA"
     LS_ANNOUNCEMENT = "LS_ANNOUNCEMENT"
 
-@dataclass
+# slots=True: при рассылке LSA пакетов создается O(V·E), __dict__ на каждый не нужен
+@dataclass(slots=True)
 class Packet:
     source: str
     destination: str
@@ -16,4 +17,4 @@ class Packet:
     path: List[str] = field(default_factory=list)
     
     def __str__(self):
-        return f"Packet({self.source} -> {self.destination}, type={self.type.name}, ttl={self.ttl})"
\ No newline at end of file
+        return f"Packet({self.source} -> {self.destination}, type={self.type.name}, ttl={self.ttl})"
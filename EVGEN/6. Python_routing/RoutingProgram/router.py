@@ -1,14 +1,24 @@
 import heapq
 from typing import Dict, List, Optional, Tuple, Any
 from packet import Packet, PacketType
+from engine import DEBUG, INFO, WARNING, EventSink, ForwardingEngine, PrintSink
+from spf import SpfScheduler, SpfTimers
+from lsdb import REFRESH_INTERVAL, LinkStateDatabase
+from lsa import Lsa
+from fib import PrefixTrie, mask_length, parse_ip, parse_prefix
 
 class Router:
-    def __init__(self, name: str):
+    def __init__(self, name: str, sink: Optional[EventSink] = None, engine: Optional[ForwardingEngine] = None,
+                 spf_timers: Optional[SpfTimers] = None):
         self.name = name
+        self.sink = sink or PrintSink()
+        self.engine = engine or ForwardingEngine()
+        self.spf = SpfScheduler(self, spf_timers)
         self.interfaces: Dict[str, Dict] = {}
         self.connections: Dict[str, Tuple['Router', str, int]] = {}
         self.routing_table: Dict[str, Dict] = {}
-        self.link_state_db: Dict[str, Dict[str, int]] = {}
+        self.link_state_db = LinkStateDatabase()
+        self.fib = PrefixTrie()
         self.seq_num = 0
         
     def add_interface(self, interface: str, ip: str, mask: str = "255.255.255.0", metric: int = 1):
@@ -32,58 +42,98 @@ class Router:
         """Устанавливает соединение между двумя маршрутизаторами"""
         self.connections[other.name] = (other, interface1, metric1)
         other.connections[self.name] = (self, interface2, metric2)
-        print(f"Connected {self.name} ({interface1}) to {other.name} ({interface2})")
+        if self.sink.enabled(INFO):
+            self.sink.emit(INFO, None, f"Connected {self.name} ({interface1}) to {other.name} ({interface2})")
     
     def update_link_state(self):
         """Обновляет и рассылает информацию о состоянии каналов"""
+        self.originate_lsa()
+        self.engine.run()
+
+    def originate_lsa(self):
+        """Формирует свое LSA и ставит его в очередь соседям, не обрабатывая очередь"""
         self.seq_num += 1
-        self.link_state_db[self.name] = {}
-        
-        for neighbor, (router, interface, metric) in self.connections.items():
-            self.link_state_db[self.name][neighbor] = metric
-        
+        neighbors = {neighbor: metric for neighbor, (router, interface, metric) in self.connections.items()}
+        networks = self.advertised_networks()
+        lsa = Lsa.encode(self.name, self.seq_num, neighbors, networks)
+        self._install_lsa(lsa)
+        self.flood(lsa)
+        self.spf.request()
+
+    def advertised_networks(self) -> List[Tuple[int, int]]:
+        """Сети интерфейсов в виде (адрес сети, длина префикса) для LSA"""
+        networks = set()
+        for params in self.interfaces.values():
+            if parse_ip(params["ip"]) is not None:
+                networks.add(parse_prefix(f"{params['ip']}/{mask_length(params['mask'])}"))
+        return sorted(networks)
+
+    def _install_lsa(self, lsa: Lsa) -> bool:
+        """Устанавливает LSA в базу и переносит изменения анонсируемых сетей в FIB"""
+        known = self.link_state_db.record(lsa.origin)
+        old = known.networks if known is not None else ()
+        if not self.link_state_db.install(lsa, self.engine.now):
+            return False
+        if lsa.networks != old:
+            self._update_fib(lsa.origin, old, lsa.networks)
+        return True
+
+    def _update_fib(self, origin: str, old, new):
+        """FIB хранит для префикса множество анонсирующих его маршрутизаторов"""
+        for network, length in set(old).difference(new):
+            origins = self.fib.get(network, length)
+            if origins is not None:
+                origins.discard(origin)
+                if not origins:
+                    self.fib.remove(network, length)
+        for network, length in set(new).difference(old):
+            self.fib.setdefault(network, length, set()).add(origin)
+
+    def refresh_lsa(self) -> bool:
+        """Заново рассылает свое LSA, если оно старше REFRESH_INTERVAL"""
+        own = self.link_state_db.record(self.name)
+        if own is None or own.current_age(self.engine.now) >= REFRESH_INTERVAL:
+            self.originate_lsa()
+            return True
+        return False
+
+    def age_lsdb(self):
+        """Удаляет устаревшие LSA; если что-то удалено, запрашивает пересчет таблицы"""
+        expired = self.link_state_db.expire(self.engine.now)
+        for record in expired:
+            self._update_fib(record.origin, record.networks, ())
+        if expired:
+            self.spf.request()
+
+    def flood(self, lsa: Lsa, exclude: Optional[str] = None):
+        """Ставит LSA в очередь каждому соседу, кроме exclude. Все пакеты несут один и тот же буфер"""
         for neighbor, (router, interface, metric) in self.connections.items():
-            packet = Packet(
-                source=self.name,
-                destination=neighbor,
-                payload={
-                    "router_id": self.name,
-                    "seq_num": self.seq_num,
-                    "neighbors": self.link_state_db[self.name]
-                },
-                type=PacketType.LS_ANNOUNCEMENT
-            )
-            self.forward_packet(packet, interface)
+            if neighbor != exclude:
+                packet = Packet(
+                    source=self.name,
+                    destination=neighbor,
+                    payload=lsa,
+                    type=PacketType.LS_ANNOUNCEMENT
+                )
+                self.engine.submit(router, packet, self._interface_at(router))
     
-    def receive_lsa(self, lsa_data: Dict, source: str):
-        """Обрабатывает полученное LSA"""
-        router_id = lsa_data["router_id"]
-        seq_num = lsa_data["seq_num"]
-        
-        if (router_id not in self.link_state_db or 
-            seq_num > self.link_state_db.get("_seq", {}).get(router_id, -1)):
-            
-            self.link_state_db[router_id] = lsa_data["neighbors"]
-            self.link_state_db.setdefault("_seq", {})[router_id] = seq_num
-            self.calculate_routing_table()
-            
-            for neighbor, (router, interface, metric) in self.connections.items():
-                if neighbor != source:
-                    packet = Packet(
-                        source=self.name,
-                        destination=neighbor,
-                        payload=lsa_data,
-                        type=PacketType.LS_ANNOUNCEMENT
-                    )
-                    self.forward_packet(packet, interface)
+    def receive_lsa(self, lsa: Lsa, source: str):
+        """Обрабатывает полученное LSA: дубликаты и устаревшие копии отбрасываются"""
+        if self._install_lsa(lsa):
+            self.spf.request()
+            self.flood(lsa, exclude=source)
     
     def calculate_routing_table(self):
-        """Вычисляет таблицу маршрутизации используя алгоритм Дейкстры"""
-        distances = {router: float('inf') for router in self.link_state_db.keys() 
-                    if router != "_seq"}
+        """Вычисляет таблицу маршрутизации используя алгоритм Дейкстры.
+
+        Первый хоп наследуется от родителя прямо во время обхода, интерфейс берется
+        из connections по имени соседа. Маршруты к узлам, ставшим недостижимыми, удаляются.
+        """
+        distances = {router: float('inf') for router in self.link_state_db}
         distances[self.name] = 0
-        previous = {}
+        first_hop: Dict[str, str] = {}
         visited = set()
+        order = []
         pq = [(0, self.name)]
         
         while pq:
@@ -93,7 +143,9 @@ class Router:
                 continue
                 
             visited.add(current_router)
+            order.append(current_router)
             neighbors = self.link_state_db.get(current_router, {})
+            via = first_hop.get(current_router)
             
             for neighbor, metric in neighbors.items():
                 if neighbor not in distances:
@@ -103,45 +155,52 @@ class Router:
                 
                 if distance < distances[neighbor]:
                     distances[neighbor] = distance
-                    previous[neighbor] = current_router
+                    first_hop[neighbor] = neighbor if via is None else via
                     heapq.heappush(pq, (distance, neighbor))
         
-        for target in distances:
-            if target == self.name or distances[target] == float('inf'):
-                continue
-            
-            next_hop = target
-            while previous.get(next_hop) != self.name:
-                next_hop = previous.get(next_hop, next_hop)
-            
-            interface = None
-            for intf, (router, _, _) in self.connections.items():
-                if router.name == next_hop:
-                    interface = intf
-                    break
-            
-            if interface:
-                self.routing_table[target] = {
-                    "next_hop": next_hop,
-                    "interface": interface,
-                    "metric": distances[target]
-                }
+        table = {dest: route for dest, route in self.routing_table.items()
+                 if route["next_hop"] == "directly connected"}
+        for target in order[1:]:
+            connection = self.connections.get(first_hop[target])
+            if connection is None:
+                continue  # LSDB еще не знает, что сосед пропал
+            table[target] = {
+                "next_hop": first_hop[target],
+                "interface": connection[1],
+                "metric": distances[target]
+            }
+        self.routing_table = table
     
+    def resolve(self, destination: str) -> Optional[str]:
+        """Имя маршрутизатора-получателя. Для IP-адреса — по самому длинному префиксу в FIB"""
+        address = parse_ip(destination)
+        if address is None:
+            return destination
+        origins = self.fib.lookup(address)
+        if not origins:
+            return None
+        if self.name in origins:
+            return self.name
+        if len(origins) == 1:
+            return next(iter(origins))
+        # Сеть анонсируют несколько маршрутизаторов: ближайший по метрике
+        reachable = [o for o in origins if o in self.routing_table]
+        return min(reachable, key=lambda o: self.routing_table[o]["metric"]) if reachable else None
+
     def find_route(self, destination: str) -> Optional[Dict]:
         """Находит маршрут до указанного узла"""
-        if destination in self.connections:
-            for intf, (router, _, metric) in self.connections.items():
-                if router.name == destination:
-                    return {
-                        "next_hop": destination,
-                        "interface": intf,
-                        "metric": metric
-                    }
+        connection = self.connections.get(destination)
+        if connection is not None:
+            return {
+                "next_hop": destination,
+                "interface": connection[1],
+                "metric": connection[2]
+            }
         
         return self.routing_table.get(destination)
     
     def send_packet(self, destination: str, payload: Any) -> bool:
-        """Отправляет пакет целевому узлу"""
+        """Отправляет пакет целевому узлу: имя маршрутизатора или IP-адрес"""
         packet = Packet(
             source=self.name,
             destination=destination,
@@ -151,35 +210,67 @@ class Router:
         return self.forward_packet(packet)
     
     def forward_packet(self, packet: Packet, incoming_interface: str = None) -> bool:
-        """Пересылает пакет следующему узлу"""
+        """Пересылает пакет до получателя. Цикл по маршрутизаторам на пути, без рекурсии"""
+        router, interface = self, incoming_interface
+        while True:
+            delivered, router, interface = router.process_packet(packet, interface)
+            if router is None:
+                break
+        if packet.type == PacketType.LS_ANNOUNCEMENT:
+            self.engine.run()
+        return delivered
+
+    def process_packet(self, packet: Packet, incoming_interface: str = None) -> Tuple[bool, Optional['Router'], Optional[str]]:
+        """Один шаг обработки пакета: (результат, следующий маршрутизатор или None, его входной интерфейс)"""
+        sink = self.sink
         packet.ttl -= 1
         if packet.ttl <= 0:
-            print(f"{self.name}: Packet TTL expired")
-            return False
+            if sink.enabled(WARNING):
+                sink.emit(WARNING, self.name, "Packet TTL expired")
+            return False, None, None
         
         if self.name not in packet.path:
             packet.path.append(self.name)
         
-        print(f"{self.name}: Processing {packet}")
+        if sink.enabled(DEBUG):
+            sink.emit(DEBUG, self.name, f"Processing {packet}")
         
         if packet.type == PacketType.LS_ANNOUNCEMENT:
             self.receive_lsa(packet.payload, packet.source)
-            return True
+            return True, None, None
         
-        if packet.destination == self.name:
-            print(f"{self.name}: Packet received! Path: {' -> '.join(packet.path)}")
-            print(f"Payload: {packet.payload}")
-            return True
+        target = self.resolve(packet.destination)
+        if target == self.name:
+            if sink.enabled(INFO):
+                sink.emit(INFO, self.name, f"Packet received! Path: {' -> '.join(packet.path)}")
+                sink.emit(INFO, None, f"Payload: {packet.payload}")
+            return True, None, None
         
-        route = self.find_route(packet.destination)
+        route = self.find_route(target) if target is not None else None
         if not route:
-            print(f"{self.name}: No route to {packet.destination}")
-            return False
+            if sink.enabled(WARNING):
+                sink.emit(WARNING, self.name, f"No route to {packet.destination}")
+            return False, None, None
+        
+        connection = self.connections.get(route["next_hop"])
+        if connection is None:
+            if sink.enabled(WARNING):
+                sink.emit(WARNING, self.name, f"Next hop {route['next_hop']} is not connected")
+            return False, None, None
+        next_hop_router = connection[0]
+        if sink.enabled(INFO):
+            sink.emit(INFO, self.name, f"Forwarding to {route['next_hop']} via {route['interface']}")
         
-        next_hop_router = self.connections[route["next_hop"]][0]
-        print(f"{self.name}: Forwarding to {route['next_hop']} via {route['interface']}")
+        return False, next_hop_router, self._interface_at(next_hop_router)
+    
+    def _interface_at(self, neighbor: 'Router') -> Optional[str]:
+        """Интерфейс соседа, на который приходит пакет от этого маршрутизатора.
         
-        return next_hop_router.forward_packet(packet, route["interface"])
+        Связь может быть записана только с нашей стороны (connections соседа
+        изменены вручную): тогда входной интерфейс неизвестен (None).
+        """
+        reverse = neighbor.connections.get(self.name)
+        return reverse[1] if reverse is not None else None
     
     def get_routing_table_str(self) -> str:
         """Возвращает строковое представление таблицы маршрутизации"""
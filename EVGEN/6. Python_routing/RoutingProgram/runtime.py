@@ -0,0 +1,218 @@
+import asyncio
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+from packet import Packet, PacketType
+from engine import WARNING
+
+class AsyncRuntime:
+    """Асинхронная модель сети: каждый маршрутизатор — задача asyncio со своей входной очередью.
+
+    Пока runtime запущен, он заменяет ForwardingEngine у всех маршрутизаторов сети:
+    LSA и пакеты данных доставляются соседу через latency секунд и обрабатываются
+    задачей получателя по одному хопу, таймеры SPF идут по часам цикла событий.
+    Задержка одинакова для всех связей, поэтому пакеты в пути хранятся в одной
+    очереди, упорядоченной по времени доставки, и таймер на каждый пакет не нужен.
+
+    Пример:
+        async with AsyncRuntime(network, latency=0.002) as runtime:
+            seconds = await runtime.converge(network.update_all_link_states)
+            delivered = await runtime.send("R1", "R4", "Hello")
+    """
+
+    def __init__(self, network, latency: float = 0.001):
+        self.network = network
+        self.latency = latency
+        self.running = False
+        self.processed = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.latency_sum = 0.0
+        self.last_spf = 0.0
+        self.queues: Dict[str, asyncio.Queue] = {}
+        self._wire: Deque[Tuple[float, Any, Packet, Optional[str]]] = deque()
+        self._tasks: List[asyncio.Task] = []
+        self._replies: Dict[int, Tuple[asyncio.Future, float]] = {}
+        self._in_flight = 0
+        self._timers = 0
+        self._previous_engine = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._idle: Optional[asyncio.Event] = None
+        self._wire_ready: Optional[asyncio.Event] = None
+        self._start = 0.0
+        self._skew = 0.0
+
+    @property
+    def now(self) -> float:
+        return self._loop.time() - self._start + self._skew
+
+    async def __aenter__(self) -> "AsyncRuntime":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def start(self):
+        """Запускает задачи маршрутизаторов и подключает runtime вместо ForwardingEngine"""
+        self._loop = asyncio.get_running_loop()
+        self._start = self._loop.time()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._wire_ready = asyncio.Event()
+        self._previous_engine = self.network.engine
+        self.network.engine = self
+        for router in self.network.routers.values():
+            router.engine = self
+            self.queues[router.name] = asyncio.Queue()
+            self._tasks.append(asyncio.create_task(self._serve(router)))
+        self._tasks.append(asyncio.create_task(self._pump()))
+
+    async def stop(self):
+        """Останавливает задачи и возвращает маршрутизаторам прежний ForwardingEngine"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        self.network.engine = self._previous_engine
+        for router in self.network.routers.values():
+            router.engine = self._previous_engine
+
+    # --- интерфейс ForwardingEngine -------------------------------------------
+
+    def submit(self, router, packet: Packet, interface: Optional[str] = None):
+        """Отправляет пакет маршрутизатору router с задержкой latency"""
+        self._in_flight += 1
+        self._idle.clear()
+        self._wire.append((self.now + self.latency, router, packet, interface))
+        self._wire_ready.set()
+
+    def call_later(self, delay: float, fn: Callable, *args):
+        self._timers += 1
+        self._idle.clear()
+        self._loop.call_later(delay, self._fire, fn, args)
+
+    def run(self):
+        """Передает во входные очереди пакеты, время доставки которых наступило.
+
+        Сами пакеты обрабатывают задачи маршрутизаторов, поэтому run() не ждет
+        их обработки; дождаться затихания сети можно через wait_idle().
+        """
+        wire, now = self._wire, self.now
+        while wire and wire[0][0] <= now:
+            _, router, packet, interface = wire.popleft()
+            self.queues[router.name].put_nowait((packet, interface))
+
+    # --- управление -----------------------------------------------------------
+
+    async def wait_idle(self):
+        """Ждет, пока в сети не останется пакетов в пути и отложенных пересчетов"""
+        await self._idle.wait()
+
+    async def converge(self, action: Optional[Callable[[], Any]] = None) -> float:
+        """Выполняет action (например, update_all_link_states) и измеряет время сходимости.
+
+        Время сходимости — от вызова до последнего запуска SPF, после которого
+        сеть затихла (секунды по часам цикла событий).
+        """
+        start = self.now
+        self.last_spf = start
+        if action is not None:
+            action()
+        await self.wait_idle()
+        return self.last_spf - start
+
+    async def advance(self, seconds: float):
+        """Аналог Network.advance(): сдвигает модельное время на seconds без ожидания.
+
+        Сдвиг делается, когда сеть затихла, поэтому пакеты в пути не «перепрыгивают»
+        свою задержку; затем маршрутизаторы обновляют свои LSA и удаляют устаревшие.
+        """
+        await self.wait_idle()
+        self._skew += seconds
+        routers = self.network.routers.values()
+        for router in routers:
+            router.refresh_lsa()
+        await self.wait_idle()
+        for router in routers:
+            router.age_lsdb()
+        await self.wait_idle()
+
+    def send(self, source: str, destination: str, payload: Any) -> "asyncio.Future[bool]":
+        """Отправляет пакет данных; результат future — True, если пакет доставлен"""
+        packet = Packet(source=source, destination=destination, payload=payload, path=[source])
+        future = self._loop.create_future()
+        self._replies[id(packet)] = (future, self.now)
+        self._in_flight += 1
+        self._idle.clear()
+        self.queues[source].put_nowait((packet, None))
+        return future
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "processed": self.processed,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "avg_latency": self.latency_sum / self.delivered if self.delivered else 0.0,
+        }
+
+    # --- внутреннее -----------------------------------------------------------
+
+    async def _pump(self):
+        """Переносит пакеты из линий во входные очереди, когда подходит время доставки"""
+        wire = self._wire
+        while True:
+            if not wire:
+                self._wire_ready.clear()
+                await self._wire_ready.wait()
+                continue
+            delay = wire[0][0] - self.now
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.run()
+
+    async def _serve(self, router):
+        queue = self.queues[router.name]
+        while True:
+            packet, interface = await queue.get()
+            self.processed += 1
+            try:
+                delivered, next_router, next_interface = router.process_packet(packet, interface)
+                if next_router is not None:
+                    self.submit(next_router, packet, next_interface)
+                elif packet.type == PacketType.DATA:
+                    self._finish(packet, delivered)
+            except Exception as error:
+                # Ошибка в одном пакете не останавливает задачу маршрутизатора
+                if router.sink.enabled(WARNING):
+                    router.sink.emit(WARNING, router.name, f"Packet processing failed: {error!r}")
+                if packet.type == PacketType.DATA:
+                    self._finish(packet, False)
+            finally:
+                self._in_flight -= 1
+                self._check_idle()
+
+    def _finish(self, packet: Packet, delivered: bool):
+        reply = self._replies.pop(id(packet), None)
+        if delivered:
+            self.delivered += 1
+        else:
+            self.dropped += 1
+        if reply is not None:
+            future, sent = reply
+            if delivered:
+                self.latency_sum += self.now - sent
+            if not future.done():
+                future.set_result(delivered)
+
+    def _fire(self, fn: Callable, args: tuple):
+        # Таймеры маршрутизаторов — это запуски SPF
+        self._timers -= 1
+        self.last_spf = self.now
+        try:
+            fn(*args)
+        finally:
+            self._check_idle()
+
+    def _check_idle(self):
+        if self._in_flight == 0 and self._timers == 0:
+            self._idle.set()
@@ -0,0 +1,53 @@
+from dataclasses import dataclass
+from typing import Optional
+
+@dataclass
+class SpfTimers:
+    """Таймеры SPF (секунды модельного времени), как spf-throttle в OSPF"""
+    initial_delay: float = 0.05  # ожидание после первого нового LSA
+    hold: float = 0.2            # начальный интервал между двумя запусками SPF
+    max_wait: float = 5.0        # предел экспоненциального роста интервала
+
+class SpfScheduler:
+    """Откладывает и объединяет пересчеты таблицы маршрутизации.
+
+    Все LSA, пришедшие до срабатывания таймера, обрабатываются одним запуском
+    calculate_routing_table(). Если запросы идут подряд, интервал между запусками
+    удваивается до max_wait; после затишья длиной в два интервала он сбрасывается к hold.
+    """
+
+    def __init__(self, router, timers: Optional[SpfTimers] = None):
+        self.router = router
+        self.timers = timers or SpfTimers()
+        self.wait = self.timers.hold
+        self.last_run = float("-inf")
+        self.scheduled = False
+        self.requests = 0
+        self.runs = 0
+
+    @property
+    def saved(self) -> int:
+        """Сколько запусков SPF сэкономлено объединением"""
+        return self.requests - self.runs - (1 if self.scheduled else 0)
+
+    def request(self):
+        """Запрашивает пересчет; повторные запросы до срабатывания таймера объединяются"""
+        self.requests += 1
+        if self.scheduled:
+            return
+        engine = self.router.engine
+        now = engine.now
+        if now - self.last_run > 2 * self.wait:
+            self.wait = self.timers.hold
+            delay = self.timers.initial_delay
+        else:
+            delay = max(self.timers.initial_delay, self.last_run + self.wait - now)
+            self.wait = min(self.wait * 2, self.timers.max_wait)
+        self.scheduled = True
+        engine.call_later(delay, self._run)
+
+    def _run(self):
+        self.scheduled = False
+        self.last_run = self.router.engine.now
+        self.runs += 1
+        self.router.calculate_routing_table()
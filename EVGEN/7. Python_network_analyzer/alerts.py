@@ -0,0 +1,244 @@
+# alerts.py
+import json
+import socket
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+
+class Alert:
+    __slots__ = ("kind", "source", "message", "time", "suppressed")
+
+    def __init__(self, kind, source, message, time, suppressed=0):
+        self.kind = kind
+        self.source = source
+        self.message = message
+        self.time = time              # время обнаружения (эпоха, секунды)
+        self.suppressed = suppressed  # сколько таких же предупреждений отброшено перед этим
+
+    def text(self):
+        if self.suppressed:
+            return f"{self.message} (+{self.suppressed} similar suppressed)"
+        return self.message
+
+    def as_dict(self):
+        return {
+            'time': self.time,
+            'kind': self.kind,
+            'source': self.source,
+            'message': self.message,
+            'suppressed': self.suppressed,
+        }
+
+# --- Получатели предупреждений ----------------------------------------------
+
+class StdoutSink:
+    """Вывод в терминал (как раньше print в детекторах)"""
+
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def write(self, alert):
+        print(alert.text(), file=self.stream or sys.stdout)
+
+    def flush(self):
+        (self.stream or sys.stdout).flush()
+
+    def close(self):
+        self.flush()
+
+class JsonLinesSink:
+    """Файл JSON Lines: одно предупреждение — одна строка"""
+
+    def __init__(self, path):
+        self.file = open(path, "a", encoding="utf-8")
+
+    def write(self, alert):
+        self.file.write(json.dumps(alert.as_dict(), ensure_ascii=False) + "\n")
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+class SyslogSink:
+    """Отправка по UDP в формате syslog (RFC 3164), facility local0, уровень warning.
+
+    Достаточно любого приемника syslog, например `nc -ul 5514` для проверки.
+    """
+
+    PRIORITY = 16 * 8 + 4  # local0.warning
+
+    def __init__(self, host="127.0.0.1", port=514, tag="network_analyzer"):
+        self.address = (host, port)
+        self.tag = tag
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def write(self, alert):
+        stamp = time.strftime("%b %d %H:%M:%S", time.localtime(alert.time))
+        line = f"<{self.PRIORITY}>{stamp} {self.tag}: {alert.text()}"
+        try:
+            self.socket.sendto(line.encode("utf-8", "replace"), self.address)
+        except OSError:
+            pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.socket.close()
+
+# --- Конвейер ----------------------------------------------------------------
+
+class AlertPipeline:
+    """Асинхронная выдача предупреждений.
+
+    Детектор вызывает emit() в потоке захвата: предупреждение проходит ограничение
+    частоты и попадает в ограниченную очередь, а пишет его в получатели фоновый
+    поток. Захват не ждет терминала, файла или сети.
+
+    - Ограничение частоты: для каждой пары (тип, источник) не больше одного
+      предупреждения за interval секунд; отброшенные считаются и добавляются
+      к следующему предупреждению как «+N similar suppressed».
+    - Очередь — deque(maxlen): append и popleft атомарны в CPython, поэтому
+      поток захвата не берет блокировок. Если писатель не успевает, вытесняются
+      самые старые предупреждения (счетчик dropped).
+    - stop() дописывает очередь и останавливает писателя, получатели остаются
+      открытыми, и конвейер можно снова запустить. close() закрывает получатели,
+      но только после того, как писатель завершился.
+    """
+
+    def __init__(self, sinks=None, interval=1.0, max_queue=10000, max_keys=10000):
+        self.sinks = list(sinks) if sinks is not None else [StdoutSink()]
+        self.interval = interval
+        self.max_keys = max_keys
+        self.queue = deque(maxlen=max_queue)
+        self._last = OrderedDict()  # (тип, источник) -> [время последнего, отброшено с тех пор]
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()  # запуск и остановка писателя, закрытие получателей
+        self._thread = None
+        self._running = False
+        self._closing = False
+        self.closed = False
+        self.emitted = 0
+        self.suppressed = 0
+        self.dropped = 0
+        self.written = 0
+
+    def emit(self, kind, message, source=None, now=0.0, wall=None):
+        """Предупреждение от детектора; now — время детектора для ограничения частоты"""
+        key = (kind, source)
+        last = self._last.get(key)
+        if last is not None:
+            if now - last[0] < self.interval:
+                last[1] += 1
+                self.suppressed += 1
+                return False
+            suppressed = last[1]
+            last[0], last[1] = now, 0
+            self._last.move_to_end(key)
+        else:
+            suppressed = 0
+            self._last[key] = [now, 0]
+            if len(self._last) > self.max_keys:
+                self._last.popitem(last=False)
+        queue = self.queue
+        was_empty = not queue
+        if len(queue) == queue.maxlen:
+            self.dropped += 1
+        queue.append(Alert(kind, source, message, wall if wall is not None else time.time(), suppressed))
+        self.emitted += 1
+        if was_empty:
+            self._wakeup.set()
+        return True
+
+    @property
+    def depth(self):
+        return len(self.queue)
+
+    def start(self):
+        with self._lock:
+            if self._closing:
+                raise RuntimeError("AlertPipeline is closed")
+            self._running = True
+            # Если прежний писатель еще дописывает очередь, он и продолжит работу
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._writer, daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout=5.0):
+        """Останавливает писателя, дописав очередь. Возвращает True, если он завершился"""
+        with self._lock:
+            self._running = False
+            thread = self._thread
+        if thread is None:
+            return True
+        self._wakeup.set()
+        thread.join(timeout)
+        return not thread.is_alive()
+
+    def close(self, timeout=5.0):
+        """Останавливает писателя и закрывает получатели, как только он завершится.
+
+        Если писатель не успел за timeout секунд, получатели закроет он сам,
+        дописав очередь; возвращается False. Повторный вызов ничего не делает.
+        """
+        with self._lock:
+            self._closing = True
+            self._running = False
+            thread = self._thread
+            if thread is None:
+                self._drain()
+                self._close_sinks()
+                return True
+        self._wakeup.set()
+        thread.join(timeout)
+        return not thread.is_alive()
+
+    def _drain(self):
+        queue = self.queue
+        while queue:
+            alert = queue.popleft()
+            for sink in self.sinks:
+                try:
+                    sink.write(alert)
+                except Exception:
+                    pass
+            self.written += 1
+        for sink in self.sinks:
+            try:
+                sink.flush()
+            except Exception:
+                pass
+
+    def _close_sinks(self):
+        if self.closed:
+            return
+        self.closed = True
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except Exception:
+                pass
+
+    def _writer(self):
+        while True:
+            self._wakeup.wait(0.5)
+            self._wakeup.clear()
+            self._drain()
+            with self._lock:
+                if not self._running and not self.queue:
+                    self._thread = None
+                    if self._closing:
+                        self._close_sinks()
+                    return
+
+    def stats(self):
+        return {
+            'emitted': self.emitted,
+            'suppressed': self.suppressed,
+            'dropped': self.dropped,
+            'written': self.written,
+            'queue_depth': len(self.queue),
+        }
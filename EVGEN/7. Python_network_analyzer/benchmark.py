@@ -0,0 +1,109 @@
+# benchmark.py
+import argparse
+import contextlib
+import os
+import random
+import time
+from scapy.all import rdpcap
+from scapy.packet import Raw
+from scapy.layers.inet import IP, TCP, UDP, ICMP
+from scapy.layers.l2 import ARP, Ether
+from dissect import dissect
+from network_analyzer import NetworkAnalyzer
+
+def make_capture(count, seed=1):
+    """Синтетическая запись: веб-трафик, DNS, DHCP, ICMP, ARP, фрагменты и SYN flood.
+
+    Пакеты собираются, переводятся в байты и разбираются заново через Ether(raw),
+    как при захвате, чтобы у слоев были заполнены все поля.
+    """
+    rnd = random.Random(seed)
+
+    def host():
+        return f"192.168.{rnd.randrange(4)}.{rnd.randrange(1, 255)}"
+
+    makers = [
+        lambda: Ether() / IP(src=host(), dst="10.0.0.80") / TCP(sport=rnd.randrange(1024, 65535), dport=80, flags="PA")
+                / Raw(b"GET /index.html HTTP/1.1\r\nHost: example\r\n\r\n"),
+        lambda: Ether() / IP(src="10.0.0.80", dst=host()) / TCP(sport=80, dport=rnd.randrange(1024, 65535), flags="A")
+                / Raw(bytes(rnd.randrange(256) for _ in range(200))),
+        lambda: Ether() / IP(src=host(), dst="8.8.8.8") / UDP(sport=rnd.randrange(1024, 65535), dport=53) / Raw(b"\x12\x34" * 10),
+        lambda: Ether() / IP(src="0.0.0.0", dst="255.255.255.255") / UDP(sport=68, dport=67) / Raw(b"\x01" * 240),
+        lambda: Ether() / IP(src=host(), dst=host()) / ICMP(),
+        lambda: Ether(dst="11:22:33:44:55:66") / ARP(op=2, psrc=host(), pdst=host(), hwsrc="aa:bb:cc:dd:ee:ff"),
+        lambda: Ether() / IP(src=host(), dst=host(), flags=1) / UDP(sport=5000, dport=5001) / Raw(b"x" * 64),
+        lambda: Ether() / IP(src=f"{rnd.randrange(1, 224)}.{rnd.randrange(256)}.{rnd.randrange(256)}.{rnd.randrange(256)}",
+                             dst="10.0.0.80") / TCP(sport=rnd.randrange(1024, 65535), dport=80, flags="S"),
+    ]
+    weights = [25, 25, 15, 2, 8, 3, 2, 20]
+    packets = []
+    for i in range(count):
+        packet = Ether(bytes(rnd.choices(makers, weights)[0]()))
+        packet.time = 1000.0 + i * 0.0001
+        packets.append(packet)
+    return packets
+
+def legacy_access(packet):
+    """Обращения к слоям, как в прежнем _packet_handler: haslayer() на каждый протокол,
+    затем в каждом анализаторе снова haslayer() и packet[Layer]"""
+    if packet.haslayer(IP):
+        packet[IP].flags
+    if packet.haslayer(TCP):
+        if packet.haslayer(IP) and packet.haslayer(TCP):
+            ip = packet[IP]
+            tcp = packet[TCP]
+            ip.src
+            tcp.flags
+            tcp.flags
+            if tcp.dport == 80 or tcp.sport == 80:
+                if packet.haslayer(Raw):
+                    str(packet[Raw].load)
+    if packet.haslayer(UDP):
+        if packet.haslayer(IP) and packet.haslayer(UDP):
+            packet[IP].src
+            udp = packet[UDP]
+            udp.dport
+            udp.sport
+    if packet.haslayer(ICMP):
+        packet.haslayer(IP)
+    if packet.haslayer(ARP):
+        arp = packet[ARP]
+        arp.op
+        arp.psrc
+        arp.pdst
+        arp.hwsrc
+
+def per_packet_us(fn, packets, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for packet in packets:
+            fn(packet)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1e6 / len(packets)
+
+def main():
+    parser = argparse.ArgumentParser(description="Микробенчмарк разбора пакетов NetworkAnalyzer")
+    parser.add_argument("--pcap", help="файл записи (pcap/pcapng); по умолчанию синтетическая запись")
+    parser.add_argument("--count", type=int, default=20000, help="число пакетов синтетической записи")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    packets = list(rdpcap(args.pcap)) if args.pcap else make_capture(args.count, args.seed)
+    print(f"Packets: {len(packets)}" + (f" from {args.pcap}" if args.pcap else " (synthetic)"))
+
+    legacy = per_packet_us(legacy_access, packets, args.repeat)
+    single = per_packet_us(dissect, packets, args.repeat)
+    print(f"Layer access, haslayer/packet[Layer]: {legacy:8.2f} us/packet")
+    print(f"Layer access, single-pass dissect:    {single:8.2f} us/packet ({legacy / single:.1f}x)")
+
+    # Полный обработчик, включая детекторы; предупреждения не выводятся в терминал
+    analyzer = NetworkAnalyzer()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        handler = per_packet_us(analyzer._packet_handler, packets, 1)
+    print(f"Full _packet_handler:                 {handler:8.2f} us/packet ({1e6 / handler:.0f} packets/s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# clock.py
+import threading
+import time
+
+class PacketClock:
+    """Время по меткам пакетов — для разбора записей.
+
+    Детекторы видят время, когда пакет был захвачен, поэтому результат разбора
+    не зависит от скорости компьютера и одинаков при каждом запуске. Время не
+    убывает: пакет с меткой раньше предыдущего считается пришедшим одновременно с ним.
+    """
+
+    def __init__(self):
+        self.current = 0.0
+
+    def now(self, summary=None):
+        if summary is not None and summary.time is not None and summary.time > self.current:
+            self.current = summary.time
+        return self.current
+
+    def wall(self, now):
+        """Время now как метка эпохи (метки пакетов уже в эпохе)"""
+        return now
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+class CoarseClock:
+    """Монотонные часы с кешированным значением — для захвата в реальном времени.
+
+    Пока часы запущены (start), фоновый поток обновляет значение раз в resolution
+    секунд, а now() только читает атрибут, без системного вызова на каждый пакет.
+    Точности resolution (по умолчанию 10 мс) достаточно для окон от секунды.
+    До запуска now() читает time.monotonic() напрямую.
+    """
+
+    def __init__(self, resolution=0.01):
+        self.resolution = resolution
+        self.current = time.monotonic()
+        self._offset = time.time() - self.current
+        self._running = False
+        self._thread = None
+
+    def now(self, summary=None):
+        if self._running:
+            return self.current
+        return time.monotonic()
+
+    def wall(self, now):
+        """Время now как метка эпохи, например для журнала предупреждений"""
+        return now + self._offset
+
+    def start(self):
+        if self._running:
+            return
+        self.current = time.monotonic()
+        self._running = True
+        self._thread = threading.Thread(target=self._tick, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+
+    def _tick(self):
+        while self._running:
+            time.sleep(self.resolution)
+            self.current = time.monotonic()
@@ -0,0 +1,227 @@
+# dissect.py
+import socket
+import struct
+from scapy.packet import NoPayload, Raw
+from scapy.utils import RawPcapNgReader, RawPcapReader
+from scapy.layers.inet import IP, TCP, UDP, ICMP
+from scapy.layers.l2 import ARP, Ether
+
+class PacketSummary:
+    """Плоская сводка пакета: поля L2/L3/L4, флаги и полезная нагрузка.
+
+    Заполняется один раз за проход по слоям Scapy, после чего анализаторы читают
+    обычные атрибуты, а не вызывают haslayer() и packet[Layer] (каждый такой вызов —
+    новый проход по цепочке слоев). Отсутствующие поля равны None.
+    """
+
+    __slots__ = (
+        "time", "length", "protocols",
+        "src_mac", "dst_mac",
+        "src_ip", "dst_ip", "ip_flags", "frag",
+        "sport", "dport", "tcp_flags", "icmp_type",
+        "arp_op", "arp_psrc", "arp_pdst", "arp_hwsrc",
+        "payload", "payload_length",
+    )
+
+    def __init__(self):
+        self.time = None
+        self.length = 0
+        self.protocols = ()
+        self.src_mac = self.dst_mac = None
+        self.src_ip = self.dst_ip = self.ip_flags = self.frag = None
+        self.sport = self.dport = self.tcp_flags = self.icmp_type = None
+        self.arp_op = self.arp_psrc = self.arp_pdst = self.arp_hwsrc = None
+        self.payload = None
+        self.payload_length = 0
+
+    def __repr__(self):
+        return f"PacketSummary({'/'.join(self.protocols)}, {self.src_ip or self.arp_psrc} -> {self.dst_ip or self.arp_pdst})"
+
+def _fields(layer):
+    fields = layer.fields
+    if len(fields) < len(layer.fields_desc):
+        # Пакет собран вручную и не разбирался из байтов: часть полей по умолчанию
+        fields = {**layer.default_fields, **fields}
+    return fields
+
+def _ether(summary, layer):
+    fields = _fields(layer)
+    summary.src_mac = fields['src']
+    summary.dst_mac = fields['dst']
+
+def _ip(summary, layer):
+    fields = _fields(layer)
+    summary.src_ip = fields['src']
+    summary.dst_ip = fields['dst']
+    summary.ip_flags = int(fields['flags'])
+    summary.frag = fields['frag']
+
+def _tcp(summary, layer):
+    fields = _fields(layer)
+    summary.sport = fields['sport']
+    summary.dport = fields['dport']
+    summary.tcp_flags = int(fields['flags'])
+
+def _udp(summary, layer):
+    fields = _fields(layer)
+    summary.sport = fields['sport']
+    summary.dport = fields['dport']
+
+def _icmp(summary, layer):
+    summary.icmp_type = _fields(layer)['type']
+
+def _arp(summary, layer):
+    fields = _fields(layer)
+    summary.arp_op = fields['op']
+    summary.arp_psrc = fields['psrc']
+    summary.arp_pdst = fields['pdst']
+    summary.arp_hwsrc = fields['hwsrc']
+
+def _raw(summary, layer):
+    summary.payload = bytes(layer.load)
+    summary.payload_length = len(summary.payload)
+
+# Слой Scapy -> (имя протокола, функция извлечения полей). Учитывается первое
+# вхождение слоя, как у packet[Layer]; вложенные заголовки ICMP-ошибок — другие классы
+LAYERS = {
+    Ether: ('Ether', _ether),
+    IP: ('IP', _ip),
+    TCP: ('TCP', _tcp),
+    UDP: ('UDP', _udp),
+    ICMP: ('ICMP', _icmp),
+    ARP: ('ARP', _arp),
+    Raw: ('Raw', _raw),
+}
+
+def dissect(packet):
+    """Один проход по слоям пакета Scapy -> PacketSummary"""
+    summary = PacketSummary()
+    timestamp = getattr(packet, 'time', None)
+    summary.time = float(timestamp) if timestamp is not None else None
+    original = getattr(packet, 'original', None)
+    summary.length = len(original) if original else len(packet)
+    protocols = []
+    layer = packet
+    while not isinstance(layer, NoPayload):
+        entry = LAYERS.get(type(layer))
+        if entry is not None and entry[0] not in protocols:
+            protocols.append(entry[0])
+            entry[1](summary, layer)
+        layer = layer.payload
+    summary.protocols = tuple(protocols)
+    return summary
+
+# --- Разбор записи без Scapy ---------------------------------------------------
+#
+# При разборе записи большую часть времени занимало построение объектов Scapy,
+# а анализаторам нужна только сводка. Поэтому кадры из файла разбираются прямо
+# из байтов (struct) в тот же PacketSummary. Поддерживаются Ethernet (с VLAN),
+# Linux cooked capture и «сырой» IP; IPv4, TCP, UDP, ICMP и ARP.
+
+LINKTYPE_ETHERNET = 1
+LINKTYPE_RAW = (12, 14, 101, 228)
+LINKTYPE_LINUX_SLL = 113
+
+_IPV4 = struct.Struct("!BBHHHBBH4s4s")
+_PORTS = struct.Struct("!HH")
+_ARP = struct.Struct("!HHBBH")
+
+def _mac(data):
+    return data.hex(":")
+
+def _dissect_ipv4(summary, data, offset, protocols):
+    (version_ihl, _, total_length, _, flags_frag, _, proto, _,
+     src, dst) = _IPV4.unpack_from(data, offset)
+    if version_ihl >> 4 != 4:
+        return
+    protocols.append('IP')
+    summary.src_ip = socket.inet_ntoa(src)
+    summary.dst_ip = socket.inet_ntoa(dst)
+    summary.ip_flags = flags_frag >> 13
+    summary.frag = flags_frag & 0x1FFF
+    header = (version_ihl & 0x0F) * 4
+    # Длина из заголовка отсекает выравнивание кадра Ethernet
+    end = offset + total_length if total_length >= header else len(data)
+    end = min(end, len(data))
+    l4 = offset + header
+    if summary.frag:
+        # Продолжение фрагмента: заголовка L4 в нем нет
+        payload = data[l4:end]
+    elif proto == 6:
+        protocols.append('TCP')
+        summary.sport, summary.dport = _PORTS.unpack_from(data, l4)
+        summary.tcp_flags = data[l4 + 13] | ((data[l4 + 12] & 1) << 8)
+        payload = data[l4 + (data[l4 + 12] >> 4) * 4:end]
+    elif proto == 17:
+        protocols.append('UDP')
+        summary.sport, summary.dport = _PORTS.unpack_from(data, l4)
+        payload = data[l4 + 8:end]
+    elif proto == 1:
+        protocols.append('ICMP')
+        summary.icmp_type = data[l4]
+        payload = b""
+    else:
+        payload = data[l4:end]
+    if payload:
+        protocols.append('Raw')
+        summary.payload = payload
+        summary.payload_length = len(payload)
+
+def _dissect_arp(summary, data, offset, protocols):
+    _, _, hw_length, proto_length, op = _ARP.unpack_from(data, offset)
+    protocols.append('ARP')
+    summary.arp_op = op
+    if hw_length == 6 and proto_length == 4:
+        summary.arp_hwsrc = _mac(data[offset + 8:offset + 14])
+        summary.arp_psrc = socket.inet_ntoa(data[offset + 14:offset + 18])
+        summary.arp_pdst = socket.inet_ntoa(data[offset + 24:offset + 28])
+
+def dissect_raw(data, linktype=LINKTYPE_ETHERNET, timestamp=None):
+    """Кадр из записи (байты) -> PacketSummary без построения пакета Scapy"""
+    summary = PacketSummary()
+    summary.time = timestamp
+    summary.length = len(data)
+    protocols = []
+    if linktype == LINKTYPE_ETHERNET:
+        protocols.append('Ether')
+        summary.dst_mac = _mac(data[0:6])
+        summary.src_mac = _mac(data[6:12])
+        offset = 12
+        ether_type = (data[offset] << 8) | data[offset + 1]
+        while ether_type in (0x8100, 0x88A8):  # метки VLAN
+            offset += 4
+            ether_type = (data[offset] << 8) | data[offset + 1]
+        offset += 2
+    elif linktype == LINKTYPE_LINUX_SLL:
+        ether_type = (data[14] << 8) | data[15]
+        offset = 16
+    elif linktype in LINKTYPE_RAW:
+        ether_type = 0x0800
+        offset = 0
+    else:
+        ether_type = None
+        offset = 0
+    if ether_type == 0x0800:
+        _dissect_ipv4(summary, data, offset, protocols)
+    elif ether_type == 0x0806:
+        _dissect_arp(summary, data, offset, protocols)
+    summary.protocols = tuple(protocols)
+    return summary
+
+def dissect_record(record):
+    """(байты, linktype, метка времени) из read_capture() -> PacketSummary"""
+    return dissect_raw(*record)
+
+def read_capture(path):
+    """Потоковое чтение pcap/pcapng: (байты кадра, linktype, метка времени в секундах)"""
+    with RawPcapReader(path) as reader:
+        if isinstance(reader, RawPcapNgReader):
+            for data, meta in reader:
+                yield data, meta.linktype, ((meta.tshigh << 32) + meta.tslow) / meta.tsresol
+        else:
+            # Классический pcap: тип канала общий, метки в микро- или наносекундах
+            linktype = reader.linktype
+            scale = 1e-9 if reader.nano else 1e-6
+            for data, meta in reader:
+                yield data, linktype, meta.sec + meta.usec * scale
+
@@ -0,0 +1,215 @@
+# metrics.py
+import json
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Границы корзин гистограммы времени детектора, секунды (1 мкс .. 10 мс)
+LATENCY_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 1e-3, 1e-2)
+
+class Histogram:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # последняя корзина — +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """[(граница, число наблюдений <= границы)], последняя граница — +Inf"""
+        total = 0
+        result = []
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+class AnalyzerMetrics:
+    """Счетчики анализатора, которые ведутся на каждом пакете, без обхода состояния.
+
+    Пишет в них только поток захвата. Скорости (пакеты/с, байты/с, по протоколам)
+    пересчитываются им же раз в interval секунд по разнице счетчиков, поэтому
+    поток HTTP читает готовые числа и блокировки не нужны.
+    """
+
+    def __init__(self, interval=1.0):
+        self.interval = interval
+        self.packets = 0
+        self.bytes = 0
+        self.errors = 0
+        self.protocols = {}
+        self.detectors = {}
+        self.packets_per_sec = 0.0
+        self.bytes_per_sec = 0.0
+        self.protocol_rates = {}
+        self.last_tick = None
+        self._snapshot = (0, 0, {})
+
+    def packet(self, summary, now):
+        self.packets += 1
+        self.bytes += summary.length
+        protocols = self.protocols
+        for protocol in summary.protocols:
+            protocols[protocol] = protocols.get(protocol, 0) + 1
+        if self.last_tick is None:
+            self.last_tick = now
+        elif now - self.last_tick >= self.interval:
+            self._tick(now)
+
+    def observe(self, detector, seconds):
+        histogram = self.detectors.get(detector)
+        if histogram is None:
+            histogram = self.detectors[detector] = Histogram()
+        histogram.observe(seconds)
+
+    def _tick(self, now):
+        elapsed = now - self.last_tick
+        packets, total_bytes, protocols = self._snapshot
+        self.packets_per_sec = (self.packets - packets) / elapsed
+        self.bytes_per_sec = (self.bytes - total_bytes) / elapsed
+        self.protocol_rates = {name: (count - protocols.get(name, 0)) / elapsed
+                               for name, count in self.protocols.items()}
+        self._snapshot = (self.packets, self.bytes, dict(self.protocols))
+        self.last_tick = now
+
+    def rates(self, now):
+        """Скорости за последний интервал; если пакетов давно не было — нули"""
+        if self.last_tick is None or now - self.last_tick > 2 * self.interval:
+            return 0.0, 0.0, {}
+        return self.packets_per_sec, self.bytes_per_sec, dict(self.protocol_rates)
+
+def _line(lines, name, value, labels=None):
+    if labels:
+        label_text = ",".join(f'{key}="{val}"' for key, val in labels.items())
+        lines.append(f"{name}{{{label_text}}} {value}")
+    else:
+        lines.append(f"{name} {value}")
+
+def _header(lines, name, kind, text):
+    lines.append(f"# HELP {name} {text}")
+    lines.append(f"# TYPE {name} {kind}")
+
+def render_prometheus(analyzer):
+    """Метрики анализатора в текстовом формате Prometheus"""
+    metrics = analyzer.metrics
+    now = analyzer.clock.now()
+    pps, bps, protocol_rates = metrics.rates(now)
+    lines = []
+
+    _header(lines, "netanalyzer_packets_total", "counter", "Packets processed")
+    _line(lines, "netanalyzer_packets_total", metrics.packets)
+    _header(lines, "netanalyzer_bytes_total", "counter", "Bytes processed")
+    _line(lines, "netanalyzer_bytes_total", metrics.bytes)
+    _header(lines, "netanalyzer_errors_total", "counter", "Packets that failed dissection or analysis")
+    _line(lines, "netanalyzer_errors_total", metrics.errors)
+    _header(lines, "netanalyzer_packets_per_second", "gauge", "Packet rate over the last interval")
+    _line(lines, "netanalyzer_packets_per_second", f"{pps:.1f}")
+    _header(lines, "netanalyzer_bytes_per_second", "gauge", "Byte rate over the last interval")
+    _line(lines, "netanalyzer_bytes_per_second", f"{bps:.1f}")
+
+    _header(lines, "netanalyzer_protocol_packets_total", "counter", "Packets per protocol")
+    for protocol, count in sorted(metrics.protocols.items()):
+        _line(lines, "netanalyzer_protocol_packets_total", count, {"protocol": protocol})
+    _header(lines, "netanalyzer_protocol_packets_per_second", "gauge", "Packet rate per protocol")
+    for protocol, rate in sorted(protocol_rates.items()):
+        _line(lines, "netanalyzer_protocol_packets_per_second", f"{rate:.1f}", {"protocol": protocol})
+
+    _header(lines, "netanalyzer_detector_seconds", "histogram", "Time spent in each detector per packet")
+    for name, histogram in sorted(metrics.detectors.items()):
+        detector = name.removeprefix("_analyze_")
+        for bound, count in histogram.cumulative():
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            _line(lines, "netanalyzer_detector_seconds_bucket", count, {"detector": detector, "le": le})
+        _line(lines, "netanalyzer_detector_seconds_sum", f"{histogram.sum:.6f}", {"detector": detector})
+        _line(lines, "netanalyzer_detector_seconds_count", histogram.count, {"detector": detector})
+
+    alerts = analyzer.alerts.stats()
+    _header(lines, "netanalyzer_alert_queue_depth", "gauge", "Alerts waiting for the writer thread")
+    _line(lines, "netanalyzer_alert_queue_depth", alerts['queue_depth'])
+    _header(lines, "netanalyzer_alerts_total", "counter", "Alerts by outcome")
+    for state in ('emitted', 'suppressed', 'dropped', 'written'):
+        _line(lines, "netanalyzer_alerts_total", alerts[state], {"state": state})
+
+    tables = analyzer.memory_stats()
+    _header(lines, "netanalyzer_source_entries", "gauge", "Entries in per-source state tables")
+    for table, stats in tables.items():
+        _line(lines, "netanalyzer_source_entries", stats['entries'], {"table": table})
+    _header(lines, "netanalyzer_source_evictions_total", "counter", "LRU evictions from per-source state tables")
+    for table, stats in tables.items():
+        _line(lines, "netanalyzer_source_evictions_total", stats['evictions'], {"table": table})
+    _header(lines, "netanalyzer_source_memory_bytes", "gauge", "Estimated memory of per-source state")
+    _line(lines, "netanalyzer_source_memory_bytes", sum(stats['memory'] for stats in tables.values()))
+    return "\n".join(lines) + "\n"
+
+def stats_snapshot(analyzer):
+    """Краткая сводка для /stats и print_stats()"""
+    metrics = analyzer.metrics
+    pps, bps, protocol_rates = metrics.rates(analyzer.clock.now())
+    return {
+        'packets': metrics.packets,
+        'bytes': metrics.bytes,
+        'errors': metrics.errors,
+        'packets_per_sec': pps,
+        'bytes_per_sec': bps,
+        'protocols': dict(metrics.protocols),
+        'protocol_rates': protocol_rates,
+        'alerts': analyzer.alerts.stats(),
+    }
+
+class MetricsServer:
+    """Локальный HTTP-сервер статистики: /metrics (Prometheus) и /stats (JSON).
+
+    Работает в отдельном потоке и только читает счетчики анализатора, поэтому
+    запрос не замедляет захват и не обходит таблицы состояния.
+    """
+
+    def __init__(self, analyzer, host="127.0.0.1", port=9108):
+        self.analyzer = analyzer
+        self.address = (host, port)
+        self.server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2] if self.server else self.address
+        return f"http://{host}:{port}/metrics"
+
+    def start(self):
+        analyzer = self.analyzer
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body = render_prometheus(analyzer).encode()
+                    content_type = "text/plain; version=0.0.4; charset=utf-8"
+                elif self.path == "/stats":
+                    body = json.dumps(stats_snapshot(analyzer)).encode()
+                    content_type = "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(self.address, Handler)
+        self.server.daemon_threads = True
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
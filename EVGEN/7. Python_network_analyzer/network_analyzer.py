@@ -1,24 +1,42 @@
 # network_analyzer_final.py
 from scapy.all import *
-from scapy.layers.inet import IP, TCP, UDP, ICMP
-from scapy.layers.l2 import ARP, Ether
-from collections import defaultdict, deque
+from scapy.layers.inet import IP, TCP
 import time
 import threading
 import platform
 import subprocess
 import re
+import argparse
+from sliding_window import SlidingCounter, DistinctCounter
+from source_state import ENTRY_OVERHEAD, SourceTable, WindowedCountMin, estimate_size
+from dissect import dissect, dissect_record, read_capture
+from clock import CoarseClock, PacketClock
+from alerts import AlertPipeline, JsonLinesSink, StdoutSink, SyslogSink
+from metrics import AnalyzerMetrics, MetricsServer, stats_snapshot
 
 class NetworkAnalyzer:
-    def __init__(self):
-        # Статистика для обнаружения аномалий
-        self.syn_count = defaultdict(lambda: deque(maxlen=100))
-        self.arp_table = defaultdict(set)
-        self.dhcp_requests = deque(maxlen=1000)
-        self.port_scan_attempts = defaultdict(lambda: defaultdict(int))
-        self.http_requests = deque(maxlen=100)
-        self.fragmented_packets = deque(maxlen=100)
-        self.icmp_packets = deque(maxlen=1000)
+    def __init__(self, memory_limit=64 * 1024 * 1024, clock=None, alert_sinks=None):
+        # Часы детекторов: время читается один раз на пакет. При захвате —
+        # монотонные часы с кешем, при разборе записи — метки пакетов
+        self.clock = clock if clock is not None else CoarseClock()
+        
+        # Предупреждения пишет фоновый поток; детекторы только ставят их в очередь
+        self.alerts = AlertPipeline(alert_sinks)
+        
+        # Счетчики пакетов, байт, протоколов и времени детекторов ведутся на
+        # каждом пакете; их читает сервер статистики (MetricsServer)
+        self.metrics = AnalyzerMetrics()
+        self.metrics_server = None
+        
+        # Окна обнаружения в секундах
+        self.windows = {
+            'syn_flood': 1,
+            'port_scan': 10,
+            'dhcp_starvation': 1,
+            'http_slow_dos': 10,
+            'ip_fragmentation': 1,
+            'smurf_attack': 1,
+        }
         
         # Пороги для обнаружения аномалий
         self.thresholds = {
@@ -30,8 +48,78 @@ class NetworkAnalyzer:
             'smurf_attack': 50,   # ICMP пакетов в секунду
         }
         
+        # Статистика для обнаружения аномалий: счетчики по скользящему окну,
+        # проверка на каждом пакете стоит O(1), а не обход всей истории
+        self._init_source_state(memory_limit)
+        self.dhcp_requests = SlidingCounter(self.windows['dhcp_starvation'])
+        self.http_requests = SlidingCounter(self.windows['http_slow_dos'])  # только медленные запросы
+        self.fragmented_packets = SlidingCounter(self.windows['ip_fragmentation'])
+        self.icmp_packets = SlidingCounter(self.windows['smurf_attack'])
+        
+        # Анализаторы по протоколам: пакет разбирается один раз (dissect),
+        # затем вызываются анализаторы всех найденных в нем протоколов
+        self.analyzers = {
+            'IP': [self._analyze_ip],
+            'TCP': [self._analyze_tcp],
+            'UDP': [self._analyze_udp],
+            'ICMP': [self._analyze_icmp],
+            'ARP': [self._analyze_arp],
+        }
+        
         self.running = False
         self.packet_count = 0
+        self.progress_every = 100  # печать прогресса каждые N пакетов
+        
+        # Очистка устаревших источников идет в потоке захвата по времени детекторов:
+        # счетчики окон и таблицы источников меняет только этот поток
+        self.cleanup_interval = 60
+        self._next_cleanup = 0.0
+    
+    def _init_source_state(self, memory_limit):
+        """Таблицы состояния по источникам в пределах memory_limit байт.
+        
+        Подделанные адреса SYN flood создают по записи на пакет, поэтому таблицы
+        ограничены и вытесняют давно не встречавшиеся источники (LRU). Источник
+        попадает в таблицы SYN и портов только с третьего пакета, а до этого
+        учитывается в count-min sketch фиксированного размера. Порты первых пакетов
+        запоминаются до допуска и переносятся в запись, чтобы сканирование из
+        threshold + 1 портов обнаруживалось так же, как без ограничения памяти.
+        """
+        self.memory_limit = memory_limit
+        # Окно sketch для портов короче окна сканирования: для допуска достаточно
+        # нескольких пакетов подряд, а в длинном окне sketch переполнился бы при флуде
+        syn_sketch = WindowedCountMin(self.windows['syn_flood'])
+        scan_sketch = WindowedCountMin(2.0)
+        budget = max(0, memory_limit - syn_sketch.memory - scan_sketch.memory) // 3
+        
+        max_ports = 4 * self.thresholds['port_scan']
+        sample = DistinctCounter(self.windows['port_scan'], max_keys=max_ports)
+        for port in range(max_ports):
+            sample.add(0.0, port)
+        
+        self.syn_count = SourceTable(lambda: SlidingCounter(self.windows['syn_flood']),
+                                     budget, sketch=syn_sketch, admit=3)
+        self.port_scan_attempts = SourceTable(
+            lambda: DistinctCounter(self.windows['port_scan'], max_keys=max_ports),
+            budget, entry_bytes=estimate_size(sample) + ENTRY_OVERHEAD, sketch=scan_sketch, admit=3,
+            seed=self._seed_ports)
+        # Привязки IP -> MAC, встреченные дважды, не вытесняются: иначе поток ARP-ответов
+        # с подделанных адресов вытеснил бы настоящую привязку перед подменой
+        self.arp_table = SourceTable(set, budget, entry_bytes=estimate_size({'00:00:00:00:00:00'}) + ENTRY_OVERHEAD,
+                                     keep_after=2)
+    
+    def _seed_ports(self, ports, backlog):
+        """Порты пакетов, пришедших от источника до допуска в таблицу"""
+        for seen, port in backlog:
+            ports.add(seen, port)
+    
+    def memory_stats(self):
+        """Заполнение и вытеснения таблиц состояния по источникам"""
+        return {
+            'syn': self.syn_count.stats(),
+            'port_scan': self.port_scan_attempts.stats(),
+            'arp': self.arp_table.stats(),
+        }
         
     def get_available_interfaces(self):
         """Получить список доступных интерфейсов с помощью разных методов"""
@@ -246,8 +334,8 @@ class NetworkAnalyzer:
                 print(f"❌ Error: {e}")
                 continue
     
-    def start_monitoring(self, interface_name=None):
-        """Запуск мониторинга сети"""
+    def start_monitoring(self, interface_name=None, metrics_port=9108):
+        """Запуск мониторинга сети; metrics_port=0 — без сервера статистики"""
         if not interface_name:
             interface_name = self.display_interfaces_menu()
             if not interface_name:
@@ -256,16 +344,12 @@ class NetworkAnalyzer:
             
         print(f"🎯 Using interface: {interface_name}")
         self.running = True
+        self.clock.start()
+        self.alerts.start()
         
-        # Запускаем очистку старых данных
-        cleaner_thread = threading.Thread(target=self._clean_old_data)
-        cleaner_thread.daemon = True
-        cleaner_thread.start()
-        
-        # Запускаем отображение статистики
-        stats_thread = threading.Thread(target=self._show_stats)
-        stats_thread.daemon = True
-        stats_thread.start()
+        # Запускаем сервер статистики вместо периодической печати
+        if metrics_port:
+            self.start_metrics_server(metrics_port)
         
         # Запускаем тестовые пакеты
         self._start_test_traffic()
@@ -318,198 +402,288 @@ class NetworkAnalyzer:
         test_thread.daemon = True
         test_thread.start()
     
-    def _clean_old_data(self):
-        """Очистка старых данных"""
-        while self.running:
-            time.sleep(60)
-            current_time = time.time()
-            
-            for src_ip in list(self.port_scan_attempts.keys()):
-                for port in list(self.port_scan_attempts[src_ip].keys()):
-                    if current_time - self.port_scan_attempts[src_ip][port] > 300:
-                        del self.port_scan_attempts[src_ip][port]
-    
-    def _show_stats(self):
-        """Показ статистики"""
-        while self.running:
-            time.sleep(15)
-            if self.packet_count > 0:
-                self.print_stats()
+    def analyze_pcap(self, path, limit=None):
+        """Разбор записи трафика (pcap/pcapng) с максимальной скоростью.
+        
+        Файл читается потоково, поэтому размер записи не ограничен памятью, а кадры
+        разбираются прямо из байтов (dissect_record), без построения пакетов Scapy.
+        Все окна обнаружения отсчитываются по меткам времени пакетов (PacketClock),
+        так что результат не зависит от скорости разбора.
+        Возвращает статистику пропускной способности.
+        """
+        if not isinstance(self.clock, PacketClock):
+            self.clock = PacketClock()
+        self.progress_every = 100000
+        packets = 0
+        first = last = None
+        self.alerts.start()
+        start = time.perf_counter()
+        try:
+            for record in read_capture(path):
+                self._handle(record, dissect_record)
+                packets += 1
+                timestamp = self.clock.now()
+                if first is None:
+                    first = timestamp
+                last = timestamp
+                if limit and packets >= limit:
+                    break
+            elapsed = time.perf_counter() - start
+        finally:
+            # Дописываем оставшиеся в очереди предупреждения
+            self.alerts.stop()
+        span = (last - first) if packets else 0.0
+        return {
+            'packets': packets,
+            'seconds': elapsed,
+            'packets_per_sec': packets / elapsed if elapsed else 0.0,
+            'capture_seconds': span,
+            'speedup': span / elapsed if elapsed else 0.0,
+        }
+    
+    def _cleanup(self, current_time):
+        """Удаление неактивных источников; вызывается из _handle раз в cleanup_interval"""
+        self._next_cleanup = current_time + self.cleanup_interval
+        # Порты устаревают внутри окна сами; удаляем источники без активности
+        self.port_scan_attempts.prune(lambda ports: not ports.count(current_time))
+        self.syn_count.prune(lambda syn: not syn.count(current_time))
+    
+    def start_metrics_server(self, port=9108, host="127.0.0.1"):
+        """Локальный HTTP-сервер статистики: /metrics (Prometheus) и /stats (JSON)"""
+        try:
+            self.metrics_server = MetricsServer(self, host, port)
+            self.metrics_server.start()
+            print(f"📈 Metrics: {self.metrics_server.url}")
+        except OSError as e:
+            self.metrics_server = None
+            print(f"⚠️ Cannot start metrics server on {host}:{port}: {e}")
     
     def _packet_handler(self, packet):
         """Обработчик каждого пакета"""
+        self._handle(packet, dissect)
+    
+    def _handle(self, item, dissector):
+        """Разбор пакета (Scapy или кадра из записи) и вызов анализаторов его протоколов"""
         self.packet_count += 1
         
-        # Показываем прогресс каждые 100 пакетов
-        if self.packet_count % 100 == 0:
+        # Показываем прогресс каждые progress_every пакетов
+        if self.packet_count % self.progress_every == 0:
             print(f"📦 Processed {self.packet_count} packets...")
         
         try:
-            # Анализ IP пакетов
-            if packet.haslayer(IP):
-                self._analyze_ip(packet)
-            
-            # Анализ TCP
-            if packet.haslayer(TCP):
-                self._analyze_tcp(packet)
-            
-            # Анализ UDP
-            if packet.haslayer(UDP):
-                self._analyze_udp(packet)
-            
-            # Анализ ICMP
-            if packet.haslayer(ICMP):
-                self._analyze_icmp(packet)
-            
-            # Анализ ARP
-            if packet.haslayer(ARP):
-                self._analyze_arp(packet)
+            summary = dissector(item)
+            current_time = self.clock.now(summary)
+            metrics = self.metrics
+            metrics.packet(summary, current_time)
+            if current_time >= self._next_cleanup:
+                self._cleanup(current_time)
+            for protocol in summary.protocols:
+                for analyzer in self.analyzers.get(protocol, ()):
+                    started = time.perf_counter()
+                    analyzer(summary, current_time)
+                    metrics.observe(analyzer.__name__, time.perf_counter() - started)
                 
         except Exception as e:
+            self.metrics.errors += 1
             if self.packet_count % 500 == 0:
                 print(f"⚠️ Packet processing error: {e}")
     
-    # Остальные методы анализа остаются без изменений
-    def _analyze_ip(self, packet):
+    def _analyze_ip(self, summary, current_time):
         """Анализ IP пакетов"""
-        ip = packet[IP]
-        current_time = time.time()
-        
-        if hasattr(ip, 'flags') and ip.flags == 1:
-            self.fragmented_packets.append(current_time)
-            self._check_ip_fragmentation_attack()
+        if summary.ip_flags == 1:
+            self.fragmented_packets.add(current_time)
+            self._check_ip_fragmentation_attack(current_time)
     
-    def _analyze_tcp(self, packet):
+    def _analyze_tcp(self, summary, current_time):
         """Анализ TCP пакетов"""
-        if packet.haslayer(IP) and packet.haslayer(TCP):
-            ip = packet[IP]
-            tcp = packet[TCP]
-            current_time = time.time()
-            src_ip = ip.src
-            
-            if hasattr(tcp, 'flags') and tcp.flags == 0x02:
-                self.syn_count[src_ip].append(current_time)
-                self._check_syn_flood(src_ip)
-            
-            if hasattr(tcp, 'flags') and tcp.flags in [0x02, 0x01, 0x20, 0x08]:
-                self.port_scan_attempts[src_ip][tcp.dport] = current_time
-                self._check_port_scan(src_ip)
-            
-            if tcp.dport == 80 or tcp.sport == 80:
-                if packet.haslayer(Raw):
-                    try:
-                        raw_data = str(packet[Raw].load)
-                        if "POST" in raw_data or "GET" in raw_data:
-                            self.http_requests.append((current_time, len(raw_data)))
-                            self._check_http_slow_dos()
-                    except:
-                        pass
-    
-    def _analyze_udp(self, packet):
+        if summary.src_ip is None:
+            return
+        src_ip = summary.src_ip
+        flags = summary.tcp_flags
+        
+        if flags == 0x02:
+            counter, events = self.syn_count.touch(src_ip, current_time)
+            if counter is not None:
+                counter.add(current_time, events)
+                self._check_syn_flood(src_ip, current_time)
+        
+        if flags in (0x02, 0x01, 0x20, 0x08):
+            self._track_port(src_ip, summary.dport, current_time)
+        
+        if (summary.dport == 80 or summary.sport == 80) and summary.payload is not None:
+            payload = summary.payload
+            if b"POST" in payload or b"GET" in payload:
+                if summary.payload_length < 100:
+                    self.http_requests.add(current_time)
+                self._check_http_slow_dos(current_time)
+    
+    def _analyze_udp(self, summary, current_time):
         """Анализ UDP пакетов"""
-        if packet.haslayer(IP) and packet.haslayer(UDP):
-            ip = packet[IP]
-            udp = packet[UDP]
-            src_ip = ip.src
-            
-            self.port_scan_attempts[src_ip][udp.dport] = time.time()
-            self._check_port_scan(src_ip)
-            
-            if udp.sport == 68 and udp.dport == 67:
-                self.dhcp_requests.append(time.time())
-                self._check_dhcp_starvation()
+        if summary.src_ip is None:
+            return
+        
+        self._track_port(summary.src_ip, summary.dport, current_time)
+        
+        if summary.sport == 68 and summary.dport == 67:
+            self.dhcp_requests.add(current_time)
+            self._check_dhcp_starvation(current_time)
+    
+    def _track_port(self, src_ip, port, current_time):
+        ports, _ = self.port_scan_attempts.touch(src_ip, current_time, port)
+        if ports is not None:
+            ports.add(current_time, port)
+            self._check_port_scan(src_ip, current_time)
     
-    def _analyze_icmp(self, packet):
+    def _analyze_icmp(self, summary, current_time):
         """Анализ ICMP пакетов"""
-        if packet.haslayer(IP):
-            current_time = time.time()
-            self.icmp_packets.append(current_time)
-            self._check_smurf_attack()
+        if summary.src_ip is not None:
+            self.icmp_packets.add(current_time)
+            self._check_smurf_attack(current_time)
     
-    def _analyze_arp(self, packet):
+    def _analyze_arp(self, summary, current_time):
         """Анализ ARP пакетов"""
-        arp = packet[ARP]
-        
-        if arp.op == 2:
-            self._check_arp_spoofing(arp)
+        if summary.arp_op == 2:
+            self._check_arp_spoofing(summary, current_time)
         
-        if arp.op == 2 and arp.psrc == arp.pdst:
-            self._check_gratuitous_arp(arp)
+        if summary.arp_op == 2 and summary.arp_psrc == summary.arp_pdst:
+            self._check_gratuitous_arp(summary, current_time)
     
-    def _check_syn_flood(self, src_ip):
-        window = 1
-        current_time = time.time()
-        syn_in_window = sum(1 for timestamp in self.syn_count[src_ip] 
-                           if current_time - timestamp < window)
+    def _alert(self, kind, message, source, current_time):
+        """Предупреждение в очередь AlertPipeline (с ограничением частоты по типу и источнику)"""
+        self.alerts.emit(kind, message, source, current_time, self.clock.wall(current_time))
+    
+    def _check_syn_flood(self, src_ip, current_time):
+        window = self.windows['syn_flood']
+        syn_in_window = self.syn_count[src_ip].count(current_time)
         if syn_in_window > self.thresholds['syn_flood']:
-            print(f"🚨 SYN Flood detected from {src_ip}: {syn_in_window} SYN packets in {window} second")
-    
-    def _check_port_scan(self, src_ip):
-        current_time = time.time()
-        window = 10
-        recent_ports = [port for port, timestamp in self.port_scan_attempts[src_ip].items()
-                       if current_time - timestamp < window]
-        if len(recent_ports) > self.thresholds['port_scan']:
-            print(f"🚨 Port Scan detected from {src_ip}: {len(recent_ports)} ports scanned in {window} seconds")
-    
-    def _check_dhcp_starvation(self):
-        window = 1
-        current_time = time.time()
-        dhcp_in_window = sum(1 for timestamp in self.dhcp_requests 
-                            if current_time - timestamp < window)
+            self._alert('syn_flood', f"🚨 SYN Flood detected from {src_ip}: {syn_in_window} SYN packets in {window} second",
+                        src_ip, current_time)
+    
+    def _check_port_scan(self, src_ip, current_time):
+        window = self.windows['port_scan']
+        recent_ports = self.port_scan_attempts[src_ip].count(current_time)
+        if recent_ports > self.thresholds['port_scan']:
+            self._alert('port_scan', f"🚨 Port Scan detected from {src_ip}: {recent_ports} ports scanned in {window} seconds",
+                        src_ip, current_time)
+    
+    def _check_dhcp_starvation(self, current_time):
+        window = self.windows['dhcp_starvation']
+        dhcp_in_window = self.dhcp_requests.count(current_time)
         if dhcp_in_window > self.thresholds['dhcp_starvation']:
-            print(f"🚨 DHCP Starvation detected: {dhcp_in_window} DHCP requests in {window} second")
+            self._alert('dhcp_starvation', f"🚨 DHCP Starvation detected: {dhcp_in_window} DHCP requests in {window} second",
+                        None, current_time)
     
-    def _check_http_slow_dos(self):
-        window = 10
-        current_time = time.time()
-        slow_requests = sum(1 for timestamp, size in self.http_requests 
-                           if current_time - timestamp < window and size < 100)
+    def _check_http_slow_dos(self, current_time):
+        window = self.windows['http_slow_dos']
+        slow_requests = self.http_requests.count(current_time)
         if slow_requests > self.thresholds['http_slow_dos']:
-            print(f"🚨 HTTP Slow POST DoS detected: {slow_requests} slow requests in {window} seconds")
+            self._alert('http_slow_dos', f"🚨 HTTP Slow POST DoS detected: {slow_requests} slow requests in {window} seconds",
+                        None, current_time)
     
-    def _check_ip_fragmentation_attack(self):
-        window = 1
-        current_time = time.time()
-        fragmented_in_window = sum(1 for timestamp in self.fragmented_packets 
-                                  if current_time - timestamp < window)
+    def _check_ip_fragmentation_attack(self, current_time):
+        window = self.windows['ip_fragmentation']
+        fragmented_in_window = self.fragmented_packets.count(current_time)
         if fragmented_in_window > self.thresholds['ip_fragmentation']:
-            print(f"🚨 IP Fragmentation Attack detected: {fragmented_in_window} fragmented packets in {window} second")
+            self._alert('ip_fragmentation',
+                        f"🚨 IP Fragmentation Attack detected: {fragmented_in_window} fragmented packets in {window} second",
+                        None, current_time)
     
-    def _check_smurf_attack(self):
-        window = 1
-        current_time = time.time()
-        icmp_in_window = sum(1 for timestamp in self.icmp_packets 
-                            if current_time - timestamp < window)
+    def _check_smurf_attack(self, current_time):
+        window = self.windows['smurf_attack']
+        icmp_in_window = self.icmp_packets.count(current_time)
         if icmp_in_window > self.thresholds['smurf_attack']:
-            print(f"🚨 Smurf Attack detected: {icmp_in_window} ICMP packets in {window} second")
-    
-    def _check_arp_spoofing(self, arp_packet):
-        ip = arp_packet.psrc
-        mac = arp_packet.hwsrc
-        if ip in self.arp_table:
-            if mac not in self.arp_table[ip]:
-                print(f"🚨 ARP Spoofing detected: IP {ip} was {self.arp_table[ip]}, now claiming to be {mac}")
-        else:
-            self.arp_table[ip].add(mac)
+            self._alert('smurf_attack', f"🚨 Smurf Attack detected: {icmp_in_window} ICMP packets in {window} second",
+                        None, current_time)
+    
+    def _check_arp_spoofing(self, summary, current_time):
+        ip = summary.arp_psrc
+        mac = summary.arp_hwsrc
+        macs, _ = self.arp_table.touch(ip)
+        if not macs:
+            macs.add(mac)
+        elif mac not in macs:
+            self._alert('arp_spoofing', f"🚨 ARP Spoofing detected: IP {ip} was {macs}, now claiming to be {mac}",
+                        ip, current_time)
     
-    def _check_gratuitous_arp(self, arp_packet):
-        print(f"🚨 Gratuitous ARP detected from {arp_packet.hwsrc} for IP {arp_packet.psrc}")
+    def _check_gratuitous_arp(self, summary, current_time):
+        self._alert('gratuitous_arp', f"🚨 Gratuitous ARP detected from {summary.arp_hwsrc} for IP {summary.arp_psrc}",
+                    summary.arp_psrc, current_time)
     
     def print_stats(self):
-        """Вывод текущей статистики"""
+        """Вывод текущей статистики по счетчикам, без обхода таблиц состояния"""
+        stats = stats_snapshot(self)
         print(f"\n📊 Statistics - Packets processed: {self.packet_count}")
+        print(f"   Traffic: {stats['bytes'] / 2**20:.1f} MiB, "
+              f"{stats['packets_per_sec']:.0f} packets/s, {stats['bytes_per_sec'] / 1024:.1f} KiB/s")
+        print("   Protocols: " + ", ".join(f"{name} {count}" for name, count in sorted(stats['protocols'].items())))
         print(f"   Active hosts: {len(self.syn_count)}")
-        print(f"   Port scan attempts: {sum(len(ports) for ports in self.port_scan_attempts.values())}")
+        print(f"   Port scan sources: {len(self.port_scan_attempts)}")
+        memory = self.memory_stats()
+        print(f"   Source state: {sum(t['memory'] for t in memory.values()) / 2**20:.1f} MiB "
+              f"of {self.memory_limit / 2**20:.0f} MiB, evicted " +
+              ", ".join(f"{name} {t['evictions']}" for name, t in memory.items()) +
+              f", sketch-only SYN {memory['syn']['sketched']}")
+        alerts = stats['alerts']
+        print(f"   Alerts: {alerts['written']} written, {alerts['suppressed']} suppressed, "
+              f"{alerts['dropped']} dropped, {alerts['queue_depth']} queued")
         print("---")
     
     def stop_monitoring(self):
         """Остановка мониторинга"""
         self.running = False
+        self.clock.stop()
+        self.alerts.close()
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+            self.metrics_server = None
+        if self.packet_count > 0:
+            self.print_stats()
         print("\n🛑 Monitoring stopped")
 
+def alert_sinks_from_args(args):
+    """Получатели предупреждений по ключам командной строки"""
+    sinks = [StdoutSink()]
+    if args.alerts_jsonl:
+        sinks.append(JsonLinesSink(args.alerts_jsonl))
+    if args.syslog:
+        host, _, port = args.syslog.rpartition(":")
+        sinks.append(SyslogSink(host or "127.0.0.1", int(port)))
+    return sinks
+
+def analyze_offline(path, limit=None, alert_sinks=None):
+    """Разбор записи трафика без захвата и отчет о пропускной способности"""
+    print(f"📁 Offline analysis of {path}")
+    analyzer = NetworkAnalyzer(clock=PacketClock(), alert_sinks=alert_sinks)
+    try:
+        result = analyzer.analyze_pcap(path, limit)
+    except KeyboardInterrupt:
+        print("\n⏹️ Analysis interrupted by user")
+        return
+    except Exception as e:
+        print(f"❌ Cannot read capture: {e}")
+        return
+    finally:
+        analyzer.alerts.close()
+    analyzer.print_stats()
+    print(f"⚡ Throughput: {result['packets']} packets in {result['seconds']:.2f} s "
+          f"({result['packets_per_sec']:.0f} packets/s)")
+    print(f"   Capture span: {result['capture_seconds']:.2f} s "
+          f"({result['speedup']:.1f}x real time)")
+
 def main():
     """Основная функция программы"""
+    parser = argparse.ArgumentParser(description="Network Security Analyzer")
+    parser.add_argument("--pcap", help="разобрать запись трафика (pcap/pcapng) вместо захвата")
+    parser.add_argument("--limit", type=int, help="разобрать только первые N пакетов записи")
+    parser.add_argument("--alerts-jsonl", metavar="FILE", help="дописывать предупреждения в файл JSON Lines")
+    parser.add_argument("--syslog", metavar="HOST:PORT", help="отправлять предупреждения по UDP в syslog")
+    parser.add_argument("--metrics-port", type=int, default=9108,
+                        help="порт сервера статистики на 127.0.0.1 (0 — отключить)")
+    args = parser.parse_args()
+    if args.pcap:
+        analyze_offline(args.pcap, args.limit, alert_sinks_from_args(args))
+        return
+    
     print("=== 🛡️ Network Security Analyzer ===")
     print("🔧 Final version with improved interface detection")
     print("💡 Please run as Administrator for best results")
@@ -525,11 +699,11 @@ def main():
         pass
     
     # Создаем анализатор
-    analyzer = NetworkAnalyzer()
+    analyzer = NetworkAnalyzer(alert_sinks=alert_sinks_from_args(args))
     
     try:
         # Запускаем мониторинг
-        if analyzer.start_monitoring():
+        if analyzer.start_monitoring(metrics_port=args.metrics_port):
             print("✅ Monitoring started successfully!")
         else:
             print("❌ Failed to start monitoring")
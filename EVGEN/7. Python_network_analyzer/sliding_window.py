@@ -0,0 +1,103 @@
+# sliding_window.py
+from collections import deque
+
+class SlidingCounter:
+    """Число событий за последние window секунд.
+
+    Окно разбито на buckets корзин по window / buckets секунд, корзины лежат в
+    кольцевом буфере, а сумма по окну хранится отдельно. Добавление и чтение
+    стоят O(1) амортизированно, сколько бы событий ни пришло в окно: устаревшие
+    корзины обнуляются при сдвиге времени, не чаще одного раза каждая.
+    Окно никогда не короче window и длиннее его не больше чем на одну корзину.
+    """
+
+    __slots__ = ("width", "counts", "total", "head")
+
+    def __init__(self, window=1.0, buckets=10):
+        self.width = window / buckets
+        # Текущая неполная корзина плюс buckets полных: окно не короче window
+        self.counts = [0] * (buckets + 1)
+        self.total = 0
+        self.head = None  # номер последней корзины (время // width)
+
+    def _advance(self, now):
+        bucket = int(now // self.width)
+        if self.head is None:
+            self.head = bucket
+            return
+        steps = bucket - self.head
+        if steps <= 0:
+            # Тот же интервал (или часы чуть ушли назад) — считаем в текущую корзину
+            return
+        counts = self.counts
+        size = len(counts)
+        if steps >= size:
+            counts[:] = [0] * size
+            self.total = 0
+        else:
+            for i in range(self.head + 1, bucket + 1):
+                index = i % size
+                self.total -= counts[index]
+                counts[index] = 0
+        self.head = bucket
+
+    def add(self, now, amount=1):
+        """Учитывает amount событий в момент now и возвращает число событий в окне"""
+        self._advance(now)
+        self.counts[self.head % len(self.counts)] += amount
+        self.total += amount
+        return self.total
+
+    def count(self, now):
+        self._advance(now)
+        return self.total
+
+class DistinctCounter:
+    """Число разных ключей (например, портов), встреченных за последние window секунд.
+
+    Для каждого ключа хранится время последнего появления, а в очереди — появления
+    по порядку. Устаревшие появления снимаются с начала очереди, и ключ удаляется,
+    только если с тех пор он встречался снова. Проверка стоит O(1) амортизированно
+    вместо обхода всех ключей источника. Повтор ключа записывается не чаще раза
+    в window / buckets секунд, поэтому очередь не длиннее buckets записей на ключ
+    даже при флуде на один порт; точность окна — те же window / buckets секунд.
+    Если задан max_keys, новые ключи сверх него не запоминаются: счетчик упирается
+    в max_keys, и память на одного сканирующего все 65535 портов ограничена.
+    """
+
+    __slots__ = ("window", "width", "max_keys", "last_seen", "events")
+
+    def __init__(self, window=10.0, buckets=10, max_keys=None):
+        self.window = window
+        self.width = window / buckets
+        self.max_keys = max_keys
+        self.last_seen = {}
+        self.events = deque()
+
+    def _expire(self, now):
+        events = self.events
+        last_seen = self.last_seen
+        while events and now - events[0][0] >= self.window:
+            timestamp, key = events.popleft()
+            if last_seen.get(key) == timestamp:
+                del last_seen[key]
+
+    def add(self, now, key):
+        """Отмечает ключ в момент now и возвращает число разных ключей в окне"""
+        seen = self.last_seen.get(key)
+        if seen is None and self.max_keys is not None and len(self.last_seen) >= self.max_keys:
+            self._expire(now)
+            if len(self.last_seen) >= self.max_keys:
+                return len(self.last_seen)
+        if seen is None or now - seen >= self.width:
+            self.last_seen[key] = now
+            self.events.append((now, key))
+        self._expire(now)
+        return len(self.last_seen)
+
+    def count(self, now):
+        self._expire(now)
+        return len(self.last_seen)
+
+    def __len__(self):
+        return len(self.last_seen)
@@ -0,0 +1,255 @@
+# source_state.py
+import ctypes
+import sys
+import zlib
+from array import array
+from collections import OrderedDict, deque
+from collections.abc import Mapping
+
+# Ключ-строка IP-адреса и узел OrderedDict на одну запись таблицы, байт
+ENTRY_OVERHEAD = 128
+
+def estimate_size(obj, seen=None):
+    """Примерный размер объекта в памяти вместе с вложенными контейнерами и __slots__"""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(estimate_size(k, seen) + estimate_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        size += sum(estimate_size(item, seen) for item in obj)
+    for name in getattr(type(obj), '__slots__', ()):
+        if hasattr(obj, name):
+            size += estimate_size(getattr(obj, name), seen)
+    return size
+
+def _clear(counters):
+    """Обнуляет массив на месте (memset), без выделения нового буфера"""
+    address, length = counters.buffer_info()
+    ctypes.memset(address, 0, length * counters.itemsize)
+
+class WindowedCountMin:
+    """Count-min sketch числа событий по ключу за последние 1-2 окна.
+
+    Память фиксирована (depth * width счетчиков на поколение) и не зависит от числа
+    ключей. Оценка никогда не меньше настоящего значения, но может быть больше из-за
+    коллизий. Счетчики хранятся в двух поколениях: текущее окно и предыдущее, при
+    смене окна предыдущее поколение обнуляется и становится текущим.
+    """
+
+    def __init__(self, window=1.0, width=1 << 18, depth=4):
+        self.window = window
+        self.width = width
+        self.depth = depth
+        self.current = array('I', bytes(4 * width * depth))
+        self.previous = array('I', bytes(4 * width * depth))
+        self.epoch = None
+
+    @property
+    def memory(self):
+        return 2 * self.current.itemsize * len(self.current)
+
+    def _rotate(self, now):
+        epoch = int(now // self.window)
+        if self.epoch is None:
+            self.epoch = epoch
+        elif epoch > self.epoch:
+            # Массивы поколений живут все время работы: при захвате смена окна
+            # не выделяет новых 4 МиБ каждую секунду
+            if epoch == self.epoch + 1:
+                self.previous, self.current = self.current, self.previous
+            else:
+                _clear(self.previous)
+            _clear(self.current)
+            self.epoch = epoch
+
+    def _indexes(self, key):
+        # Двойное хеширование: depth индексов из двух сумм. hash() для строк меняется
+        # от запуска к запуску, а оценки должны повторяться при разборе одной записи
+        data = str(key).encode()
+        h1, h2 = zlib.crc32(data), zlib.adler32(data) | 1
+        width = self.width
+        return [row * width + (h1 + row * h2) % width for row in range(self.depth)]
+
+    def add(self, key, now, amount=1):
+        """Учитывает amount событий ключа и возвращает оценку за текущее и предыдущее окно"""
+        self._rotate(now)
+        current, previous = self.current, self.previous
+        estimate = None
+        for index in self._indexes(key):
+            value = current[index] + amount
+            current[index] = value
+            value += previous[index]
+            if estimate is None or value < estimate:
+                estimate = value
+        return estimate
+
+    def estimate(self, key, now):
+        self._rotate(now)
+        current, previous = self.current, self.previous
+        return min(current[index] + previous[index] for index in self._indexes(key))
+
+class SourceTable(Mapping):
+    """Состояние по источникам с ограничением памяти.
+
+    Записи хранятся в порядке последнего обращения (LRU): когда их число достигает
+    max_bytes / entry_bytes, самая давняя вытесняется. Если задан sketch, источник
+    получает запись только после admit событий; до этого его события учитываются
+    в count-min sketch фиксированного размера. Так источники с подделанным адресом,
+    которые присылают по одному-два пакета, не вытесняют из таблицы настоящих
+    нарушителей.
+    Если задан seed, события до допуска не теряются: их данные (item из touch)
+    хранятся в небольшой очереди ожидающих (тоже LRU, не больше max_entries ключей),
+    а при создании записи передаются в seed(state, [(now, item), ...]).
+    Если задан keep_after, запись, к которой обратились keep_after раз, переходит
+    в защищенную часть (не больше половины max_entries): поток новых ключей вытесняет
+    только ключи, встреченные меньше раз. Защищенная часть — тоже LRU: когда она
+    заполнена, новая запись возвращает самую давнюю из нее в общую часть, так что
+    ключи, занявшие ее раньше, не закрывают ее навсегда.
+    Как словарь отдает только уже существующие записи, новые создает touch().
+    """
+
+    def __init__(self, factory, max_bytes, entry_bytes=None, sketch=None, admit=1, seed=None,
+                 keep_after=None):
+        self.factory = factory
+        if entry_bytes is None:
+            entry_bytes = estimate_size(factory()) + ENTRY_OVERHEAD
+        self.entry_bytes = entry_bytes
+        self.sketch = sketch
+        self.admit = admit
+        self.seed = seed if sketch is not None else None
+        self.pending_bytes = 0
+        if self.seed is not None:
+            self.pending_bytes = estimate_size([(0.0, 0)] * max(1, admit - 1)) + ENTRY_OVERHEAD
+        # Память делится между записями и ожидающими допуска поровну по числу ключей
+        self.max_entries = max(1, max_bytes // (entry_bytes + self.pending_bytes))
+        self.pending = OrderedDict()
+        self.entries = OrderedDict()
+        self.keep_after = keep_after
+        self.max_kept = self.max_entries // 2 if keep_after else 0
+        self.kept = OrderedDict()
+        self._touches = {}  # ключ -> число обращений, для записей вне kept
+        self.hits = 0
+        self.admitted = 0
+        self.sketched = 0
+        self.evictions = 0
+        self.peak = 0
+
+    def __getitem__(self, key):
+        state = self.entries.get(key)
+        if state is None:
+            return self.kept[key]
+        return state
+
+    def __iter__(self):
+        yield from self.kept
+        yield from self.entries
+
+    def __len__(self):
+        return len(self.entries) + len(self.kept)
+
+    def __delitem__(self, key):
+        if key in self.kept:
+            del self.kept[key]
+        else:
+            del self.entries[key]
+            self._touches.pop(key, None)
+
+    def touch(self, key, now=None, item=None):
+        """Запись источника с отметкой об обращении.
+
+        Возвращает (state, events): events — сколько событий учесть в записи. Для
+        существующей записи это 1, для только что созданной — оценка из sketch вместе
+        с текущим событием, чтобы не терять события до допуска в таблицу. Если
+        источник еще не набрал admit событий, state = None, а item запоминается
+        для seed.
+        """
+        entries = self.entries
+        state = entries.get(key)
+        if state is not None:
+            entries.move_to_end(key)
+            self.hits += 1
+            if self.keep_after:
+                self._keep(key, state)
+            return state, 1
+        if self.kept:
+            state = self.kept.get(key)
+            if state is not None:
+                self.kept.move_to_end(key)
+                self.hits += 1
+                return state, 1
+        events = 1
+        backlog = None
+        if self.sketch is not None:
+            events = self.sketch.add(key, now)
+            if self.seed is not None:
+                backlog = self.pending.pop(key, None)
+                if backlog is not None:
+                    # Ожидающие события точны; sketch мог их уже забыть со сменой окна
+                    events = max(events, len(backlog) + 1)
+            if events < self.admit:
+                self.sketched += 1
+                if self.seed is not None:
+                    if backlog is None:
+                        backlog = []
+                    backlog.append((now, item))
+                    self.pending[key] = backlog
+                    if len(self.pending) > self.max_entries:
+                        self.pending.popitem(last=False)
+                return None, events
+        if len(entries) + len(self.kept) >= self.max_entries:
+            evicted, _ = entries.popitem(last=False)
+            self._touches.pop(evicted, None)
+            self.evictions += 1
+        state = entries[key] = self.factory()
+        if backlog:
+            self.seed(state, backlog)
+        self.admitted += 1
+        if self.keep_after:
+            self._touches[key] = 1
+        if len(self) > self.peak:
+            self.peak = len(self)
+        return state, events
+
+    def _keep(self, key, state):
+        touches = self._touches.get(key, 0) + 1
+        if touches < self.keep_after or not self.max_kept:
+            self._touches[key] = touches
+            return
+        del self.entries[key]
+        self._touches.pop(key, None)
+        if len(self.kept) >= self.max_kept:
+            demoted, demoted_state = self.kept.popitem(last=False)
+            self.entries[demoted] = demoted_state
+            self._touches[demoted] = 0
+        self.kept[key] = state
+
+    def prune(self, idle):
+        """Удаляет записи, для которых idle(state) истинно; возвращает их число"""
+        stale = [key for key, state in list(self.items()) if idle(state)]
+        for key in stale:
+            del self[key]
+        return len(stale)
+
+    @property
+    def memory(self):
+        """Оценка занимаемой памяти, байт"""
+        sketch = self.sketch.memory if self.sketch is not None else 0
+        return len(self) * self.entry_bytes + len(self.pending) * self.pending_bytes + sketch
+
+    def stats(self):
+        return {
+            'entries': len(self),
+            'max_entries': self.max_entries,
+            'peak': self.peak,
+            'hits': self.hits,
+            'admitted': self.admitted,
+            'sketched': self.sketched,
+            'pending': len(self.pending),
+            'kept': len(self.kept),
+            'evictions': self.evictions,
+            'memory': self.memory,
+        }
@@ -0,0 +1,69 @@
+"""Остановка, повторный запуск и закрытие AlertPipeline."""
+import json
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alerts import AlertPipeline, JsonLinesSink
+
+class SlowSink:
+    """Получатель, который пишет, пока тест не откроет release"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.written = []
+        self.closed = False
+
+    def write(self, alert):
+        self.release.wait(5)
+        assert not self.closed
+        self.written.append(alert.kind)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+def test_restart_keeps_sinks_open(tmp_path):
+    path = tmp_path / "alerts.jsonl"
+    pipeline = AlertPipeline([JsonLinesSink(str(path))])
+    for run in range(3):
+        pipeline.start()
+        pipeline.emit('port_scan', f"scan {run}", source="10.0.0.1", now=run * 10.0, wall=0.0)
+        assert pipeline.stop()
+    pipeline.close()
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [line['message'] for line in lines] == ["scan 0", "scan 1", "scan 2"]
+    assert pipeline.closed
+
+def test_sinks_closed_only_after_writer_exits():
+    sink = SlowSink()
+    pipeline = AlertPipeline([sink])
+    pipeline.start()
+    writer = pipeline._thread
+    pipeline.emit('syn_flood', "flood", source="10.0.0.2", wall=0.0)
+    assert not pipeline.close(timeout=0.05)
+    assert not sink.closed
+    sink.release.set()
+    writer.join(5)
+    assert sink.written == ['syn_flood']
+    assert sink.closed
+    assert pipeline.close()
+
+def test_start_after_close_is_rejected():
+    pipeline = AlertPipeline([])
+    pipeline.close()
+    with pytest.raises(RuntimeError):
+        pipeline.start()
+
+def test_close_without_start_writes_queue(tmp_path):
+    path = tmp_path / "alerts.jsonl"
+    pipeline = AlertPipeline([JsonLinesSink(str(path))])
+    pipeline.emit('smurf_attack', "icmp", wall=0.0)
+    assert pipeline.close()
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 1
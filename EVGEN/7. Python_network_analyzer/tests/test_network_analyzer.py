@@ -0,0 +1,113 @@
+"""Детекторы NetworkAnalyzer на разборе записи трафика (analyze_pcap)."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scapy.layers.inet import IP, TCP
+from scapy.layers.l2 import ARP, Ether
+from scapy.utils import wrpcap
+
+from clock import PacketClock
+from network_analyzer import NetworkAnalyzer
+
+class ListSink:
+    def __init__(self):
+        self.alerts = []
+
+    def write(self, alert):
+        self.alerts.append(alert)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+def replay(tmp_path, packets, **kwargs):
+    path = str(tmp_path / "capture.pcap")
+    wrpcap(path, packets)
+    sink = ListSink()
+    analyzer = NetworkAnalyzer(clock=PacketClock(), alert_sinks=[sink], **kwargs)
+    analyzer.progress_every = 10 ** 9
+    analyzer.analyze_pcap(path)
+    return analyzer, sink.alerts
+
+def syn_scan(ports, src="10.1.1.1", start=1000.0, step=0.1):
+    packets = []
+    for i, port in enumerate(ports):
+        packet = Ether() / IP(src=src, dst="10.0.0.80") / TCP(sport=40000, dport=port, flags="S")
+        packet.time = start + i * step
+        packets.append(packet)
+    return packets
+
+def port_scan_alerts(alerts):
+    return [alert for alert in alerts if alert.kind == 'port_scan']
+
+def test_scan_above_threshold_is_detected(tmp_path):
+    _, alerts = replay(tmp_path, syn_scan(range(1, 17)))
+    scans = port_scan_alerts(alerts)
+    assert len(scans) == 1
+    assert "16 ports" in scans[0].message
+
+def test_scan_at_threshold_is_not_detected(tmp_path):
+    _, alerts = replay(tmp_path, syn_scan(range(1, 16)))
+    assert not port_scan_alerts(alerts)
+
+def test_slow_scan_is_detected(tmp_path):
+    # Пакеты реже окна sketch (2 с): допуск в таблицу по запомненным портам
+    _, alerts = replay(tmp_path, syn_scan(range(1, 17), step=0.6))
+    assert port_scan_alerts(alerts)
+
+def test_pending_sources_are_bounded(tmp_path):
+    packets = []
+    for i in range(3000):
+        packet = Ether() / IP(src=f"10.{i // 250}.{i % 250}.1", dst="10.0.0.80") / TCP(dport=80, flags="S")
+        packet.time = 1000.0 + i * 0.001
+        packets.append(packet)
+    analyzer, _ = replay(tmp_path, packets, memory_limit=16 * 1024 * 1024)
+    table = analyzer.port_scan_attempts
+    assert len(table.pending) <= table.max_entries
+    assert table.memory <= analyzer.memory_limit
+
+def arp_reply(ip, mac, when):
+    packet = Ether(src=mac, dst="ff:ff:ff:ff:ff:ff") / ARP(op=2, psrc=ip, pdst="10.0.0.1", hwsrc=mac)
+    packet.time = when
+    return packet
+
+def test_arp_binding_survives_spoofed_flood(tmp_path):
+    # Память — оба sketch и по 200 записей на таблицу ARP
+    default = NetworkAnalyzer()
+    sketches = default.syn_count.sketch.memory + default.port_scan_attempts.sketch.memory
+    limit = sketches + 3 * 200 * default.arp_table.entry_bytes
+    packets = [arp_reply("10.0.0.5", "00:11:22:33:44:55", 1000.0),
+               arp_reply("10.0.0.5", "00:11:22:33:44:55", 1000.5)]
+    packets += [arp_reply(f"172.16.{i // 250}.{i % 250 + 1}", "de:ad:be:ef:00:01", 1001.0 + i * 0.001)
+                for i in range(2000)]
+    packets.append(arp_reply("10.0.0.5", "de:ad:be:ef:00:02", 1010.0))
+    analyzer, alerts = replay(tmp_path, packets, memory_limit=limit)
+    table = analyzer.arp_table
+    assert table.evictions > 0
+    assert len(table) <= table.max_entries
+    assert [alert.source for alert in alerts if alert.kind == 'arp_spoofing'] == ["10.0.0.5"]
+
+def test_arp_binding_kept_after_protected_flood(tmp_path):
+    # Сначала защищенную часть заполняют адреса с двумя ответами каждый
+    default = NetworkAnalyzer()
+    sketches = default.syn_count.sketch.memory + default.port_scan_attempts.sketch.memory
+    limit = sketches + 3 * 200 * default.arp_table.entry_bytes
+    packets = []
+    for i in range(150):
+        ip = f"172.17.0.{i + 1}"
+        packets += [arp_reply(ip, "de:ad:be:ef:00:01", 1000.0 + i * 0.002),
+                    arp_reply(ip, "de:ad:be:ef:00:01", 1000.001 + i * 0.002)]
+    packets += [arp_reply("10.0.0.5", "00:11:22:33:44:55", 1001.0),
+                arp_reply("10.0.0.5", "00:11:22:33:44:55", 1001.5)]
+    packets += [arp_reply(f"172.16.{i // 250}.{i % 250 + 1}", "de:ad:be:ef:00:01", 1002.0 + i * 0.001)
+                for i in range(2000)]
+    packets.append(arp_reply("10.0.0.5", "de:ad:be:ef:00:02", 1010.0))
+    analyzer, alerts = replay(tmp_path, packets, memory_limit=limit)
+    table = analyzer.arp_table
+    assert len(table.kept) == table.max_kept
+    assert "10.0.0.5" in table.kept
+    assert [alert.source for alert in alerts if alert.kind == 'arp_spoofing'] == ["10.0.0.5"]
@@ -0,0 +1,128 @@
+import argparse
+import json
+import os
+import platform
+import random
+import time
+import tracemalloc
+from network.generators import random_graph
+from network.graph import Graph
+from network.parallel import all_pairs_spf
+from network.spf import ShortestPathTree
+from network.topology import Topology
+
+def serial_all_pairs(graph: Graph) -> None:
+    for src in range(graph.node_count):
+        ShortestPathTree(src).compute(graph)
+
+def bench_parallel(n: int, degree: int, max_workers: int) -> list:
+    graph = random_graph(n, degree)
+    start = time.perf_counter()
+    serial_all_pairs(graph)
+    base = time.perf_counter() - start
+    rows = [{"workers": 1, "seconds": base, "speedup": 1.0}]
+    workers = 2
+    while workers <= max_workers:
+        start = time.perf_counter()
+        all_pairs_spf(graph, workers)
+        took = time.perf_counter() - start
+        rows.append({"workers": workers, "seconds": took, "speedup": base / took})
+        workers *= 2
+    return rows
+
+def memory_peak(n: int, degree: int, seed: int) -> int:
+    """Peak traced allocation (bytes) of generating a topology and computing every routing table."""
+    tracemalloc.start()
+    try:
+        Topology.from_graph(random_graph(n, degree, seed))
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def bench_size(n: int, degree: int, flaps: int, packets: int, flows: int, seed: int) -> dict:
+    """One row of the suite: SPF, link-flap storm and bulk sends on an n-router random graph."""
+    rnd = random.Random(seed)
+    graph = random_graph(n, degree, seed)
+    topo = Topology.from_graph(graph, compute=False)
+    start = time.perf_counter()
+    topo.compute_all()
+    spf = time.perf_counter() - start
+
+    # Flap storm: every flap is a down + up of one random link with incremental repair on all routers.
+    names = graph.names
+    start = time.perf_counter()
+    for _ in range(flaps):
+        l = rnd.randrange(graph.link_count)
+        a, b = names[graph.link_a[l]], names[graph.link_b[l]]
+        topo.set_link_state(a, b, False)
+        topo.set_link_state(a, b, True)
+    flap = time.perf_counter() - start
+
+    # Packet by packet through Router.forward, then the same kind of load as one traffic matrix.
+    pairs = [(names[rnd.randrange(n)], names[rnd.randrange(n)]) for _ in range(packets)]
+    start = time.perf_counter()
+    for s, d in pairs:
+        topo.send(s, d)
+    send = time.perf_counter() - start
+    src = [rnd.randrange(n) for _ in range(flows)]
+    dst = [rnd.randrange(n) for _ in range(flows)]
+    start = time.perf_counter()
+    topo.send_matrix(src, dst, [1.0] * flows)
+    matrix = time.perf_counter() - start
+
+    return {
+        "routers": n,
+        "links": graph.link_count,
+        "spf_seconds": spf,
+        "spf_ms_per_router": spf * 1000 / n,
+        "flaps": flaps,
+        "flap_ms": flap * 1000 / flaps if flaps else 0.0,
+        "packets_per_sec": packets / send if send else 0.0,
+        "matrix_flows_per_sec": flows / matrix if matrix else 0.0,
+        "memory_peak_bytes": memory_peak(n, degree, seed),
+    }
+
+def bench_suite(sizes: list, degree: int, flaps: int, packets: int, flows: int, seed: int) -> list:
+    return [bench_size(n, degree, flaps, packets, flows, seed) for n in sizes]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="router_sim benchmarks")
+    parser.add_argument("--suite", action="store_true",
+                        help="SPF / flap storm / bulk send suite over --sizes instead of the all-pairs speedup table")
+    parser.add_argument("--routers", type=int, default=2000)
+    parser.add_argument("--degree", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="max pool size")
+    parser.add_argument("--sizes", default="100,300,1000", help="comma-separated router counts for --suite")
+    parser.add_argument("--flaps", type=int, default=50)
+    parser.add_argument("--packets", type=int, default=2000)
+    parser.add_argument("--flows", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="emit JSON instead of a table")
+    args = parser.parse_args()
+
+    if args.suite:
+        sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+        rows = bench_suite(sizes, args.degree, args.flaps, args.packets, args.flows, args.seed)
+        if args.json:
+            print(json.dumps({"simulator": "router_sim", "python": platform.python_version(),
+                              "degree": args.degree, "seed": args.seed, "suite": rows}, indent=2))
+            return
+        print(f"router_sim suite, avg degree {args.degree}, seed {args.seed}")
+        print(f"{'ROUTERS':<8} {'SPF s':<8} {'FLAP ms':<9} {'PKT/s':<9} {'FLOWS/s':<10} PEAK MiB")
+        for row in rows:
+            print(f"{row['routers']:<8} {row['spf_seconds']:<8.2f} {row['flap_ms']:<9.2f} "
+                  f"{row['packets_per_sec']:<9.0f} {row['matrix_flows_per_sec']:<10.0f} "
+                  f"{row['memory_peak_bytes'] / 2**20:.1f}")
+        return
+
+    rows = bench_parallel(args.routers, args.degree, args.workers)
+    if args.json:
+        print(json.dumps({"routers": args.routers, "degree": args.degree, "all_pairs_spf": rows}, indent=2))
+        return
+    print(f"All-pairs SPF, {args.routers} routers, avg degree {args.degree}")
+    print(f"{'WORKERS':<8} {'SECONDS':<9} SPEEDUP")
+    for row in rows:
+        print(f"{row['workers']:<8} {row['seconds']:<9.2f} {row['speedup']:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 from network.topology import Topology
+from network.simulator import Simulator
 
 def print_table_snapshot(topo: Topology) -> None:
     snap = topo.routing_tables_snapshot()
@@ -31,5 +32,19 @@ def scenario():
     for line in topo.send("A","G","to G despite failure"):
         print(line)
 
+def convergence_scenario():
+    """Same failure, but with LSA flooding/SPF timers and live traffic A -> G."""
+    topo = Topology.sample()
+    sim = Simulator(topo)
+    sim.add_flow("A", "G", rate=1000.0, stop=2.0)
+    sim.add_flow("B", "F", rate=1000.0, stop=2.0)
+    sim.schedule_link_change(0.5, "A", "D", up=False)
+    sim.schedule_link_change(1.0, "E", "F", metric=10.0)
+    stats = sim.run()
+    print("\n=== Event-driven reconvergence (A-D down at 0.5s, E-F metric 10 at 1.0s) ===")
+    for key, value in stats.summary().items():
+        print(f"{key:<18} {value:.4f}" if isinstance(value, float) else f"{key:<18} {value}")
+
 if __name__ == "__main__":
     scenario()
+    convergence_scenario()
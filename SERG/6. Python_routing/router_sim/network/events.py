@@ -0,0 +1,42 @@
+from __future__ import annotations
+from typing import Any, Callable, List, Optional, Tuple
+import heapq
+
+class EventLoop:
+    """Discrete-event scheduler: a priority queue of callbacks on a simulated clock.
+
+    Events with equal time run in scheduling order. Nothing sleeps, so the
+    simulation runs as fast as the callbacks allow.
+    """
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.processed = 0
+        self._queue: List[Tuple[float, int, Callable[..., Any], tuple]] = []
+        self._seq = 0
+
+    def schedule(self, delay: float, fn: Callable[..., Any], *args: Any) -> None:
+        self.schedule_at(self.now + delay, fn, *args)
+
+    def schedule_at(self, time: float, fn: Callable[..., Any], *args: Any) -> None:
+        if time < self.now:
+            raise ValueError("Cannot schedule an event in the past")
+        heapq.heappush(self._queue, (time, self._seq, fn, args))
+        self._seq += 1
+
+    def run(self, until: Optional[float] = None) -> None:
+        """Process events in time order (up to and including `until`)."""
+        queue = self._queue
+        while queue:
+            if until is not None and queue[0][0] > until:
+                self.now = until
+                return
+            time, _, fn, args = heapq.heappop(queue)
+            self.now = time
+            self.processed += 1
+            fn(*args)
+        if until is not None:
+            self.now = max(self.now, until)
+
+    def __len__(self) -> int:
+        return len(self._queue)
@@ -0,0 +1,144 @@
+from __future__ import annotations
+from typing import Dict, List, Tuple
+import math
+import random
+from .graph import Graph, GraphBuilder
+
+# Synthetic topologies for benchmarks. All generators are deterministic for a
+# given seed and write links straight into a GraphBuilder.
+
+def grid(rows: int, cols: int, metric: float = 1.0) -> Graph:
+    """rows x cols mesh, routers named `R<row>_<col>`."""
+    builder = GraphBuilder()
+    for r in range(rows):
+        for c in range(cols):
+            builder.node(f"R{r}_{c}")
+    for r in range(rows):
+        for c in range(cols):
+            i = r * cols + c
+            if c + 1 < cols:
+                builder.add_link_ids(i, i + 1, metric)
+            if r + 1 < rows:
+                builder.add_link_ids(i, i + cols, metric)
+    return builder.build()
+
+def fat_tree(k: int, metric: float = 1.0) -> Graph:
+    """k-ary fat-tree switch fabric: (k/2)^2 core, k pods of k/2 aggregation + k/2 edge switches."""
+    if k < 2 or k % 2:
+        raise ValueError("k must be a positive even number")
+    half = k // 2
+    builder = GraphBuilder()
+    core = [builder.node(f"core{i}") for i in range(half * half)]
+    for p in range(k):
+        aggs = [builder.node(f"agg{p}_{j}") for j in range(half)]
+        edges = [builder.node(f"edge{p}_{j}") for j in range(half)]
+        for j, agg in enumerate(aggs):
+            for e in edges:
+                builder.add_link_ids(e, agg, metric)
+            for c in range(half):
+                builder.add_link_ids(agg, core[j * half + c], metric)
+    return builder.build()
+
+def random_graph(n: int, degree: int, seed: int = 1) -> Graph:
+    """Connected random graph: a random spanning tree plus extra random links, metrics 1..10."""
+    rnd = random.Random(seed)
+    builder = GraphBuilder()
+    for i in range(n):
+        builder.node(f"R{i}")
+    for i in range(1, n):
+        builder.add_link_ids(rnd.randrange(i), i, float(rnd.randint(1, 10)))
+    for _ in range(n * degree // 2 - (n - 1)):
+        a, b = rnd.randrange(n), rnd.randrange(n)
+        if a != b:
+            builder.add_link_ids(a, b, float(rnd.randint(1, 10)))
+    return builder.build()
+
+def _points(n: int, rnd: random.Random) -> List[Tuple[float, float]]:
+    return [(rnd.random(), rnd.random()) for _ in range(n)]
+
+def _pairs_within(points: List[Tuple[float, float]], radius: float):
+    """Yield (i, j, distance) for all point pairs closer than radius.
+
+    Points are bucketed into radius-sized cells so only neighboring cells are
+    compared: O(n + pairs) instead of O(n^2).
+    """
+    cells: Dict[Tuple[int, int], List[int]] = {}
+    for i, (x, y) in enumerate(points):
+        cells.setdefault((int(x / radius), int(y / radius)), []).append(i)
+    for (cx, cy), members in cells.items():
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                other = cells.get((cx + dx, cy + dy))
+                if not other:
+                    continue
+                for i in members:
+                    xi, yi = points[i]
+                    for j in other:
+                        if j <= i:
+                            continue
+                        d = math.hypot(xi - points[j][0], yi - points[j][1])
+                        if d < radius:
+                            yield i, j, d
+
+def _distance_metric(d: float) -> float:
+    # Unit square scaled to 1000 "km", at least 1 so metrics stay positive.
+    return max(1.0, round(d * 1000.0))
+
+def random_geometric(n: int, radius: float, seed: int = 1) -> Graph:
+    """Routers at random points of the unit square, linked when closer than `radius`.
+
+    Link metric is the distance (see `_distance_metric`). Not guaranteed to be
+    connected: pick radius around sqrt(2 ln n / n) or more.
+    """
+    rnd = random.Random(seed)
+    points = _points(n, rnd)
+    builder = GraphBuilder()
+    for i in range(n):
+        builder.node(f"R{i}")
+    for i, j, d in _pairs_within(points, radius):
+        builder.add_link_ids(i, j, _distance_metric(d))
+    return builder.build()
+
+def waxman(n: int, alpha: float = 0.05, beta: float = 0.4, seed: int = 1, eps: float = 1e-4) -> Graph:
+    """Waxman graph: link i-j with probability beta * exp(-d / (alpha * L)), L = sqrt(2).
+
+    Pairs farther than the distance where the probability drops below `eps`
+    are never examined, which keeps generation near-linear for small alpha.
+    """
+    rnd = random.Random(seed)
+    points = _points(n, rnd)
+    scale = alpha * math.sqrt(2.0)
+    cutoff = scale * math.log(beta / eps) if beta > eps else 0.0
+    builder = GraphBuilder()
+    for i in range(n):
+        builder.node(f"R{i}")
+    if cutoff > 0:
+        for i, j, d in _pairs_within(points, min(cutoff, math.sqrt(2.0) + 1e-9)):
+            if rnd.random() < beta * math.exp(-d / scale):
+                builder.add_link_ids(i, j, _distance_metric(d))
+    return builder.build()
+
+def scale_free(n: int, m: int = 2, seed: int = 1) -> Graph:
+    """Barabasi-Albert preferential attachment: each new router links to m existing ones.
+
+    Attachment targets are drawn from the list of link endpoints, which is
+    proportional to degree, so generation is O(n * m). Metrics 1..10.
+    """
+    if n <= m:
+        raise ValueError("n must be larger than m")
+    rnd = random.Random(seed)
+    builder = GraphBuilder()
+    for i in range(n):
+        builder.node(f"R{i}")
+    endpoints: List[int] = []
+    for i in range(m):
+        builder.add_link_ids(i, m, float(rnd.randint(1, 10)))
+        endpoints += (i, m)
+    for v in range(m + 1, n):
+        targets = set()
+        while len(targets) < m:
+            targets.add(endpoints[rnd.randrange(len(endpoints))])
+        for t in targets:
+            builder.add_link_ids(v, t, float(rnd.randint(1, 10)))
+            endpoints += (v, t)
+    return builder.build()
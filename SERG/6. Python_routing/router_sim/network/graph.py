@@ -0,0 +1,181 @@
+from __future__ import annotations
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+import math
+
+class Graph:
+    """Compact array-backed (CSR) core of a topology.
+
+    Routers are integer ids `0..V-1` (`names[i]` <-> `index[name]`), links are
+    integer ids `0..L-1` with their endpoints, metric and state kept in flat
+    arrays. Adjacency is stored in compressed sparse row form: the half-edges
+    of node `u` are `offsets[u]:offsets[u+1]`, each one pointing at a neighbor
+    (`targets`) through a link (`edge_link`). Metric/state changes write the
+    link arrays in place, so the CSR itself is only built once.
+    """
+
+    def __init__(self, names: List[str], link_a: array, link_b: array,
+                 link_metric: array, link_up: bytearray) -> None:
+        self.names = names
+        self.index: Dict[str, int] = {n: i for i, n in enumerate(names)}
+        self.link_a = link_a
+        self.link_b = link_b
+        self.link_metric = link_metric
+        self.link_up = link_up
+        self.version = 0
+        self._build_csr()
+
+    @staticmethod
+    def from_edges(names: List[str], edges: Iterable[Tuple[int, int, float]]) -> "Graph":
+        """Build from (a_id, b_id, metric) triples; all links start UP."""
+        link_a, link_b, link_metric = array("i"), array("i"), array("d")
+        for a, b, metric in edges:
+            if metric <= 0:
+                raise ValueError("Metric must be positive")
+            link_a.append(a)
+            link_b.append(b)
+            link_metric.append(metric)
+        return Graph(names, link_a, link_b, link_metric, bytearray(b"\x01") * len(link_a))
+
+    @staticmethod
+    def from_links(names: List[str], links: List["Link"], bind: bool = True) -> "Graph":
+        """Build from `Link` objects, optionally binding each link to its id."""
+        index = {n: i for i, n in enumerate(names)}
+        graph = Graph(names,
+                      array("i", (index[ln.a.name] for ln in links)),
+                      array("i", (index[ln.b.name] for ln in links)),
+                      array("d", (ln.metric for ln in links)),
+                      bytearray(1 if ln.up else 0 for ln in links))
+        if bind:
+            for i, ln in enumerate(links):
+                ln.bind(graph, i)
+        return graph
+
+    @staticmethod
+    def from_routers(all_routers: Dict[str, "Router"]) -> "Graph":
+        """Unbound snapshot of the links reachable through router interfaces."""
+        links: List["Link"] = []
+        seen = set()
+        for r in all_routers.values():
+            for iface in r.interfaces:
+                if id(iface.link) not in seen:
+                    seen.add(id(iface.link))
+                    links.append(iface.link)
+        return Graph.from_links(list(all_routers), links, bind=False)
+
+    def _build_csr(self) -> None:
+        n = len(self.names)
+        offsets = array("i", [0]) * (n + 1)
+        for a in self.link_a:
+            offsets[a + 1] += 1
+        for b in self.link_b:
+            offsets[b + 1] += 1
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+        pos = array("i", offsets)
+        targets = array("i", [0]) * (2 * len(self.link_a))
+        edge_link = array("i", [0]) * (2 * len(self.link_a))
+        for l, (a, b) in enumerate(zip(self.link_a, self.link_b)):
+            targets[pos[a]] = b
+            edge_link[pos[a]] = l
+            pos[a] += 1
+            targets[pos[b]] = a
+            edge_link[pos[b]] = l
+            pos[b] += 1
+        self.offsets = offsets
+        self.targets = targets
+        self.edge_link = edge_link
+
+    @property
+    def node_count(self) -> int:
+        return len(self.names)
+
+    @property
+    def link_count(self) -> int:
+        return len(self.link_a)
+
+    def snapshot(self) -> "Graph":
+        """Frozen view: link metrics/state are copied, names, index and CSR are shared.
+
+        Later metric/state changes on this graph do not show through, so
+        anything derived from the view (e.g. ECMP first hops) stays consistent
+        with the distances captured at the same moment. O(L) per call.
+        """
+        frozen = Graph.__new__(Graph)
+        frozen.__dict__.update(self.__dict__)
+        frozen.link_metric = array("d", self.link_metric)
+        frozen.link_up = bytearray(self.link_up)
+        return frozen
+
+    def neighbors(self, u: int) -> Iterable[Tuple[int, float, int]]:
+        """(neighbor, cost, link) over UP links of node `u`."""
+        metric, up, targets, edge_link = self.link_metric, self.link_up, self.targets, self.edge_link
+        for e in range(self.offsets[u], self.offsets[u + 1]):
+            l = edge_link[e]
+            if up[l]:
+                yield targets[e], metric[l], l
+
+    def links_between(self, a: int, b: int) -> List[int]:
+        """All links (UP or DOWN) between `a` and `b`."""
+        return [self.edge_link[e] for e in range(self.offsets[a], self.offsets[a + 1]) if self.targets[e] == b]
+
+    def find_link(self, a: int, b: int) -> Optional[int]:
+        """Cheapest UP link between `a` and `b`, if any."""
+        best, best_cost = None, math.inf
+        for v, cost, l in self.neighbors(a):
+            if v == b and cost < best_cost:
+                best, best_cost = l, cost
+        return best
+
+    def cost(self, a: str, b: str) -> float:
+        """Cost a->b as seen by SPF (math.inf if there is no UP link)."""
+        l = self.find_link(self.index[a], self.index[b])
+        return self.link_metric[l] if l is not None else math.inf
+
+    def set_metric(self, link: int, metric: float) -> None:
+        self.link_metric[link] = metric
+        self.version += 1
+
+    def set_state(self, link: int, up: bool) -> None:
+        self.link_up[link] = 1 if up else 0
+        self.version += 1
+
+    def memory_bytes(self) -> int:
+        """Approximate size of the array payloads (excluding names/index)."""
+        arrays = (self.offsets, self.targets, self.edge_link, self.link_a, self.link_b, self.link_metric)
+        return sum(a.itemsize * len(a) for a in arrays) + len(self.link_up)
+
+class GraphBuilder:
+    """Object-free incremental construction of a `Graph`.
+
+    Router names are interned on first use; links go straight into the
+    column arrays, the CSR index is built once by `build()`.
+    """
+
+    def __init__(self) -> None:
+        self.names: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.link_a, self.link_b, self.link_metric = array("i"), array("i"), array("d")
+        self.link_up = bytearray()
+
+    def node(self, name: str) -> int:
+        i = self.index.get(name)
+        if i is None:
+            i = self.index[name] = len(self.names)
+            self.names.append(name)
+        return i
+
+    def add_link(self, a: str, b: str, metric: float = 1.0, up: bool = True) -> int:
+        return self.add_link_ids(self.node(a), self.node(b), metric, up)
+
+    def add_link_ids(self, a: int, b: int, metric: float = 1.0, up: bool = True) -> int:
+        if metric <= 0:
+            raise ValueError("Metric must be positive")
+        self.link_a.append(a)
+        self.link_b.append(b)
+        self.link_metric.append(metric)
+        self.link_up.append(1 if up else 0)
+        return len(self.link_a) - 1
+
+    def build(self) -> Graph:
+        return Graph(self.names, self.link_a, self.link_b, self.link_metric, self.link_up)
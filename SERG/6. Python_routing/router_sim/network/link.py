@@ -1,13 +1,24 @@
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Optional
 
 @dataclass
 class Link:
-    """Bidirectional link between two routers with a metric (cost)."""
+    """Bidirectional link between two routers with a metric (cost).
+
+    Once bound to a `Graph` the link is a view of its slot `id` there:
+    metric/state changes are written through to the graph arrays.
+    """
     a: "Router"
     b: "Router"
     metric: float = 1.0
     up: bool = True
+    id: int = field(default=-1, repr=False, compare=False)
+    graph: Optional["Graph"] = field(default=None, repr=False, compare=False)
+
+    def bind(self, graph: "Graph", link_id: int) -> None:
+        self.graph = graph
+        self.id = link_id
 
     def other(self, node: "Router") -> "Router":
         if node is self.a:
@@ -21,6 +32,10 @@ class Link:
         if metric <= 0:
             raise ValueError("Metric must be positive")
         self.metric = metric
+        if self.graph is not None:
+            self.graph.set_metric(self.id, metric)
 
     def set_state(self, up: bool) -> None:
         self.up = up
+        if self.graph is not None:
+            self.graph.set_state(self.id, up)
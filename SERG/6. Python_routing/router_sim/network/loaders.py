@@ -0,0 +1,161 @@
+from __future__ import annotations
+from typing import Iterator, Optional, Tuple
+import csv
+import json
+import os
+import xml.etree.ElementTree as ET
+from .graph import Graph, GraphBuilder
+
+# Every loader streams its input straight into a GraphBuilder: no Router/Link
+# objects and no intermediate edge list are created.
+
+_UP = ("1", "true", "up", "yes")
+_DOWN = ("0", "false", "down", "no")
+
+# Column names recognised in the first row of an edge list.
+_HEADER_NODES = {"a", "b", "src", "dst", "source", "target", "from", "to", "node1", "node2", "u", "v"}
+
+def _parse_up(value: str) -> bool:
+    return value.strip().lower() not in _DOWN
+
+def _json_up(value) -> bool:
+    """`up` from JSON: a boolean, 0/1, or one of the up/down words as a string."""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str):
+        word = value.strip().lower()
+        if word in _UP:
+            return True
+        if word in _DOWN:
+            return False
+    raise ValueError(f"Invalid link state: {value!r}")
+
+def _is_header(row) -> bool:
+    if row[0].strip().lower() in _HEADER_NODES and row[1].strip().lower() in _HEADER_NODES:
+        return True
+    if len(row) > 2 and row[2].strip():
+        try:
+            float(row[2])
+        except ValueError:
+            return True  # named metric column, e.g. `x,y,cost`
+    return False
+
+def load_edge_list(path: str, delimiter: str = ",", header: Optional[bool] = None) -> Graph:
+    """CSV/TSV edge list: `a,b[,metric[,up]]` per line.
+
+    Blank lines and `#` comments are skipped. `header` says whether the first
+    row holds column names; by default it does when its node fields are column
+    names such as `a,b` or `source,target` (the `save_edge_list` header) or its
+    metric column is not a number.
+    """
+    builder = GraphBuilder()
+    first = True
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.reader(f, delimiter=delimiter):
+            if not row or row[0].lstrip().startswith("#"):
+                continue
+            if first:
+                first = False
+                if header or (header is None and len(row) > 1 and _is_header(row)):
+                    continue
+            if len(row) < 2:
+                raise ValueError(f"Edge list row needs two nodes: {row!r}")
+            metric = float(row[2]) if len(row) > 2 and row[2].strip() else 1.0
+            up = _parse_up(row[3]) if len(row) > 3 and row[3].strip() else True
+            builder.add_link(row[0].strip(), row[1].strip(), metric, up)
+    return builder.build()
+
+def load_json(path: str) -> Graph:
+    """JSON document `{"nodes": [...], "links": [{"a", "b", "metric", "up"}, ...]}`.
+
+    `nodes` is optional (it only fixes ids/isolated routers); `links` may also
+    be given as `[a, b, metric]` lists, and `source`/`target` are accepted for
+    `a`/`b`. Use `load_json_lines` for files too large to parse at once.
+    """
+    with open(path, encoding="utf-8") as f:
+        doc = json.load(f)
+    builder = GraphBuilder()
+    for name in doc.get("nodes", []):
+        builder.node(name["id"] if isinstance(name, dict) else str(name))
+    for link in doc.get("links", doc.get("edges", [])):
+        _add_json_link(builder, link)
+    return builder.build()
+
+def load_json_lines(path: str) -> Graph:
+    """One JSON link object (or `[a, b, metric]` list) per line, read line by line."""
+    builder = GraphBuilder()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                _add_json_link(builder, json.loads(line))
+    return builder.build()
+
+def _add_json_link(builder: GraphBuilder, link) -> None:
+    if isinstance(link, (list, tuple)):
+        a, b = link[0], link[1]
+        metric = float(link[2]) if len(link) > 2 else 1.0
+        up = _json_up(link[3]) if len(link) > 3 else True
+    else:
+        a, b = link.get("a", link.get("source")), link.get("b", link.get("target"))
+        metric = float(link.get("metric", link.get("weight", 1.0)))
+        up = _json_up(link.get("up", True))
+    builder.add_link(str(a), str(b), metric, up)
+
+def load_graphml(path: str) -> Graph:
+    """GraphML-like XML: `<node id>` and `<edge source target>` elements.
+
+    The metric is read from the edge `<data>` whose `<key>` is named
+    weight/metric/cost. Parsed incrementally with `iterparse`; elements are
+    cleared as soon as they are consumed.
+    """
+    builder = GraphBuilder()
+    metric_keys = set()
+    for _, elem in ET.iterparse(path, events=("end",)):
+        tag = elem.tag.rsplit("}", 1)[-1]
+        if tag == "key":
+            if (elem.get("attr.name") or "").lower() in ("weight", "metric", "cost"):
+                metric_keys.add(elem.get("id"))
+        elif tag == "node":
+            builder.node(elem.get("id"))
+            elem.clear()
+        elif tag == "edge":
+            metric = 1.0
+            for data in elem:
+                if data.get("key") in metric_keys and data.text:
+                    metric = float(data.text)
+            builder.add_link(elem.get("source"), elem.get("target"), metric)
+            elem.clear()
+    return builder.build()
+
+_LOADERS = {
+    ".csv": load_edge_list,
+    ".txt": load_edge_list,
+    ".tsv": lambda path: load_edge_list(path, delimiter="\t"),
+    ".json": load_json,
+    ".jsonl": load_json_lines,
+    ".graphml": load_graphml,
+    ".xml": load_graphml,
+}
+
+def load(path: str) -> Graph:
+    """Pick a loader by file extension."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in _LOADERS:
+        raise ValueError(f"Unknown topology format: {ext}")
+    return _LOADERS[ext](path)
+
+def iter_links(graph: Graph) -> Iterator[Tuple[str, str, float, bool]]:
+    names = graph.names
+    for l in range(graph.link_count):
+        yield names[graph.link_a[l]], names[graph.link_b[l]], graph.link_metric[l], bool(graph.link_up[l])
+
+def save_edge_list(graph: Graph, path: str) -> None:
+    """Write a graph in the `load_edge_list` format (e.g. to keep a generated topology)."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["a", "b", "metric", "up"])
+        for a, b, metric, up in iter_links(graph):
+            writer.writerow([a, b, metric, int(up)])
@@ -6,8 +6,33 @@ class Packet:
     dst: str
     payload: str = ""
     ttl: int = 32
+    sport: int = 0
+    dport: int = 0
+    proto: int = 17
 
     def hop(self) -> None:
         if self.ttl <= 0:
             raise RuntimeError("TTL expired")
         self.ttl -= 1
+
+def flow_hash(src: int, dst: int, sport: int = 0, dport: int = 0, proto: int = 17) -> int:
+    """Deterministic 32-bit FNV-1a hash of a 5-tuple (router ids stand in for addresses)."""
+    h = 2166136261
+    for word in (src, dst, sport, dport, proto):
+        h = ((h ^ (word & 0xFFFFFFFF)) * 16777619) & 0xFFFFFFFF
+    return h
+
+def ecmp_pick(h: int, router: int, n: int) -> int:
+    """Index of the equal-cost next hop a router picks for flow hash `h`.
+
+    The router id is mixed in so consecutive routers do not all split the
+    same way (hash polarization).
+    """
+    x = (h ^ (router * 0x9E3779B1)) & 0xFFFFFFFF
+    # murmur3 finalizer: every input bit affects the low bits used by `% n`
+    x ^= x >> 16
+    x = (x * 0x85EBCA6B) & 0xFFFFFFFF
+    x ^= x >> 13
+    x = (x * 0xC2B2AE35) & 0xFFFFFFFF
+    x ^= x >> 16
+    return x % n
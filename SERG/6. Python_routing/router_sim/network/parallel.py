@@ -0,0 +1,96 @@
+from __future__ import annotations
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+import os
+from .graph import Graph
+from .spf import ShortestPathTree
+
+# Graph columns that SPF reads, with their array typecodes.
+_COLUMNS = (("offsets", "i"), ("targets", "i"), ("edge_link", "i"), ("link_metric", "d"), ("link_up", "B"))
+
+class _SharedView:
+    """Graph-like object over shared-memory columns (what `ShortestPathTree.compute` needs)."""
+
+    def __init__(self, node_count: int, columns: Dict[str, memoryview]) -> None:
+        self.node_count = node_count
+        for name, view in columns.items():
+            setattr(self, name, view)
+
+class SharedGraph:
+    """Copy of the SPF-relevant graph arrays in `multiprocessing.shared_memory`.
+
+    Workers attach to the blocks by name once (pool initializer), so tasks
+    only carry lists of source ids instead of a pickled graph.
+    """
+
+    def __init__(self, graph: Graph) -> None:
+        self.node_count = graph.node_count
+        self.blocks: List[shared_memory.SharedMemory] = []
+        self.spec: List[Tuple[str, str, str, int]] = []
+        for name, code in _COLUMNS:
+            data = bytes(getattr(graph, name)) if code == "B" else getattr(graph, name).tobytes()
+            block = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+            block.buf[:len(data)] = data
+            self.blocks.append(block)
+            self.spec.append((name, code, block.name, len(data)))
+
+    def close(self) -> None:
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+    def __enter__(self) -> "SharedGraph":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+# Per-worker state set by the pool initializer.
+_worker_blocks: List[shared_memory.SharedMemory] = []
+_worker_graph: Optional[_SharedView] = None
+
+def _attach(node_count: int, spec: List[Tuple[str, str, str, int]]) -> None:
+    global _worker_graph
+    columns = {}
+    for name, code, block_name, size in spec:
+        block = shared_memory.SharedMemory(name=block_name)
+        _worker_blocks.append(block)
+        columns[name] = block.buf[:size].cast(code)
+    _worker_graph = _SharedView(node_count, columns)
+
+def _spf_chunk(sources: List[int]) -> List[Tuple[int, bytes, bytes]]:
+    result = []
+    for src in sources:
+        tree = ShortestPathTree(src)
+        tree.compute(_worker_graph)
+        result.append((src, tree.dist.tobytes(), tree.prev.tobytes()))
+    return result
+
+def all_pairs_spf(graph: Graph, workers: Optional[int] = None,
+                  sources: Optional[List[int]] = None) -> Dict[int, ShortestPathTree]:
+    """Compute one shortest-path tree per source across a process pool.
+
+    The graph is published once through shared memory; each task is a chunk
+    of source ids and returns the packed dist/prev arrays of its trees.
+    """
+    workers = workers or os.cpu_count() or 1
+    if sources is None:
+        sources = list(range(graph.node_count))
+    chunk = max(1, len(sources) // (workers * 4))
+    chunks = [sources[i:i + chunk] for i in range(0, len(sources), chunk)]
+    trees: Dict[int, ShortestPathTree] = {}
+    with SharedGraph(graph) as shared:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach,
+                                 initargs=(shared.node_count, shared.spec)) as pool:
+            for part in pool.map(_spf_chunk, chunks):
+                for src, dist, prev in part:
+                    tree = ShortestPathTree(src)
+                    tree.dist = array("d")
+                    tree.dist.frombytes(dist)
+                    tree.prev = array("i")
+                    tree.prev.frombytes(prev)
+                    trees[src] = tree
+    return trees
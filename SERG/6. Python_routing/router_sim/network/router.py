@@ -1,7 +1,11 @@
 from __future__ import annotations
+from array import array
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
 import math
+from .graph import Graph
+from .packet import ecmp_pick, flow_hash
+from .spf import ShortestPathTree
 
 @dataclass
 class Interface:
@@ -14,13 +18,77 @@ class Route:
     destination: str
     next_hop: Optional[str]  # None for directly connected / self
     cost: float
-    path: List[str]  # full path from self to destination (inclusive)
+    tree: ShortestPathTree = field(repr=False, compare=False)
+    graph: Graph = field(repr=False, compare=False)
+    dest_id: int = field(repr=False, compare=False)
+
+    @property
+    def path(self) -> List[str]:
+        """Full path from self to destination (inclusive), rebuilt from the tree on demand."""
+        return [self.graph.names[i] for i in self.tree.path(self.dest_id)]
+
+    @property
+    def next_hops(self) -> Tuple[str, ...]:
+        """All equal-cost next hops (ECMP); `next_hop` is the one on `path`."""
+        return tuple(self.graph.names[i] for i in self.tree.ecmp_first_hops(self.graph)[self.dest_id])
+
+class RoutingTable(Mapping[str, Route]):
+    """{destination: Route} view over a shortest-path tree.
+
+    Nothing is materialized per destination: routes are created on lookup and
+    paths are walked through the predecessor array only when asked for.
+    """
+
+    def __init__(self, graph: Graph, tree: ShortestPathTree) -> None:
+        self.graph = graph
+        self.tree = tree
+
+    def __getitem__(self, dest: str) -> Route:
+        i = self.graph.index.get(dest)
+        if i is None or math.isinf(self.tree.dist[i]):
+            raise KeyError(dest)
+        hop = self.tree.first_hops()[i]
+        return Route(destination=dest, next_hop=self.graph.names[hop] if hop >= 0 else None,
+                     cost=self.tree.dist[i], tree=self.tree, graph=self.graph, dest_id=i)
+
+    def __contains__(self, dest: object) -> bool:
+        i = self.graph.index.get(dest)
+        return i is not None and not math.isinf(self.tree.dist[i])
+
+    def __iter__(self) -> Iterator[str]:
+        names = self.graph.names
+        return (names[i] for i, d in enumerate(self.tree.dist) if not math.isinf(d))
+
+    def __len__(self) -> int:
+        return sum(1 for d in self.tree.dist if not math.isinf(d))
+
+class SnapshotTable(Mapping[str, dict]):
+    """Frozen routing table of one router as {dest: {"next_hop", "next_hops", "cost", "path"}}."""
+
+    def __init__(self, table: RoutingTable) -> None:
+        self.table = table
+
+    def __getitem__(self, dest: str) -> dict:
+        route = self.table[dest]
+        return {"next_hop": route.next_hop, "next_hops": route.next_hops, "cost": route.cost, "path": route.path}
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.table)
+
+    def __len__(self) -> int:
+        return len(self.table)
 
 @dataclass
 class Router:
     name: str
     interfaces: List[Interface] = field(default_factory=list)
-    routing_table: Dict[str, Route] = field(default_factory=dict, init=False)
+    routing_table: Mapping[str, Route] = field(default_factory=dict, init=False)
+    spt: Optional[ShortestPathTree] = field(default=None, init=False, repr=False)
+    graph: Optional[Graph] = field(default=None, init=False, repr=False)
+    fib: Optional[array] = field(default=None, init=False, repr=False)
+    fib_version: int = field(default=-1, init=False, repr=False)
+    ecmp_fib: Optional[List[Tuple[int, ...]]] = field(default=None, init=False, repr=False)
+    ecmp_fib_version: int = field(default=-1, init=False, repr=False)
 
     def add_interface(self, name: str, ip: str, link: "Link") -> None:
         self.interfaces.append(Interface(name=name, ip=ip, link=link))
@@ -35,83 +103,138 @@ class Router:
                 result[other.name] = (other, iface.link.metric)
         return result
 
-    def compute_routes(self, all_routers: Dict[str, "Router"]) -> None:
-        """Simple Dijkstra over routers as graph nodes using link metrics."""
-        # Distances and previous-hop map
-        dist = {r: math.inf for r in all_routers}
-        prev = {r: None for r in all_routers}  # type: Dict[str, Optional[str]]
-        dist[self.name] = 0.0
-        visited = set()
-
-        while len(visited) < len(all_routers):
-            # pick unvisited node with smallest dist
-            u = None
-            u_cost = math.inf
-            for r, c in dist.items():
-                if r not in visited and c < u_cost:
-                    u, u_cost = r, c
-            if u is None:
-                break
-            visited.add(u)
-            # relax edges
-            u_router = all_routers[u]
-            for v_name, (v_router, edge_cost) in u_router.neighbors.items():
-                if v_name in visited:
-                    continue
-                alt = dist[u] + edge_cost
-                if alt < dist[v_name]:
-                    dist[v_name] = alt
-                    prev[v_name] = u
-
-        # build routing table
-        table: Dict[str, Route] = {}
-        for dest in all_routers:
-            if dest == self.name:
-                table[dest] = Route(destination=dest, next_hop=None, cost=0.0, path=[self.name])
-                continue
-            if math.isinf(dist[dest]):
-                # unreachable
-                continue
-            # reconstruct path
-            path = []
-            cur = dest
-            while cur is not None:
-                path.append(cur)
-                cur = prev[cur]
-            path.reverse()  # now from self -> dest
-            if path[0] != self.name:
-                # Not reachable (shouldn't happen if graph traversal began at self)
+    def compute_routes(self, all_routers: Dict[str, "Router"], graph: Optional[Graph] = None) -> None:
+        """Heap-based Dijkstra over the topology graph using link metrics.
+
+        `graph` defaults to the topology's CSR graph; it is built on the fly
+        when the router is used without a `Topology`.
+        """
+        if graph is None:
+            graph = self.graph if self.graph is not None else Graph.from_routers(all_routers)
+        tree = ShortestPathTree(graph.index[self.name])
+        tree.compute(graph)
+        self.set_tree(graph, tree)
+
+    def set_tree(self, graph: Graph, tree: ShortestPathTree) -> None:
+        """Install a shortest-path tree computed elsewhere (e.g. in a worker process)."""
+        self.spt = tree
+        self.graph = graph
+        self.routing_table = RoutingTable(graph, tree)
+        self.fib = None
+        self.ecmp_fib = None
+
+    def fib_lookup(self, dest: str, flow: Optional[int] = None) -> Optional[Interface]:
+        """Outgoing interface towards `dest` from the FIB (None if there is no route).
+
+        The FIB maps destination id -> index in `interfaces` and is rebuilt in
+        O(V) only when the graph version differs from the one it was built for.
+        With a flow hash the ECMP FIB is used and the flow is pinned to one of
+        the equal-cost interfaces.
+        """
+        i = self.graph.index.get(dest)
+        if flow is not None:
+            if self.ecmp_fib is None or self.ecmp_fib_version != self.graph.version:
+                self._build_ecmp_fib()
+            if i is None or not self.ecmp_fib[i]:
+                return None
+            choices = self.ecmp_fib[i]
+            return self.interfaces[choices[ecmp_pick(flow, self.spt.root, len(choices))]]
+        if self.fib is None or self.fib_version != self.graph.version:
+            self._build_fib()
+        if i is None or self.fib[i] < 0:
+            return None
+        return self.interfaces[self.fib[i]]
+
+    def _iface_by_neighbor(self) -> Dict[int, int]:
+        # Cheapest UP interface per neighbor id.
+        index = self.graph.index
+        via: Dict[int, int] = {}
+        for k, iface in enumerate(self.interfaces):
+            if not iface.link.up:
                 continue
-            next_hop = path[1] if len(path) > 1 else None
-            table[dest] = Route(destination=dest, next_hop=next_hop, cost=dist[dest], path=path)
+            nb = index[iface.link.other(self).name]
+            if nb not in via or iface.link.metric < self.interfaces[via[nb]].link.metric:
+                via[nb] = k
+        return via
+
+    def _build_fib(self) -> None:
+        via = self._iface_by_neighbor()
+        first = self.spt.first_hops()
+        self.fib = array("i", (via.get(hop, -1) if hop >= 0 else -1 for hop in first))
+        self.fib_version = self.graph.version
+
+    def _build_ecmp_fib(self) -> None:
+        via = self._iface_by_neighbor()
+        interned: Dict[Tuple[int, ...], Tuple[int, ...]] = {}
+        fib = []
+        for hops in self.spt.ecmp_first_hops(self.graph):
+            key = tuple(via[h] for h in hops if h in via)
+            fib.append(interned.setdefault(key, key))
+        self.ecmp_fib = fib
+        self.ecmp_fib_version = self.graph.version
+
+    def update_routes(self, all_routers: Dict[str, "Router"], graph: Graph, a: str, b: str,
+                      old_cost: float, new_cost: float) -> None:
+        """Incrementally repair routes after the cost of link a-b changed.
+
+        Only the affected part of the shortest-path tree is recomputed; falls
+        back to a full `compute_routes` when no tree exists yet.
+        """
+        if self.spt is None or len(self.spt.dist) != graph.node_count:
+            self.compute_routes(all_routers, graph)
+            return
+        self.spt.link_changed(graph, graph.index[a], graph.index[b], old_cost, new_cost)
+
+    def forward(self, pkt: "Packet", all_routers: Dict[str, "Router"], log: Optional[List[str]],
+                ecmp: bool = False) -> bool:
+        """Forward a packet from this router hop by hop. Returns True if delivered, False if dropped.
 
-        self.routing_table = table
+        With `ecmp` the packet's 5-tuple hash selects among equal-cost next hops.
+        """
+        flow = None
+        if ecmp:
+            if self.spt is None:
+                self.compute_routes(all_routers)
+            index = self.graph.index
+            flow = flow_hash(index[pkt.src], index.get(pkt.dst, -1), pkt.sport, pkt.dport, pkt.proto)
+        router = self
+        while True:
+            nxt = router.receive(pkt, all_routers, log, flow)
+            if nxt is None:
+                return pkt.ttl > 0 and pkt.dst == router.name
+            router = nxt
 
-    def forward(self, pkt: "Packet", all_routers: Dict[str, "Router"], log: List[str]) -> bool:
-        """Process a packet at this router. Returns True if delivered, False if dropped."""
-        log.append(f"[{self.name}] Received packet (ttl={pkt.ttl}) dst={pkt.dst}")
+    def receive(self, pkt: "Packet", all_routers: Dict[str, "Router"], log: Optional[List[str]],
+                flow: Optional[int] = None) -> Optional["Router"]:
+        """Process a packet at this router. Returns the next router, or None if delivered/dropped."""
+        if log is not None:
+            log.append(f"[{self.name}] Received packet (ttl={pkt.ttl}) dst={pkt.dst}")
         if pkt.ttl <= 0:
-            log.append(f"[{self.name}] DROP: TTL expired")
-            return False
+            if log is not None:
+                log.append(f"[{self.name}] DROP: TTL expired")
+            return None
         if pkt.dst == self.name:
-            log.append(f"[{self.name}] DELIVERED payload='{pkt.payload}'")
-            return True
-        # ensure routing table is available
-        if not self.routing_table or pkt.dst not in self.routing_table:
+            if log is not None:
+                log.append(f"[{self.name}] DELIVERED payload='{pkt.payload}'")
+            return None
+        # routing table is computed once; a missing destination is simply unroutable
+        if self.spt is None:
             self.compute_routes(all_routers)
-        route = self.routing_table.get(pkt.dst)
-        if route is None:
-            log.append(f"[{self.name}] DROP: No route to {pkt.dst}")
-            return False
-        next_name = route.next_hop
-        if next_name is None:
-            # same node (should have matched above)
-            log.append(f"[{self.name}] DROP: Routing inconsistency for {pkt.dst}")
-            return False
-        # find outgoing interface/link to that neighbor and ensure it's up
-        if next_name not in self.neighbors:
-            log.append(f"[{self.name}] DROP: Next hop {next_name} not reachable (link down?)")
-            return False
+        iface = self.fib_lookup(pkt.dst, flow)
+        if iface is None:
+            if log is not None:
+                if pkt.dst in self.routing_table:
+                    log.append(f"[{self.name}] DROP: Next hop {self.routing_table[pkt.dst].next_hop} not reachable (link down?)")
+                else:
+                    log.append(f"[{self.name}] DROP: No route to {pkt.dst}")
+            return None
+        if not iface.link.up:
+            if log is not None:
+                log.append(f"[{self.name}] DROP: Next hop {iface.link.other(self).name} not reachable (link down?)")
+            return None
+        nxt = iface.link.other(self)
         pkt.hop()
-        log.append(f"[{self.name}] FORWARD -> {next_name} via cost={route.cost:.2f} path={'-'.join(route.path)}")
-        return self.neighbors[next_name][0].forward(pkt, all_routers, log)
+        if log is not None:
+            route = self.routing_table[pkt.dst]
+            log.append(f"[{self.name}] FORWARD -> {nxt.name} via cost={route.cost:.2f} path={'-'.join(route.path)}")
+        return nxt
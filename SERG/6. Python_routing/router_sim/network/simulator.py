@@ -0,0 +1,284 @@
+from __future__ import annotations
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import math
+import random
+from .events import EventLoop
+from .graph import Graph
+from .spf import ShortestPathTree
+
+@dataclass
+class SimConfig:
+    """Timers of the event-driven simulation (seconds of simulated time)."""
+    link_delay: float = 0.001   # propagation delay of every link (LSAs and data)
+    detect_delay: float = 0.05  # time for link endpoints to notice a change
+    spf_delay: float = 0.05     # wait after the first new LSA before running SPF
+    spf_hold: float = 0.2       # minimum interval between two SPF runs on a router
+    ttl: int = 32
+
+@dataclass
+class SimStats:
+    lsas_sent: int = 0
+    lsas_duplicate: int = 0
+    spf_runs: int = 0
+    packets_sent: int = 0
+    delivered: int = 0
+    lost_in_flight: int = 0     # on a link when it went down
+    dropped_link_down: int = 0  # stale route pointed at a dead link
+    dropped_no_route: int = 0
+    ttl_expired: int = 0        # transient forwarding loops
+    latency_sum: float = 0.0
+    changes: List[List[float]] = field(default_factory=list)  # [change time, last route change it caused]
+
+    def convergence_times(self) -> List[float]:
+        """Per physical change: time until the last routing change caused by its LSAs."""
+        return [done - start for start, done in self.changes]
+
+    def summary(self) -> Dict[str, float]:
+        conv = self.convergence_times()
+        return {
+            "lsas_sent": self.lsas_sent,
+            "lsas_duplicate": self.lsas_duplicate,
+            "spf_runs": self.spf_runs,
+            "packets_sent": self.packets_sent,
+            "delivered": self.delivered,
+            "lost": self.packets_sent - self.delivered,
+            "lost_in_flight": self.lost_in_flight,
+            "dropped_link_down": self.dropped_link_down,
+            "dropped_no_route": self.dropped_no_route,
+            "ttl_expired": self.ttl_expired,
+            "avg_latency": self.latency_sum / self.delivered if self.delivered else 0.0,
+            "changes": len(conv),
+            "max_convergence": max(conv) if conv else 0.0,
+            "avg_convergence": sum(conv) / len(conv) if conv else 0.0,
+        }
+
+class LinkStateView:
+    """The graph as one router currently believes it to be.
+
+    Shares the CSR arrays and the initial link state with every other view;
+    only the LSAs this router has already run SPF on are stored, as overrides.
+    Exposes the `neighbors`/`find_link` interface used by SPF repair.
+    """
+
+    def __init__(self, graph: Graph, base_metric: array, base_up: bytearray) -> None:
+        self.graph = graph
+        self.base_metric = base_metric
+        self.base_up = base_up
+        self.overrides: Dict[int, Tuple[float, bool]] = {}
+
+    def neighbors(self, u: int) -> Iterable[Tuple[int, float, int]]:
+        g = self.graph
+        for e in range(g.offsets[u], g.offsets[u + 1]):
+            l = g.edge_link[e]
+            state = self.overrides.get(l)
+            metric, up = state if state is not None else (self.base_metric[l], self.base_up[l])
+            if up:
+                yield g.targets[e], metric, l
+
+    def find_link(self, a: int, b: int) -> Optional[int]:
+        best, best_cost = None, math.inf
+        for v, cost, l in self.neighbors(a):
+            if v == b and cost < best_cost:
+                best, best_cost = l, cost
+        return best
+
+    def cost(self, a: int, b: int) -> float:
+        best = math.inf
+        for v, cost, _ in self.neighbors(a):
+            if v == b and cost < best:
+                best = cost
+        return best
+
+class _RouterState:
+    __slots__ = ("view", "tree", "lsdb", "pending", "pending_changes", "spf_scheduled", "last_spf",
+                 "hop_links")
+
+    def __init__(self, view: LinkStateView, tree: ShortestPathTree) -> None:
+        self.view = view
+        self.tree = tree
+        self.lsdb: Dict[int, Tuple[int, float, bool]] = {}  # link -> (seq, metric, up)
+        self.pending: Set[int] = set()
+        self.pending_changes: Set[int] = set()  # indexes into SimStats.changes
+        self.spf_scheduled = False
+        self.last_spf = -math.inf
+        self.hop_links: Dict[int, Optional[int]] = {}
+
+class Simulator:
+    """Event-driven model of link-state reconvergence on top of a `Topology`.
+
+    Physical link changes are noticed by the link endpoints after
+    `detect_delay`, flooded as LSAs hop by hop with `link_delay`, and applied
+    by each router's own incremental SPF once its delay/hold-down timer fires.
+    Until then every router keeps forwarding with its old tree, so data
+    packets can be lost in flight, hit dead links or loop.
+    The topology itself is not modified.
+    """
+
+    def __init__(self, topo: "Topology", config: Optional[SimConfig] = None) -> None:
+        graph = topo.graph
+        self.graph = graph
+        self.config = config or SimConfig()
+        self.loop = EventLoop()
+        self.stats = SimStats()
+        self.phys_metric = array("d", graph.link_metric)
+        self.phys_up = bytearray(graph.link_up)
+        self.epoch = array("i", [0]) * graph.link_count
+        self.seq = array("i", [0]) * graph.link_count
+        base_metric, base_up = array("d", graph.link_metric), bytearray(graph.link_up)
+        self.routers: List[_RouterState] = []
+        for name in graph.names:
+            r = topo.routers[name]
+            if r.spt is None:
+                r.compute_routes(topo.routers, graph)
+            self.routers.append(_RouterState(LinkStateView(graph, base_metric, base_up), r.spt.snapshot()))
+
+    @property
+    def now(self) -> float:
+        return self.loop.now
+
+    def run(self, until: Optional[float] = None) -> SimStats:
+        self.loop.run(until)
+        return self.stats
+
+    # --- physical changes -------------------------------------------------
+
+    def schedule_link_change(self, time: float, a: str, b: str,
+                             up: Optional[bool] = None, metric: Optional[float] = None) -> None:
+        ia, ib = self.graph.index[a], self.graph.index[b]
+        for l in self.graph.links_between(ia, ib):
+            self.loop.schedule_at(time, self._link_change, l, up, metric)
+
+    def random_churn(self, duration: float, mean_interval: float, mean_downtime: float,
+                     seed: int = 1) -> int:
+        """Schedule random link flaps over `duration`; returns how many were scheduled."""
+        rnd = random.Random(seed)
+        t, count = self.loop.now, 0
+        while True:
+            t += rnd.expovariate(1.0 / mean_interval)
+            if t >= self.loop.now + duration:
+                return count
+            l = rnd.randrange(self.graph.link_count)
+            self.loop.schedule_at(t, self._link_change, l, False, None)
+            self.loop.schedule_at(t + rnd.expovariate(1.0 / mean_downtime), self._link_change, l, True, None)
+            count += 1
+
+    def _link_change(self, l: int, up: Optional[bool], metric: Optional[float]) -> None:
+        if up is not None:
+            if not up and self.phys_up[l]:
+                self.epoch[l] += 1  # packets on the wire are lost
+            self.phys_up[l] = 1 if up else 0
+        if metric is not None:
+            self.phys_metric[l] = metric
+        change = len(self.stats.changes)
+        self.stats.changes.append([self.now, self.now])
+        for end in (self.graph.link_a[l], self.graph.link_b[l]):
+            self.loop.schedule(self.config.detect_delay, self._originate, end, l, change)
+
+    # --- flooding and SPF ---------------------------------------------------
+    # Every LSA event carries the index of the physical change that sent it on
+    # its way, so SPF runs are credited to that change and not to whichever
+    # change happened last. LSAs resent on adjacency sync belong to the change
+    # that brought the link up.
+
+    def _originate(self, r: int, l: int, change: int) -> None:
+        self.seq[l] += 1
+        self._accept(r, (l, self.seq[l], self.phys_metric[l], bool(self.phys_up[l])), -1, change)
+        if self.phys_up[l]:
+            # Adjacency (re)established: synchronize databases across the link,
+            # the two sides may have missed each other's LSAs while it was down.
+            g = self.graph
+            other = g.link_b[l] if g.link_a[l] == r else g.link_a[l]
+            for link, (seq, metric, up) in list(self.routers[r].lsdb.items()):
+                self.stats.lsas_sent += 1
+                self.loop.schedule(self.config.link_delay, self._receive_lsa, other, (link, seq, metric, up), l,
+                                   change)
+
+    def _receive_lsa(self, r: int, lsa: Tuple[int, int, float, bool], via: int, change: int) -> None:
+        known = self.routers[r].lsdb.get(lsa[0])
+        if known is not None and known[0] >= lsa[1]:
+            self.stats.lsas_duplicate += 1
+            return
+        self._accept(r, lsa, via, change)
+
+    def _accept(self, r: int, lsa: Tuple[int, int, float, bool], via: int, change: int) -> None:
+        st = self.routers[r]
+        l, seq, metric, up = lsa
+        st.lsdb[l] = (seq, metric, up)
+        g = self.graph
+        for e in range(g.offsets[r], g.offsets[r + 1]):
+            out = g.edge_link[e]
+            if out != via and self.phys_up[out]:
+                self.stats.lsas_sent += 1
+                self.loop.schedule(self.config.link_delay, self._receive_lsa, g.targets[e], lsa, out, change)
+        st.pending.add(l)
+        st.pending_changes.add(change)
+        if not st.spf_scheduled:
+            st.spf_scheduled = True
+            when = max(self.now + self.config.spf_delay, st.last_spf + self.config.spf_hold)
+            self.loop.schedule_at(when, self._run_spf, r)
+
+    def _run_spf(self, r: int) -> None:
+        st = self.routers[r]
+        st.spf_scheduled = False
+        st.last_spf = self.now
+        self.stats.spf_runs += 1
+        changed = False
+        for l in st.pending:
+            a, b = self.graph.link_a[l], self.graph.link_b[l]
+            old = st.view.cost(a, b)
+            _, metric, up = st.lsdb[l]
+            st.view.overrides[l] = (metric, up)
+            if st.tree.link_changed(st.view, a, b, old, st.view.cost(a, b)):
+                changed = True
+        st.pending.clear()
+        st.hop_links.clear()
+        if changed:
+            for change in st.pending_changes:
+                self.stats.changes[change][1] = self.now
+        st.pending_changes.clear()
+
+    # --- data traffic -------------------------------------------------------
+
+    def add_flow(self, src: str, dst: str, rate: float, start: float = 0.0,
+                 stop: Optional[float] = None) -> None:
+        """Send `rate` packets per second from src to dst between start and stop."""
+        s, d = self.graph.index[src], self.graph.index[dst]
+        self.loop.schedule_at(max(start, self.now), self._emit, s, d, 1.0 / rate, stop)
+
+    def _emit(self, s: int, d: int, interval: float, stop: Optional[float]) -> None:
+        self.stats.packets_sent += 1
+        self._at_router(s, d, self.config.ttl, self.now)
+        if stop is None or self.now + interval <= stop:
+            self.loop.schedule(interval, self._emit, s, d, interval, stop)
+
+    def _at_router(self, u: int, d: int, ttl: int, sent: float) -> None:
+        if u == d:
+            self.stats.delivered += 1
+            self.stats.latency_sum += self.now - sent
+            return
+        if ttl <= 0:
+            self.stats.ttl_expired += 1
+            return
+        st = self.routers[u]
+        hop = st.tree.first_hops()[d]
+        if hop < 0:
+            self.stats.dropped_no_route += 1
+            return
+        if hop not in st.hop_links:
+            st.hop_links[hop] = st.view.find_link(u, hop)
+        l = st.hop_links[hop]
+        if l is None:
+            self.stats.dropped_no_route += 1
+            return
+        if not self.phys_up[l]:
+            self.stats.dropped_link_down += 1
+            return
+        self.loop.schedule(self.config.link_delay, self._off_link, l, self.epoch[l], hop, d, ttl - 1, sent)
+
+    def _off_link(self, l: int, epoch: int, v: int, d: int, ttl: int, sent: float) -> None:
+        if epoch != self.epoch[l]:
+            self.stats.lost_in_flight += 1
+            return
+        self._at_router(v, d, ttl, sent)
@@ -0,0 +1,263 @@
+from __future__ import annotations
+from array import array
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Set, Tuple
+import heapq
+import math
+from .graph import Graph
+
+@dataclass
+class ShortestPathTree:
+    """Shortest-path tree rooted at one router (distances + predecessors).
+
+    Nodes are the integer ids of a `Graph`; `prev` is -1 for the root and for
+    unreachable nodes. Besides the full computation, the tree can be repaired
+    in place after a single link change (incremental SPF): only the part of
+    the tree that is affected by the link is recomputed.
+    """
+    root: int
+    dist: array = field(default_factory=lambda: array("d"))
+    prev: array = field(default_factory=lambda: array("i"))
+    _shared: bool = field(default=False, repr=False, compare=False)
+    _first: Optional[array] = field(default=None, repr=False, compare=False)
+    _ecmp: Optional[List[Tuple[int, ...]]] = field(default=None, repr=False, compare=False)
+
+    def compute(self, graph: Graph) -> None:
+        """Binary-heap Dijkstra over the CSR arrays, O(E log V)."""
+        n = graph.node_count
+        offsets, targets, edge_link = graph.offsets, graph.targets, graph.edge_link
+        metric, up = graph.link_metric, graph.link_up
+        dist = array("d", [math.inf]) * n
+        prev = array("i", [-1]) * n
+        done = bytearray(n)
+        dist[self.root] = 0.0
+        heap = [(0.0, self.root)]
+        while heap:
+            d, u = heapq.heappop(heap)
+            if done[u]:
+                continue
+            done[u] = 1
+            for e in range(offsets[u], offsets[u + 1]):
+                l = edge_link[e]
+                if not up[l]:
+                    continue
+                v = targets[e]
+                alt = d + metric[l]
+                if alt < dist[v]:
+                    dist[v] = alt
+                    prev[v] = u
+                    heapq.heappush(heap, (alt, v))
+        self.dist = dist
+        self.prev = prev
+        self._shared = False
+        self._first = None
+        self._ecmp = None
+
+    def snapshot(self) -> "ShortestPathTree":
+        """Frozen tree sharing this tree's arrays (copy-on-write).
+
+        The arrays are only copied if this tree is repaired afterwards.
+        """
+        self._shared = True
+        return ShortestPathTree(self.root, self.dist, self.prev, True, self._first)
+
+    def _own(self) -> None:
+        # Called before any in-place repair.
+        if self._shared:
+            self.dist = array("d", self.dist)
+            self.prev = array("i", self.prev)
+            self._shared = False
+        self._first = None
+        self._ecmp = None
+
+    def first_hops(self) -> array:
+        """first[v] = neighbor of the root on the path to v (-1 for root/unreachable).
+
+        Computed once per tree state in O(V); next hops do not need paths.
+        """
+        if self._first is None:
+            prev, root = self.prev, self.root
+            first = array("i", [-2]) * len(prev)
+            first[root] = -1
+            for v in range(len(prev)):
+                # Walk up to the first node whose first hop is known, then fill back.
+                chain = []
+                u = v
+                while first[u] == -2:
+                    p = prev[u]
+                    if p < 0:
+                        first[u] = -1
+                        break
+                    if p == root:
+                        first[u] = u
+                        break
+                    chain.append(u)
+                    u = p
+                hop = first[u]
+                for w in chain:
+                    first[w] = hop
+            self._first = first
+        return self._first
+
+    def ecmp_first_hops(self, graph: Graph) -> List[Tuple[int, ...]]:
+        """All equal-cost first hops per destination (empty tuple for root/unreachable).
+
+        A neighbor u of v is an equal-cost predecessor when dist[u] + cost(u, v)
+        equals dist[v]; v inherits the first hops of all such predecessors.
+        Nodes are visited in distance order, O(E + V log V), cached per tree state.
+        """
+        if self._ecmp is None:
+            dist, root = self.dist, self.root
+            hops: List[Tuple[int, ...]] = [()] * len(dist)
+            interned = {}
+            order = sorted((v for v in range(len(dist)) if v != root and not math.isinf(dist[v])),
+                           key=dist.__getitem__)
+            for v in order:
+                dv = dist[v]
+                tol = 1e-9 * max(1.0, dv)
+                acc = set()
+                for u, cost, _ in graph.neighbors(v):
+                    if dist[u] < dv and abs(dist[u] + cost - dv) <= tol:
+                        acc.update((v,) if u == root else hops[u])
+                key = tuple(sorted(acc))
+                hops[v] = interned.setdefault(key, key)
+            self._ecmp = hops
+        return self._ecmp
+
+    def path(self, dest: int) -> List[int]:
+        path = []
+        cur = dest
+        while cur >= 0:
+            path.append(cur)
+            cur = self.prev[cur]
+        path.reverse()
+        return path
+
+    def subtree(self, node: int) -> Set[int]:
+        # Child lists are rebuilt on demand (O(V)) instead of being kept per
+        # tree: V routers each holding V sets would not fit on large graphs.
+        children = {}
+        for v, u in enumerate(self.prev):
+            if u >= 0:
+                children.setdefault(u, []).append(v)
+        result = {node}
+        stack = [node]
+        while stack:
+            for child in children.get(stack.pop(), ()):
+                result.add(child)
+                stack.append(child)
+        return result
+
+    def link_changed(self, graph: Graph, a: int, b: int,
+                     old_cost: float, new_cost: float) -> Set[int]:
+        """Repair the tree after the cost of link a-b changed (math.inf = down).
+
+        `graph` must already reflect the new cost. Returns the set of nodes
+        whose distance or path may have changed.
+        """
+        if new_cost < old_cost:
+            return self._decrease(graph, a, b, new_cost)
+        if new_cost > old_cost:
+            return self._increase(graph, a, b)
+        return set()
+
+    def _reparent(self, graph: Graph, nodes: Iterable[int]) -> Set[int]:
+        """Pick the predecessor a full `compute()` would pick for each of `nodes`.
+
+        Dijkstra settles nodes in (dist, id) order and only replaces a
+        predecessor on a strictly shorter path, so among the equal-cost
+        predecessors of v it keeps the smallest (dist[u], u). Distances must
+        already be final. Returns the nodes whose predecessor changed.
+        """
+        dist, prev, root = self.dist, self.prev, self.root
+        moved: Set[int] = set()
+        for v in nodes:
+            if v == root:
+                continue
+            dv = dist[v]
+            best = -1
+            if not math.isinf(dv):
+                for u, edge_cost, _ in graph.neighbors(v):
+                    if dist[u] + edge_cost == dv and (best < 0 or (dist[u], u) < (dist[best], best)):
+                        best = u
+            if prev[v] != best:
+                prev[v] = best
+                moved.add(v)
+        return moved
+
+    def _decrease(self, graph: Graph, a: int, b: int, cost: float) -> Set[int]:
+        if self.dist[a] + cost > self.dist[b] and self.dist[b] + cost > self.dist[a]:
+            return set()
+        self._own()
+        dist, prev = self.dist, self.prev
+        heap = []
+        changed: Set[int] = set()
+        for u, v in ((a, b), (b, a)):
+            alt = dist[u] + cost
+            if alt < dist[v]:
+                dist[v] = alt
+                prev[v] = u
+                changed.add(v)
+                heapq.heappush(heap, (alt, v))
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            for v, edge_cost, _ in graph.neighbors(u):
+                alt = d + edge_cost
+                if alt < dist[v]:
+                    dist[v] = alt
+                    prev[v] = u
+                    changed.add(v)
+                    heapq.heappush(heap, (alt, v))
+        # A shorter distance can make a node an equal-cost predecessor of a
+        # neighbor whose own distance did not change, so those are rechecked too.
+        candidates = {a, b}
+        for u in changed:
+            candidates.add(u)
+            candidates.update(v for v, _, _ in graph.neighbors(u))
+        return changed | self._reparent(graph, candidates)
+
+    def _increase(self, graph: Graph, a: int, b: int) -> Set[int]:
+        if self.prev[b] == a:
+            cut = b
+        elif self.prev[a] == b:
+            cut = a
+        else:
+            # Not a tree edge: no shortest path used it, nothing changes.
+            return set()
+        self._own()
+        dist, prev = self.dist, self.prev
+        affected = self.subtree(cut)
+        for v in affected:
+            dist[v] = math.inf
+            prev[v] = -1
+        # Seed every detached node with its best entry from the intact part.
+        heap = []
+        for v in affected:
+            best, best_u = math.inf, -1
+            for u, edge_cost, _ in graph.neighbors(v):
+                if u in affected:
+                    continue
+                alt = dist[u] + edge_cost
+                if alt < best:
+                    best, best_u = alt, u
+            if best_u >= 0:
+                dist[v] = best
+                prev[v] = best_u
+                heapq.heappush(heap, (best, v))
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            for v, edge_cost, _ in graph.neighbors(u):
+                if v not in affected:
+                    continue
+                alt = d + edge_cost
+                if alt < dist[v]:
+                    dist[v] = alt
+                    prev[v] = u
+                    heapq.heappush(heap, (alt, v))
+        # Nodes outside the detached subtree keep their distance and parent.
+        self._reparent(graph, affected)
+        return affected
@@ -1,14 +1,65 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Dict, List, Tuple
-from .router import Router
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+from .router import Router, RoutingTable, SnapshotTable
 from .link import Link
 from .packet import Packet
+from .graph import Graph
+from .parallel import all_pairs_spf
+from .traffic import TrafficResult, forward_flows
 
 @dataclass
 class Topology:
     routers: Dict[str, Router]
     links: List[Link]
+    ecmp: bool = False  # spread send()/send_matrix() over equal-cost next hops
+    graph: Graph = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        # CSR core shared by all routers; `links[i]` is bound to link id i.
+        self.graph = Graph.from_links(list(self.routers), self.links)
+        for r in self.routers.values():
+            r.graph = self.graph
+
+    @property
+    def version(self) -> int:
+        return self.graph.version
+
+    @staticmethod
+    def from_graph(graph: Graph, ecmp: bool = False, compute: bool = True) -> "Topology":
+        """Wrap a prebuilt `Graph` (see `loaders`/`generators`) with `Router`/`Link` view objects.
+
+        The objects are only a convenience layer; SPF always runs over the
+        graph arrays, which are reused as-is. With `compute=False` routing
+        tables are left to be computed per router on first use.
+        """
+        routers = {n: Router(n) for n in graph.names}
+        for r in routers.values():
+            r.graph = graph
+        names = graph.names
+        links: List[Link] = []
+        for i in range(graph.link_count):
+            x, y = names[graph.link_a[i]], names[graph.link_b[i]]
+            link = Link(routers[x], routers[y], metric=graph.link_metric[i], up=bool(graph.link_up[i]))
+            link.bind(graph, i)
+            routers[x].add_interface(name=f"{x}-{y}", ip="", link=link)
+            routers[y].add_interface(name=f"{y}-{x}", ip="", link=link)
+            links.append(link)
+        topo = Topology.__new__(Topology)
+        topo.routers, topo.links, topo.graph, topo.ecmp = routers, links, graph, ecmp
+        if compute:
+            topo.compute_all()
+        return topo
+
+    def compute_all(self, workers: int = 1) -> None:
+        """Full SPF for every router; with workers > 1 sources are spread over a process pool."""
+        if workers <= 1:
+            for r in self.routers.values():
+                r.compute_routes(self.routers, self.graph)
+            return
+        trees = all_pairs_spf(self.graph, workers)
+        for name, r in self.routers.items():
+            r.set_tree(self.graph, trees[self.graph.index[name]])
 
     @staticmethod
     def sample() -> "Topology":
@@ -39,39 +90,71 @@ class Topology:
 
         topo = Topology(routers=routers, links=links)
         # Initial route computation
-        for r in topo.routers.values():
-            r.compute_routes(topo.routers)
+        topo.compute_all()
         return topo
 
-    def send(self, src: str, dst: str, payload: str = "") -> List[str]:
-        pkt = Packet(src=src, dst=dst, payload=payload, ttl=32)
+    def send(self, src: str, dst: str, payload: str = "", sport: int = 0, dport: int = 0) -> List[str]:
+        pkt = Packet(src=src, dst=dst, payload=payload, ttl=32, sport=sport, dport=dport)
         log: List[str] = []
-        ok = self.routers[src].forward(pkt, self.routers, log)
+        ok = self.routers[src].forward(pkt, self.routers, log, ecmp=self.ecmp)
         if not ok:
             log.append("RESULT: Delivery failed")
         else:
             log.append("RESULT: Delivery success")
         return log
 
+    def send_matrix(self, src: Sequence[int], dst: Sequence[int], size: Sequence[float],
+                    ttl: int = 32, log: Optional[List[str]] = None,
+                    sport: Optional[Sequence[int]] = None, dport: Optional[Sequence[int]] = None) -> TrafficResult:
+        """Forward a whole traffic matrix at once (flows given as router ids, see `graph.index`).
+
+        Returns per-link load and per-flow outcome/hop arrays; pass a list as
+        `log` to also collect one line per flow. With `ecmp` enabled flows are
+        hashed across equal-cost paths (ports default to the flow index).
+        """
+        trees = []
+        for name in self.graph.names:
+            r = self.routers[name]
+            if r.spt is None:
+                r.compute_routes(self.routers, self.graph)
+            trees.append(r.spt)
+        return forward_flows(self.graph, trees, src, dst, size, ttl, log, self.ecmp, sport, dport)
+
     def set_link_metric(self, a: str, b: str, metric: float) -> None:
-        for ln in self.links:
-            if {ln.a.name, ln.b.name} == {a, b}:
-                ln.set_metric(metric)
-        for r in self.routers.values():
-            r.compute_routes(self.routers)
+        old_cost = self.graph.cost(a, b)
+        for l in self._links_between(a, b):
+            self.links[l].set_metric(metric)
+        self._update_routes(a, b, old_cost)
 
     def set_link_state(self, a: str, b: str, up: bool) -> None:
-        for ln in self.links:
-            if {ln.a.name, ln.b.name} == {a, b}:
-                ln.set_state(up)
+        old_cost = self.graph.cost(a, b)
+        for l in self._links_between(a, b):
+            self.links[l].set_state(up)
+        self._update_routes(a, b, old_cost)
+
+    def _links_between(self, a: str, b: str) -> List[int]:
+        return self.graph.links_between(self.graph.index[a], self.graph.index[b])
+
+    def _update_routes(self, a: str, b: str, old_cost: float) -> None:
+        new_cost = self.graph.cost(a, b)
+        if new_cost == old_cost:
+            return
         for r in self.routers.values():
-            r.compute_routes(self.routers)
+            r.update_routes(self.routers, self.graph, a, b, old_cost, new_cost)
+
+    def routing_tables_snapshot(self) -> Dict[str, SnapshotTable]:
+        """Frozen {router: {dest: {"next_hop", "next_hops", "cost", "path"}}} view.
 
-    def routing_tables_snapshot(self) -> Dict[str, Dict[str, dict]]:
+        Every table shares its router's tree arrays (copy-on-write), and
+        entries/paths are only built when read. ECMP next hops are derived from
+        one copy of the link metrics/state taken here, so they match the
+        frozen distances even after later link changes.
+        """
         snap = {}
+        frozen = self.graph.snapshot()
         for name, r in self.routers.items():
-            table = {}
-            for dest, route in r.routing_table.items():
-                table[dest] = {"next_hop": route.next_hop, "cost": route.cost, "path": route.path}
-            snap[name] = table
+            if r.spt is not None:
+                snap[name] = SnapshotTable(RoutingTable(frozen, r.spt.snapshot()))
+            else:
+                snap[name] = {}
         return snap
@@ -0,0 +1,177 @@
+from __future__ import annotations
+from array import array
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Union
+from .graph import Graph
+from .packet import ecmp_pick, flow_hash
+
+# Per-flow outcome codes.
+DELIVERED = 0
+NO_ROUTE = 1
+LINK_DOWN = 2
+TTL_EXPIRED = 3
+OUTCOME_NAMES = {DELIVERED: "delivered", NO_ROUTE: "no route", LINK_DOWN: "next hop down", TTL_EXPIRED: "ttl expired"}
+
+@dataclass
+class TrafficResult:
+    """Result of a bulk forwarding run.
+
+    `link_load[l]` is the total size carried by link id l, `outcome[f]` and
+    `hops[f]` are the outcome code and number of links traversed by flow f.
+    """
+    link_load: array
+    outcome: array
+    hops: array
+
+    def utilization(self, capacity: Union[float, Sequence[float]]) -> array:
+        """Per-link load divided by capacity (one value for all links, or one per link id)."""
+        if isinstance(capacity, (int, float)):
+            return array("d", (load / capacity for load in self.link_load))
+        return array("d", (load / cap for load, cap in zip(self.link_load, capacity)))
+
+    def counts(self) -> Dict[str, int]:
+        result = {name: 0 for name in OUTCOME_NAMES.values()}
+        for code in self.outcome:
+            result[OUTCOME_NAMES[code]] += 1
+        return result
+
+def forward_flows(graph: Graph, trees: Sequence["ShortestPathTree"], src: Sequence[int],
+                  dst: Sequence[int], size: Sequence[float], ttl: int = 32,
+                  log: Optional[List[str]] = None, ecmp: bool = False,
+                  sport: Optional[Sequence[int]] = None, dport: Optional[Sequence[int]] = None) -> TrafficResult:
+    """Forward a traffic matrix hop by hop using each router's own next-hop table.
+
+    `trees[u]` is router u's shortest-path tree. Flows are grouped by
+    destination; the outcome of forwarding from a node towards a destination
+    is resolved once and shared by every flow passing through it, and load is
+    pushed down the next-hop tree in one pass, so no per-packet work is done.
+    A packet is dropped at the router where its TTL reaches zero, as in
+    `Router.forward`.
+
+    With `ecmp` every flow is hashed on its 5-tuple (the flow index stands in
+    for the source port when `sport` is not given) and follows its own
+    equal-cost path, so flows are walked individually.
+    """
+    n_flows = len(src)
+    link_load = array("d", [0.0]) * graph.link_count
+    outcome = array("b", [0]) * n_flows
+    hops = array("i", [0]) * n_flows
+    link_cache: Dict[int, Optional[int]] = {}
+    n = graph.node_count
+
+    def out_link(u: int, v: int) -> Optional[int]:
+        key = u * n + v
+        if key not in link_cache:
+            link_cache[key] = graph.find_link(u, v)
+        return link_cache[key]
+
+    if ecmp:
+        _forward_ecmp(graph, trees, src, dst, size, ttl, log, sport, dport,
+                      link_load, outcome, hops, out_link)
+        return TrafficResult(link_load=link_load, outcome=outcome, hops=hops)
+
+    by_dst: Dict[int, List[int]] = {}
+    for f in range(n_flows):
+        by_dst.setdefault(dst[f], []).append(f)
+
+    for d, flows in by_dst.items():
+        # state[u] = (code, hops to delivery/drop, outgoing link or -1); code None while on the stack.
+        state: Dict[int, tuple] = {d: (DELIVERED, 0, -1)}
+        for f in flows:
+            u = src[f]
+            chain = []
+            while u not in state:
+                state[u] = (None, 0, -1)
+                chain.append(u)
+                hop = trees[u].first_hops()[d]
+                if hop < 0:
+                    state[u] = (NO_ROUTE, 0, -1)
+                    chain.pop()
+                    break
+                l = out_link(u, hop)
+                if l is None:
+                    state[u] = (LINK_DOWN, 0, -1)
+                    chain.pop()
+                    break
+                state[u] = (None, 0, l)
+                u = hop
+            if state[u][0] is None:
+                # Forwarding loop: every node on it keeps the packet until the TTL runs out.
+                code, remaining = TTL_EXPIRED, ttl
+            else:
+                code, remaining = state[u][0], state[u][1]
+            for w in reversed(chain):
+                remaining += 1
+                state[w] = (code, remaining, state[w][2])
+
+        demand: Dict[int, float] = {}
+        for f in flows:
+            u = src[f]
+            code, remaining, _ = state[u]
+            if remaining >= ttl:
+                outcome[f] = TTL_EXPIRED
+                hops[f] = ttl
+                _walk(trees, d, u, ttl, size[f], link_load, out_link)
+            else:
+                outcome[f] = code
+                hops[f] = remaining
+                demand[u] = demand.get(u, 0.0) + size[f]
+            if log is not None:
+                log.append(f"flow {f}: {graph.names[u]} -> {graph.names[d]} {OUTCOME_NAMES[outcome[f]]} after {hops[f]} hops")
+
+        # Push demand down the next-hop tree, farthest nodes first: every
+        # node forwards to one whose remaining hop count is exactly one less.
+        for u in sorted(state, key=lambda w: state[w][1], reverse=True):
+            amount = demand.get(u)
+            l = state[u][2]
+            if not amount or state[u][1] == 0 or l < 0:
+                continue
+            link_load[l] += amount
+            nxt = graph.link_b[l] if graph.link_a[l] == u else graph.link_a[l]
+            demand[nxt] = demand.get(nxt, 0.0) + amount
+
+    return TrafficResult(link_load=link_load, outcome=outcome, hops=hops)
+
+def _walk(trees, d: int, u: int, steps: int, amount: float, link_load: array, out_link) -> None:
+    """Charge `amount` to the first `steps` links of the path from u towards d."""
+    for _ in range(steps):
+        hop = trees[u].first_hops()[d]
+        l = out_link(u, hop) if hop >= 0 else None
+        if l is None:
+            return
+        link_load[l] += amount
+        u = hop
+
+def _forward_ecmp(graph: Graph, trees, src, dst, size, ttl, log, sport, dport,
+                  link_load: array, outcome: array, hops: array, out_link) -> None:
+    tables: Dict[int, list] = {}
+    for f in range(len(src)):
+        s, d = src[f], dst[f]
+        h = flow_hash(s, d, sport[f] if sport is not None else f, dport[f] if dport is not None else 0)
+        u, k = s, 0
+        while True:
+            if k >= ttl:
+                code = TTL_EXPIRED
+                break
+            if u == d:
+                code = DELIVERED
+                break
+            table = tables.get(u)
+            if table is None:
+                table = tables[u] = trees[u].ecmp_first_hops(graph)
+            choices = table[d]
+            if not choices:
+                code = NO_ROUTE
+                break
+            hop = choices[ecmp_pick(h, u, len(choices))]
+            l = out_link(u, hop)
+            if l is None:
+                code = LINK_DOWN
+                break
+            link_load[l] += size[f]
+            k += 1
+            u = hop
+        outcome[f] = code
+        hops[f] = k
+        if log is not None:
+            log.append(f"flow {f}: {graph.names[s]} -> {graph.names[d]} {OUTCOME_NAMES[code]} after {k} hops")
@@ -0,0 +1,40 @@
+"""Header detection and link state parsing in the topology loaders."""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from network.loaders import iter_links, load_edge_list, load_json_lines
+
+def write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+def test_two_column_header_is_skipped(tmp_path):
+    path = write(tmp_path, "edges.csv", "a,b\nR1,R2\n")
+    assert list(iter_links(load_edge_list(path))) == [("R1", "R2", 1.0, True)]
+
+def test_named_metric_column_is_skipped(tmp_path):
+    path = write(tmp_path, "edges.csv", "x,y,cost\nR1,R2,3\n")
+    assert list(iter_links(load_edge_list(path))) == [("R1", "R2", 3.0, True)]
+
+def test_explicit_header_flag(tmp_path):
+    path = write(tmp_path, "edges.csv", "a,b\nR1,R2\n")
+    assert len(list(iter_links(load_edge_list(path, header=False)))) == 2
+    path = write(tmp_path, "plain.csv", "R1,R2\nR2,R3\n")
+    assert list(iter_links(load_edge_list(path, header=True))) == [("R2", "R3", 1.0, True)]
+
+def test_json_up_strings(tmp_path):
+    path = write(tmp_path, "links.jsonl",
+                 '{"a": "A", "b": "B", "up": "false"}\n'
+                 '{"a": "A", "b": "C", "up": "0"}\n'
+                 '["B", "C", 2, true]\n')
+    assert [up for _, _, _, up in iter_links(load_json_lines(path))] == [False, False, True]
+
+def test_json_up_rejects_unknown_values(tmp_path):
+    path = write(tmp_path, "links.jsonl", '{"a": "A", "b": "B", "up": "maybe"}\n')
+    with pytest.raises(ValueError):
+        load_json_lines(path)
@@ -0,0 +1,37 @@
+"""Convergence is credited to the physical change whose LSAs caused it."""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from network.generators import grid
+from network.simulator import Simulator
+from network.topology import Topology
+
+def test_overlapping_changes_keep_their_own_convergence():
+    topo = Topology.from_graph(grid(1, 5))
+    sim = Simulator(topo)
+    sim.schedule_link_change(0.0, "R0_0", "R0_1", metric=5.0)
+    sim.schedule_link_change(0.01, "R0_3", "R0_4", metric=5.0)
+    stats = sim.run()
+    cfg = sim.config
+    first, second = stats.convergence_times()
+    # The last router to hear the first change is three hops from R0_1.
+    assert first == pytest.approx(cfg.detect_delay + 3 * cfg.link_delay + cfg.spf_delay)
+    # That router's SPF also applies the second change, nothing runs later.
+    assert second == pytest.approx(first - 0.01)
+    assert stats.changes[1][1] == stats.changes[0][1]
+
+def test_later_change_does_not_extend_earlier_one():
+    topo = Topology.from_graph(grid(1, 5))
+    sim = Simulator(topo)
+    sim.schedule_link_change(0.0, "R0_0", "R0_1", metric=5.0)
+    sim.schedule_link_change(0.1, "R0_3", "R0_4", metric=5.0)
+    stats = sim.run()
+    cfg = sim.config
+    first, second = stats.convergence_times()
+    assert first == pytest.approx(cfg.detect_delay + 3 * cfg.link_delay + cfg.spf_delay)
+    # Routers near the second change are held down by their first SPF run.
+    assert stats.changes[1][1] > stats.changes[0][1] + cfg.spf_hold / 2
@@ -0,0 +1,81 @@
+"""Incremental SPF repair must give the same tree as a full recompute."""
+import math
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from network.graph import GraphBuilder
+from network.spf import ShortestPathTree
+from network.topology import Topology
+
+def random_graph(rnd, n, extra):
+    builder = GraphBuilder()
+    for i in range(1, n):
+        builder.add_link(f"R{rnd.randrange(i)}", f"R{i}", rnd.randint(1, 4))
+    for _ in range(extra):
+        a, b = rnd.sample(range(n), 2)
+        builder.add_link(f"R{a}", f"R{b}", rnd.randint(1, 4))
+    return builder.build()
+
+def full_tree(graph, root):
+    tree = ShortestPathTree(root)
+    tree.compute(graph)
+    return tree
+
+def assert_same(tree, graph):
+    full = full_tree(graph, tree.root)
+    assert list(tree.dist) == list(full.dist)
+    assert list(tree.prev) == list(full.prev)
+    assert list(tree.first_hops()) == list(full.first_hops())
+
+def change_link(rnd, graph, trees, link):
+    """Take the link down, or bring it up with a new metric, and repair `trees`."""
+    a, b = graph.link_a[link], graph.link_b[link]
+    old = graph.cost(graph.names[a], graph.names[b])
+    if graph.link_up[link] and rnd.random() < 0.2:
+        graph.set_state(link, False)
+    else:
+        graph.set_state(link, True)
+        graph.set_metric(link, rnd.randint(1, 4))
+    new = graph.cost(graph.names[a], graph.names[b])
+    for tree in trees:
+        tree.link_changed(graph, a, b, old, new)
+
+def test_incremental_matches_full_recompute():
+    rnd = random.Random(7)
+    for _ in range(30):
+        graph = random_graph(rnd, rnd.randint(5, 30), rnd.randint(0, 40))
+        trees = [full_tree(graph, root) for root in range(graph.node_count)]
+        for _ in range(40):
+            change_link(rnd, graph, trees, rnd.randrange(graph.link_count))
+            for tree in trees:
+                assert_same(tree, graph)
+
+def test_snapshot_is_not_repaired():
+    rnd = random.Random(3)
+    graph = random_graph(rnd, 20, 20)
+    tree = full_tree(graph, 0)
+    frozen = tree.snapshot()
+    before = list(frozen.prev)
+    for _ in range(20):
+        change_link(rnd, graph, [tree], rnd.randrange(graph.link_count))
+    assert list(frozen.prev) == before
+    assert_same(tree, graph)
+
+def test_sample_tie_after_metric_restore():
+    topo = Topology.sample()
+    topo.set_link_metric("B", "E", 50.0)
+    topo.set_link_metric("B", "E", 2.0)
+    assert topo.routing_tables_snapshot()["A"]["E"]["next_hop"] == "B"
+    for name in topo.graph.names:
+        assert_same(topo.routers[name].spt, topo.graph)
+
+def test_link_down_and_up():
+    topo = Topology.sample()
+    topo.set_link_state("A", "B", False)
+    assert math.isinf(topo.graph.cost("A", "B"))
+    topo.set_link_state("A", "B", True)
+    for name in topo.graph.names:
+        assert_same(topo.routers[name].spt, topo.graph)
@@ -0,0 +1,28 @@
+"""Routing table snapshots stay frozen after link changes."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from network.generators import grid
+from network.topology import Topology
+
+def test_ecmp_snapshot_read_after_change():
+    topo = Topology.from_graph(grid(2, 2), ecmp=True)
+    snap = topo.routing_tables_snapshot()
+    topo.set_link_metric("R0_0", "R0_1", 10)
+    entry = snap["R0_0"]["R1_1"]
+    assert entry["cost"] == 2.0
+    assert entry["next_hops"] == ("R0_1", "R1_0")
+    assert entry["next_hop"] in entry["next_hops"]
+    assert entry["path"][1] == entry["next_hop"]
+    fresh = topo.routing_tables_snapshot()["R0_0"]["R1_1"]
+    assert fresh["next_hops"] == ("R1_0",)
+    assert fresh["cost"] == 2.0 and fresh["next_hop"] == "R1_0"
+
+def test_snapshot_read_after_link_down():
+    topo = Topology.sample()
+    snap = topo.routing_tables_snapshot()
+    before = {dest: dict(entry) for dest, entry in snap["A"].items()}
+    topo.set_link_state("A", "B", False)
+    assert {dest: dict(entry) for dest, entry in snap["A"].items()} == before